@@ -1,11 +1,72 @@
-from flask import Flask, render_template, request, url_for
-from models.equations_solver import Gauss
-from models.properties import Properties
+# Arranque en producción: gunicorn "app:create_app()" compila las plantillas y calienta
+# cada ruta y cada motor antes de que el worker reciba tráfico (ver warm_up)
+import os
+import time
+from functools import lru_cache
+from time import perf_counter
+
+from flask import Flask, abort, before_render_template, g, jsonify, render_template, request, stream_template, template_rendered, url_for
+from models.equations_solver import ENGINES, Gauss, MatrixOperations, _numpy
+from models.properties import EXACT_ENTRY_COST, FLOAT_ENTRY_COST, Properties, PropertiesBatch
 from models.matrix_equation import MatrixEquation
+from models.batch import MODES, parse_system, solve_batch
+from models.cache import ResultCache, SolutionStore, UpdateConflict, canonical_key
+from models.metrics import MetricsRegistry, PhaseTimer, server_timing_header
+from models.session import SessionStore, SolverSession
+from models.parsing import parse_exact, parse_matrix_json, parse_matrix_text, parse_number, to_fraction
+from models.limits import BudgetExceeded, Deadline, SolverPool, check_admission, estimate_cost
+from models.vector_space import VectorSet
 
 app = Flask(__name__)
+app.config.setdefault("BATCH_MAX_SYSTEMS", 1000)
+app.config.setdefault("BATCH_MAX_WORKERS", None)
+# Caché de resultados: 'memory' (por proceso), 'sqlite' (compartida entre workers) o 'none'
+app.config.setdefault("RESULT_CACHE_BACKEND", "memory")
+app.config.setdefault("RESULT_CACHE_SIZE", 256)
+app.config.setdefault("RESULT_CACHE_PATH", "instance/results.sqlite3")
+# Almacén de sistemas resueltos por forma canónica (filas enteras primitivas y ordenadas):
+# 'none', 'memory' o 'sqlite' (persistente, compartido entre workers y reinicios)
+app.config.setdefault("SOLUTION_STORE_BACKEND", "none")
+app.config.setdefault("SOLUTION_STORE_SIZE", 100000)
+app.config.setdefault("SOLUTION_STORE_PATH", "instance/solutions.sqlite3")
+# Instrumentación: cabecera Server-Timing y volcado cProfile opcional
+# (PROFILE_REQUESTS=True permite ?profile=1; "all" perfila todas las peticiones)
+app.config.setdefault("SERVER_TIMING", True)
+app.config.setdefault("PROFILE_REQUESTS", False)
+app.config.setdefault("PROFILE_DIR", "instance/profiles")
+# Enviar las páginas de resultados por partes: cada paso se formatea y se envía sin acumularlos
+app.config.setdefault("STREAM_RESPONSES", True)
+# Sesiones de edición incremental (/api/session): 'memory' (por proceso) o 'sqlite' (compartidas)
+app.config.setdefault("SESSION_STORE_BACKEND", "memory")
+app.config.setdefault("SESSION_STORE_SIZE", 1024)
+app.config.setdefault("SESSION_STORE_PATH", "instance/sessions.sqlite3")
+# Presupuestos por petición: las resoluciones corren en un pool acotado de hilos,
+# con plazo (segundos) y admisión por tamaño y coste estimado (models.limits.estimate_cost)
+app.config.setdefault("MAX_DIMENSION", 10)
+app.config.setdefault("MAX_SOLVE_COST", 5e6)
+# Coste estimado total de una petición por lotes (/api/solve/batch, /api/properties/batch)
+app.config.setdefault("MAX_BATCH_COST", 5e7)
+app.config.setdefault("SOLVE_TIMEOUT", 10)
+app.config.setdefault("SOLVER_WORKERS", 4)
+app.config.setdefault("SOLVER_QUEUE", 16)
+# Directorio de la caché de bytecode de Jinja (compartida entre workers y reinicios); None la desactiva
+app.config.setdefault("TEMPLATE_BYTECODE_CACHE", None)
+
+request_metrics = MetricsRegistry()
 
 # ========= Filtros Jinja para formatear fracciones y vectores =========
+@lru_cache(maxsize=4096, typed=True)
+def _fmt_num_cached(x):
+    return _fmt_num(x)
+
+def _fmt_num_fast(x):
+    # Los valores se repiten mucho en una misma página (0, 1, ...): se memoriza por valor y tipo
+    # (typed=True: Fraction(1, 2) y 0.5 son iguales para el hash pero se formatean distinto)
+    try:
+        return _fmt_num_cached(x)
+    except TypeError:
+        return _fmt_num(x)
+
 def _fmt_num(x, tol=1e-9):
     # Fraction → "a/b" o "a" si es entero
     if hasattr(x, "numerator") and hasattr(x, "denominator"):
@@ -26,11 +87,298 @@ def _fmt_num(x, tol=1e-9):
 
 @app.template_filter("fmt_num")
 def jinja_fmt_num(x):
-    return _fmt_num(x)
+    return _fmt_num_fast(x)
 
 @app.template_filter("fmt_vec")
 def jinja_fmt_vec(vec):
-    return "[" + ", ".join(_fmt_num(v) for v in vec) + "]"
+    return "[" + ", ".join(_fmt_num_fast(v) for v in vec) + "]"
+
+
+# ========= Instrumentación por petición =========
+@app.before_request
+def _start_request_timer():
+    g.timer = PhaseTimer()
+    g.request_start = perf_counter()
+    profile = app.config["PROFILE_REQUESTS"]
+    if profile == "all" or (profile and request.args.get("profile")):
+        import cProfile
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@before_render_template.connect_via(app)
+def _render_started(sender, template, context, **extra):
+    g.render_start = perf_counter()
+
+@template_rendered.connect_via(app)
+def _render_finished(sender, template, context, **extra):
+    start = g.pop("render_start", None)
+    if start is not None and "timer" in g:
+        g.timer.add_time("render", perf_counter() - start)
+
+@app.after_request
+def _finish_request_timer(response):
+    if "timer" not in g:
+        return response
+    timer, start, endpoint = g.timer, g.request_start, request.endpoint or "unknown"
+    profiler = g.pop("profiler", None)
+    pool_profiles = g.pop("pool_profiles", [])
+    filename = f"{endpoint}-{int(time.time() * 1000)}.prof" if profiler is not None else None
+    if filename is not None:
+        response.headers["X-Profile-File"] = filename
+
+    if response.is_streamed:
+        # Las cabeceras salen antes que el cuerpo: Server-Timing solo puede traer lo medido
+        # hasta ahora ('headers' en lugar de 'total'). El render, el formateo y las métricas
+        # del cuerpo se registran (y el perfil se cierra) cuando el servidor cierra la respuesta.
+        if app.config["SERVER_TIMING"]:
+            response.headers["Server-Timing"] = server_timing_header(perf_counter() - start, timer, "headers")
+        response.call_on_close(lambda: _record_request(endpoint, start, timer, profiler, filename, pool_profiles))
+        return response
+
+    total = _record_request(endpoint, start, timer, profiler, filename, pool_profiles)
+    if app.config["SERVER_TIMING"]:
+        response.headers["Server-Timing"] = server_timing_header(total, timer)
+    return response
+
+def _record_request(endpoint, start, timer, profiler, filename, pool_profiles=()):
+    """
+    Cierra la medición de una petición: métricas por endpoint y volcado del perfil
+    (el del hilo de la petición más los de sus resoluciones en el pool).
+    """
+    total = perf_counter() - start
+    request_metrics.observe(endpoint, total, timer)
+    if profiler is not None:
+        import pstats
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        for pool_profiler in pool_profiles:
+            stats.add(pool_profiler)
+        os.makedirs(app.config["PROFILE_DIR"], exist_ok=True)
+        stats.dump_stats(os.path.join(app.config["PROFILE_DIR"], filename))
+    return total
+
+# ========= Resolución con caché de resultados =========
+def _result_cache():
+    if "result_cache" not in app.extensions:
+        app.extensions["result_cache"] = ResultCache.from_config(app.config)
+    return app.extensions["result_cache"]
+
+def _solution_store():
+    if "solution_store" not in app.extensions:
+        app.extensions["solution_store"] = SolutionStore.from_config(app.config)
+    return app.extensions["solution_store"]
+
+def _solver_pool():
+    if "solver_pool" not in app.extensions:
+        app.extensions["solver_pool"] = SolverPool(app.config["SOLVER_WORKERS"], app.config["SOLVER_QUEUE"])
+    return app.extensions["solver_pool"]
+
+def _run_solver(fn, deadline):
+    """
+    Ejecuta fn() en el pool de resolución. Si la petición se perfila, el hilo del pool
+    se perfila también (cProfile solo mide su propio hilo) y su perfil se suma al de la
+    petición al volcarlo.
+    """
+    profiler = g.get("profiler")
+    if profiler is None:
+        return _solver_pool().run(fn, deadline)
+    import cProfile
+    profiles = g.setdefault("pool_profiles", [])
+
+    def profiled():
+        pool_profiler = cProfile.Profile()
+        pool_profiler.enable()
+        try:
+            return fn()
+        finally:
+            pool_profiler.disable()
+            profiles.append(pool_profiler)
+
+    # Mientras espera, el hilo de la petición no hace nada que perfilar (y desde Python 3.12
+    # cProfile admite un solo perfilador activo a la vez)
+    profiler.disable()
+    try:
+        return _solver_pool().run(profiled, deadline)
+    finally:
+        profiler.enable()
+
+def _check_dimensions(*dims):
+    # Mismo límite que los formularios del paso 1; un POST fabricado no puede saltárselo
+    limit = app.config["MAX_DIMENSION"]
+    if any(d <= 0 or d > limit for d in dims):
+        return f"Las dimensiones deben ser entre 1 y {limit}."
+    return None
+
+def _cached(kind, matrix, rhs, compute, rhs_cols=1):
+    """
+    Resuelve con caché y presupuesto: admisión por coste estimado, ejecución en el
+    pool acotado y plazo SOLVE_TIMEOUT. compute(deadline, collect) hace el trabajo y
+    entrega con collect(metrics) los PhaseTimer de sus solvers: se suman a los de la
+    petición aquí, en su hilo y con el resultado ya completo (pasos formateados incluidos).
+    Lanza BudgetExceeded si la petición no cabe.
+    """
+    # Lo transcurrido hasta la primera resolución es lectura y validación del formulario
+    # (una ruta puede resolver varias veces: la segunda no es 'parse')
+    if not g.get("parse_recorded"):
+        g.timer.add_time("parse", perf_counter() - g.request_start)
+        g.parse_recorded = True
+    check_admission(estimate_cost(matrix, rhs_cols, exact=True, rhs=rhs),
+                    max_dimension=app.config["MAX_DIMENSION"], max_cost=app.config["MAX_SOLVE_COST"])
+    deadline = Deadline(app.config["SOLVE_TIMEOUT"])
+    solver_metrics = []
+
+    def run():
+        return _run_solver(lambda: compute(deadline, solver_metrics.append), deadline)
+
+    cache = _result_cache()
+    with g.timer.phase("solve"):
+        if cache is None:
+            value = run()
+        else:
+            value = cache.get_or_compute(canonical_key(kind, matrix, rhs, use_fractions=True), run)
+    for metrics in solver_metrics:
+        g.timer.merge(metrics, prefix="gauss.")
+    return value
+
+# Las páginas de resultados no incluyen los pasos: se piden a /steps/<kind> al abrir
+# "Mostrar Proceso". La resolución de la página registra igualmente las operaciones de fila
+# (es barato) para usar el mismo motor, y por tanto los mismos pivotes, que los pasos.
+def _solve_gauss(coefficients, results):
+    def compute(deadline, collect):
+        gauss_solver = Gauss(coefficients, results, use_fractions=True, deadline=deadline, store=_solution_store())
+        result = {
+            "solution": gauss_solver.get_formatted_solution(),
+            "info": gauss_solver.get_classification(),
+            "pivot_report": gauss_solver.get_pivot_report(),
+        }
+        collect(gauss_solver.metrics)
+        return result
+    return _cached("gauss", coefficients, results, compute)
+
+def _solve_matrix_equation(A, B):
+    def compute(deadline, collect):
+        matrix_solver = MatrixEquation(A, B, use_fractions=True, deadline=deadline, store=_solution_store())
+        result = {
+            "solutions": matrix_solver.get_formatted_solutions(),
+            "infos": matrix_solver.infos,
+            "pivot_reports": matrix_solver.get_all_pivot_reports(),
+            "overall_info": matrix_solver.get_overall_classification(),
+        }
+        if matrix_solver.metrics is not None:
+            collect(matrix_solver.metrics)
+        return result
+    return _cached("matrix_equation", A, B, compute, rhs_cols=len(B[0]) if B else 0)
+
+
+def _solve_matrix_operations(A):
+    def compute(deadline, collect):
+        operations = MatrixOperations(A, use_fractions=True, deadline=deadline)
+        result = {
+            "m": operations.m,
+            "n": operations.n,
+            "rank": operations.rank(),
+            "determinant": operations.determinant() if operations.is_square else None,
+            "inverse": operations.inverse(),
+            "nullspace": operations.nullspace(),
+            "pivot_report": operations.get_pivot_report(),
+        }
+        collect(operations.gauss.metrics)
+        return result
+    return _cached("matrix_operations", A, [], compute, rhs_cols=len(A))
+
+# Los pasos se piden resolviendo con registro de operaciones: se devuelve el Gauss resuelto
+# (registro compacto; Gauss.__getstate__ descarta almacén y plazo) y /steps lo formatea al enviar
+def _steps_gauss(A, b, deadline):
+    gauss_solver = Gauss(A, b, use_fractions=True, deadline=deadline, store=_solution_store())
+    gauss_solver.solve()
+    return gauss_solver
+
+def _steps_matrix_equation(A, B, deadline):
+    # La misma eliminación sobre [A | B] que MatrixEquation: los pasos de cada columna salen de ella
+    gauss_solver = Gauss(A, B, use_fractions=True, multi_rhs=True, deadline=deadline, store=_solution_store())
+    gauss_solver.solve()
+    return gauss_solver
+
+def _steps_matrix_operations(A, _, deadline):
+    return MatrixOperations(A, use_fractions=True, deadline=deadline).gauss
+
+# Pasos bajo demanda: tipo → (resolución con pasos, nombre del lado derecho en el JSON)
+STEP_KINDS = {
+    "gauss": (_steps_gauss, "b"),
+    "matrix_equation": (_steps_matrix_equation, "B"),
+    "matrix_operations": (_steps_matrix_operations, None),
+}
+
+def _exact_text(x):
+    # "p" o "p/q" sin redondear: los pasos deben eliminar exactamente el sistema de la página
+    value = to_fraction(x)
+    return str(value.numerator) if value.denominator == 1 else f"{value.numerator}/{value.denominator}"
+
+def _steps_request(kind, A, rhs=None, **extra):
+    """URL y cuerpo JSON (celdas como texto exacto) con que la página pide sus pasos."""
+    payload = {"A": [[_exact_text(x) for x in row] for row in A]}
+    name = STEP_KINDS[kind][1]
+    if name == "b":
+        payload[name] = [_exact_text(x) for x in rhs]
+    elif name is not None:
+        payload[name] = [[_exact_text(x) for x in row] for row in rhs]
+    payload.update(extra)
+    return {"url": url_for("solve_steps", kind=kind), "payload": payload}
+
+def _combination_text(target, coefficients):
+    # "v3 = 2·v1 - 1/2·v2" a partir de {índice: coeficiente}
+    terms = []
+    for i, c in coefficients.items():
+        text = _fmt_num_fast(c)
+        if text.startswith("-"):
+            terms.append(f"- {text[1:]}·v{i + 1}")
+        else:
+            terms.append(f"+ {text}·v{i + 1}")
+    expr = " ".join(terms).removeprefix("+ ") if terms else "0"
+    return f"{target} = {expr}"
+
+def _vector_summary(coefficients):
+    """
+    Independencia, base y dependencias de los vectores (columnas de la matriz) con
+    VectorSet: una sola eliminación, memorizada para las consultas repetidas.
+    """
+    vectors = [list(col) for col in zip(*coefficients)]
+
+    def compute(deadline, collect):
+        vector_set = VectorSet.cached(vectors, deadline=deadline)
+        return {
+            "independent": vector_set.is_independent(),
+            "rank": vector_set.rank,
+            "basis": [f"v{c + 1}" for c in vector_set.pivot_cols],
+            "dependencies": [_combination_text(f"v{j + 1}", coefs)
+                             for j, coefs in vector_set.dependencies().items()],
+        }
+    return _cached("vectors", coefficients, [], compute, rhs_cols=len(coefficients))
+
+def _bulk_matrix(field):
+    """
+    Matriz enviada de una sola vez: área de texto/CSV del formulario (campo 'field') o
+    JSON {field: [[...]]}. Las celdas se leen como racionales exactos.
+    Devuelve None si no se envió; lanza ValueError si no es válida.
+    """
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if isinstance(payload, dict) and payload.get(field) is not None:
+            return parse_matrix_json(payload[field])
+        return None
+    text = request.form.get(field)
+    if text is None or not text.strip():
+        return None
+    return parse_matrix_text(text)
+
+def _render_result(template, **context):
+    """
+    Renderiza una página de resultados. Con STREAM_RESPONSES la respuesta se envía
+    por partes a medida que Jinja avanza, y los pasos se generan uno a uno.
+    """
+    if app.config["STREAM_RESPONSES"]:
+        return stream_template(template, **context)
+    return render_template(template, **context)
 
 
 @app.route("/", methods=["GET"])
@@ -60,6 +408,19 @@ def linear_system():
 
 @app.route("/solve", methods=["POST"])
 def solve_linear_system():
+    # Matriz aumentada completa pegada como texto/CSV o enviada como JSON
+    try:
+        bulk = _bulk_matrix("matrix")
+    except ValueError as e:
+        return render_template("index.html", step=1, error=f"Error: {e}")
+    if bulk is not None:
+        if len(bulk[0]) < 2:
+            return render_template("index.html", step=1, error="Error: La matriz aumentada necesita al menos dos columnas.")
+        error = _check_dimensions(len(bulk), len(bulk[0]) - 1)
+        if error:
+            return render_template("index.html", step=1, error=error), 413
+        return _solve_linear_system([row[:-1] for row in bulk], [row[-1] for row in bulk])
+
     num_vars = request.form.get("num_vars")
     num_eqs = request.form.get("num_eqs")
 
@@ -73,6 +434,9 @@ def solve_linear_system():
             return render_template("index.html", step=1, error="El número de variables y ecuaciones debe ser mayor que 0.")
     except ValueError:
         return render_template("index.html", step=1, error="Error: Número de variables o ecuaciones no válido.")
+    error = _check_dimensions(num_vars, num_eqs)
+    if error:
+        return render_template("index.html", step=1, error=error), 413
 
     matrix = []
     try:
@@ -82,7 +446,7 @@ def solve_linear_system():
                 val = request.form.get(f"cell_{i}_{j}")
                 if val is None:
                     return render_template("index.html", step=1, error=f"Error: Falta el valor en la celda ({i}, {j}).")
-                row.append(float(val))
+                row.append(parse_exact(val))
             matrix.append(row)
     except ValueError:
         return render_template("index.html", step=1, error="Error: Ingrese valores numéricos válidos en la matriz.")
@@ -94,24 +458,27 @@ def solve_linear_system():
         return render_template("index.html", step=1, error="Error: Dimensiones de la matriz no válidas.")
     if len(results) != num_eqs:
         return render_template("index.html", step=1, error="Error: Vector de resultados no válido.")
+    return _solve_linear_system(coefficients, results)
 
+def _solve_linear_system(coefficients, results):
     try:
-        gauss_solver = Gauss(coefficients, results, use_fractions=True)
-        solution = gauss_solver.get_formatted_solution()
-        steps = gauss_solver.get_steps()
-        info = gauss_solver.get_classification()
-        pivot_report = gauss_solver.get_pivot_report()
+        result = _solve_gauss(coefficients, results)
+        solution = result["solution"]
+        info = result["info"]
+        pivot_report = result["pivot_report"]
 
-        return render_template(
+        return _render_result(
             "result.html",
             solution=solution,
-            steps=steps,
+            steps_request=_steps_request("gauss", coefficients, results),
             consistent=info["consistent"],
             tipo=("Única" if info["status"] == "unique" else ("Infinitas" if info["status"] == "infinite" else "Ninguna")),
             rank=info["rank"],
             n=info["n"],
             pivot_report=pivot_report
         )
+    except BudgetExceeded as e:
+        return render_template("index.html", step=1, error=f"Error al resolver el sistema: {e}"), e.status
     except Exception as e:
         error_msg = str(e) if "No tiene solución" in str(e) else "No tiene solución"
         return render_template("index.html", step=1, error=f"Error al resolver el sistema: {error_msg}")
@@ -139,9 +506,9 @@ def properties():
 def compute_properties():
     dimension = int(request.form["dimension"])
     try:
-        u = [float(request.form[f"u_{i}"]) for i in range(dimension)]
-        v = [float(request.form[f"v_{i}"]) for i in range(dimension)]
-        scalar = float(request.form["scalar"])
+        u = [parse_exact(request.form[f"u_{i}"]) for i in range(dimension)]
+        v = [parse_exact(request.form[f"v_{i}"]) for i in range(dimension)]
+        scalar = parse_exact(request.form["scalar"])
     except (ValueError, KeyError):
         return render_template("properties.html", step=1, error="Error: Ingrese valores numéricos válidos.")
 
@@ -177,36 +544,56 @@ def linear_combination():
 
 @app.route("/solve_linear_combination", methods=["POST"])
 def solve_linear_combination():
-    dimension = int(request.form["dimension"])
-    num_vectors = int(request.form["num_vectors"])
+    try:
+        # Matriz aumentada [v1 ... vk | b] de una vez (texto/CSV/JSON), o celda por celda
+        bulk = _bulk_matrix("matrix")
+        if bulk is not None:
+            if len(bulk[0]) < 2:
+                raise ValueError
+            dimension, num_vectors = len(bulk), len(bulk[0]) - 1
+        else:
+            dimension = int(request.form["dimension"])
+            num_vectors = int(request.form["num_vectors"])
+    except (ValueError, KeyError):
+        return render_template("linear_combination.html", step=1, error="Error: Ingrese valores numéricos válidos.")
+
+    error = _check_dimensions(dimension, num_vectors)
+    if error:
+        return render_template("linear_combination.html", step=1, error=error), 413
 
     try:
-        coefficients = [[float(request.form[f"v_{i}_{j}"]) for j in range(num_vectors)] for i in range(dimension)]
-        results = [float(request.form[f"b_{i}"]) for i in range(dimension)]
+        if bulk is not None:
+            coefficients = [row[:-1] for row in bulk]
+            results = [row[-1] for row in bulk]
+        else:
+            coefficients = [[parse_exact(request.form[f"v_{i}_{j}"]) for j in range(num_vectors)] for i in range(dimension)]
+            results = [parse_exact(request.form[f"b_{i}"]) for i in range(dimension)]
     except (ValueError, KeyError):
         return render_template("linear_combination.html", step=1, error="Error: Ingrese valores numéricos válidos.")
 
     try:
-        gauss_solver = Gauss(coefficients, results, use_fractions=True)
-        solution = gauss_solver.get_formatted_solution()
-        steps = gauss_solver.get_steps()
-        info = gauss_solver.get_classification()
-        pivot_report = gauss_solver.get_pivot_report()
+        result = _solve_gauss(coefficients, results)
+        solution = result["solution"]
+        info = result["info"]
+        pivot_report = result["pivot_report"]
 
         is_combination = info["consistent"]
         interpretation = "El vector objetivo es una combinación lineal." if is_combination else "El vector objetivo NO es una combinación lineal."
 
-        return render_template(
+        return _render_result(
             "result.html",
             solution=solution,
-            steps=steps,
+            steps_request=_steps_request("gauss", coefficients, results),
             consistent=info["consistent"],
             tipo=("Única" if info["status"] == "unique" else ("Infinitas" if info["status"] == "infinite" else "Ninguna")),
             rank=info["rank"],
             n=info["n"],
             pivot_report=pivot_report,
-            interpretation=interpretation
+            interpretation=interpretation,
+            vectors=_vector_summary(coefficients)
         )
+    except BudgetExceeded as e:
+        return render_template("linear_combination.html", step=1, error=f"Error: {e}"), e.status
     except Exception as e:
         error_msg = str(e) if "No tiene solución" in str(e) else "No tiene solución"
         return render_template("linear_combination.html", step=1, error=f"Error: {error_msg}")
@@ -234,32 +621,52 @@ def vector_equation():
 
 @app.route("/solve_vector_equation", methods=["POST"])
 def solve_vector_equation():
-    dimension = int(request.form["dimension"])
-    num_vectors = int(request.form["num_vectors"])
+    try:
+        # Matriz aumentada [v1 ... vk | b] de una vez (texto/CSV/JSON), o celda por celda
+        bulk = _bulk_matrix("matrix")
+        if bulk is not None:
+            if len(bulk[0]) < 2:
+                raise ValueError
+            dimension, num_vectors = len(bulk), len(bulk[0]) - 1
+        else:
+            dimension = int(request.form["dimension"])
+            num_vectors = int(request.form["num_vectors"])
+    except (ValueError, KeyError):
+        return render_template("vector_equation.html", step=1, error="Error: Ingrese valores numéricos válidos.")
+
+    error = _check_dimensions(dimension, num_vectors)
+    if error:
+        return render_template("vector_equation.html", step=1, error=error), 413
 
     try:
-        coefficients = [[float(request.form[f"v_{i}_{j}"]) for j in range(num_vectors)] for i in range(dimension)]
-        results = [float(request.form[f"b_{i}"]) for i in range(dimension)]
+        if bulk is not None:
+            coefficients = [row[:-1] for row in bulk]
+            results = [row[-1] for row in bulk]
+        else:
+            coefficients = [[parse_exact(request.form[f"v_{i}_{j}"]) for j in range(num_vectors)] for i in range(dimension)]
+            results = [parse_exact(request.form[f"b_{i}"]) for i in range(dimension)]
     except (ValueError, KeyError):
         return render_template("vector_equation.html", step=1, error="Error: Ingrese valores numéricos válidos.")
 
     try:
-        gauss_solver = Gauss(coefficients, results, use_fractions=True)
-        solution = gauss_solver.get_formatted_solution()
-        steps = gauss_solver.get_steps()
-        info = gauss_solver.get_classification()
-        pivot_report = gauss_solver.get_pivot_report()
+        result = _solve_gauss(coefficients, results)
+        solution = result["solution"]
+        info = result["info"]
+        pivot_report = result["pivot_report"]
 
-        return render_template(
+        return _render_result(
             "result.html",
             solution=solution,
-            steps=steps,
+            steps_request=_steps_request("gauss", coefficients, results),
             consistent=info["consistent"],
             tipo=("Única" if info["status"] == "unique" else ("Infinitas" if info["status"] == "infinite" else "Ninguna")),
             rank=info["rank"],
             n=info["n"],
-            pivot_report=pivot_report
+            pivot_report=pivot_report,
+            vectors=_vector_summary(coefficients)
         )
+    except BudgetExceeded as e:
+        return render_template("vector_equation.html", step=1, error=f"Error: {e}"), e.status
     except Exception as e:
         error_msg = str(e) if "No tiene solución" in str(e) else "No tiene solución"
         return render_template("vector_equation.html", step=1, error=f"Error: {error_msg}")
@@ -289,35 +696,580 @@ def matrix_equation():
 
 @app.route("/solve_matrix_equation", methods=["POST"])
 def solve_matrix_equation():
-    rows_a = int(request.form["rows_a"])
-    cols_a = int(request.form["cols_a"])
-    cols_b = int(request.form["cols_b"])
+    try:
+        # A y B de una vez (texto/CSV/JSON), o celda por celda
+        A = _bulk_matrix("A")
+        B = _bulk_matrix("B")
+        if A is not None and B is not None:
+            if len(A) != len(B):
+                raise ValueError
+            rows_a, cols_a, cols_b = len(A), len(A[0]), len(B[0])
+        else:
+            A = B = None
+            rows_a = int(request.form["rows_a"])
+            cols_a = int(request.form["cols_a"])
+            cols_b = int(request.form["cols_b"])
+    except (ValueError, KeyError):
+        return render_template("matrix_form.html", step=1, error="Error: Ingrese valores numéricos válidos.")
+    error = _check_dimensions(rows_a, cols_a, cols_b)
+    if error:
+        return render_template("matrix_form.html", step=1, error=error), 413
 
     try:
-        A = [[float(request.form[f"a_{i}_{j}"]) for j in range(cols_a)] for i in range(rows_a)]
-        B = [[float(request.form[f"b_{i}_{k}"]) for k in range(cols_b)] for i in range(rows_a)]
+        if A is None:
+            A = [[parse_exact(request.form[f"a_{i}_{j}"]) for j in range(cols_a)] for i in range(rows_a)]
+            B = [[parse_exact(request.form[f"b_{i}_{k}"]) for k in range(cols_b)] for i in range(rows_a)]
     except (ValueError, KeyError):
         return render_template("matrix_form.html", step=1, error="Error: Ingrese valores numéricos válidos.")
 
     try:
-        matrix_solver = MatrixEquation(A, B, use_fractions=True)
-        solutions = matrix_solver.get_formatted_solutions()
-        steps = matrix_solver.get_all_steps()
-        infos = matrix_solver.infos
-        pivot_reports = matrix_solver.get_all_pivot_reports()
-        overall_info = matrix_solver.get_overall_classification()
-
-        return render_template(
+        result = _solve_matrix_equation(A, B)
+        solutions = result["solutions"]
+        infos = result["infos"]
+        pivot_reports = result["pivot_reports"]
+        overall_info = result["overall_info"]
+
+        return _render_result(
             "matrix_result.html",
             solutions=solutions,
-            steps=steps,
+            steps_request=_steps_request("matrix_equation", A, B),
             infos=infos,
             pivot_reports=pivot_reports,
             overall_info=overall_info
         )
+    except BudgetExceeded as e:
+        return render_template("matrix_form.html", step=1, error=f"Error: {e}"), e.status
     except Exception as e:
         error_msg = str(e)
         return render_template("matrix_form.html", step=1, error=f"Error: {error_msg}")
 
+# Rutas para determinante, inversa, rango y espacio nulo (una sola eliminación sobre [A | I])
+MATRIX_OPERATIONS = {
+    "determinant": {"title": "Determinante", "subtitle": "Calcula det(A) con una sola eliminación",
+                    "symbol": "det(A)", "square": True},
+    "inverse": {"title": "Matriz Inversa", "subtitle": "Calcula A⁻¹ reduciendo [A | I] una sola vez",
+                "symbol": "A⁻¹", "square": True},
+    "rank": {"title": "Rango de una Matriz", "subtitle": "Número de pivotes de A",
+             "symbol": "rango(A)", "square": False},
+    "nullspace": {"title": "Espacio Nulo", "subtitle": "Base de las soluciones de A x = 0",
+                  "symbol": "Nul(A)", "square": False},
+}
+
+@app.route("/determinant", methods=["GET", "POST"], endpoint="determinant", defaults={"operation": "determinant"})
+@app.route("/inverse", methods=["GET", "POST"], endpoint="inverse", defaults={"operation": "inverse"})
+@app.route("/rank", methods=["GET", "POST"], endpoint="rank", defaults={"operation": "rank"})
+@app.route("/nullspace", methods=["GET", "POST"], endpoint="nullspace", defaults={"operation": "nullspace"})
+def matrix_operation(operation):
+    op = MATRIX_OPERATIONS[operation]
+    if request.method == "POST":
+        if op["square"]:
+            rows = cols = request.form.get("size")
+        else:
+            rows = request.form.get("rows")
+            cols = request.form.get("cols")
+
+        if rows and cols:
+            try:
+                rows = int(rows)
+                cols = int(cols)
+                if rows <= 0 or cols <= 0 or rows > 10 or cols > 10:
+                    return render_template("matrix_operation.html", op=op, operation=operation, step=1, error="Los valores deben ser entre 1 y 10.")
+                return render_template("matrix_operation.html", op=op, operation=operation, rows=rows, cols=cols, step=2)
+            except ValueError:
+                return render_template("matrix_operation.html", op=op, operation=operation, step=1, error="Por favor, ingrese números válidos.")
+        else:
+            return render_template("matrix_operation.html", op=op, operation=operation, step=1, error="Por favor, complete todos los campos.")
+
+    return render_template("matrix_operation.html", op=op, operation=operation, step=1)
+
+@app.route("/compute_matrix_operation/<operation>", methods=["POST"])
+def compute_matrix_operation(operation):
+    if operation not in MATRIX_OPERATIONS:
+        abort(404)
+    op = MATRIX_OPERATIONS[operation]
+
+    try:
+        # A de una vez (texto/CSV/JSON), o celda por celda
+        A = _bulk_matrix("A")
+        if A is not None:
+            rows, cols = len(A), len(A[0])
+        else:
+            rows = int(request.form["rows"])
+            cols = int(request.form["cols"])
+        error = _check_dimensions(rows, cols)
+        if error:
+            return render_template("matrix_operation.html", op=op, operation=operation, step=1, error=error), 413
+        if A is None:
+            A = [[parse_exact(request.form[f"a_{i}_{j}"]) for j in range(cols)] for i in range(rows)]
+    except (ValueError, KeyError):
+        return render_template("matrix_operation.html", op=op, operation=operation, step=1, error="Error: Ingrese valores numéricos válidos.")
+    if op["square"] and rows != cols:
+        return render_template("matrix_operation.html", op=op, operation=operation, step=1, error="Error: La matriz debe ser cuadrada.")
+
+    try:
+        result = _solve_matrix_operations(A)
+        return _render_result(
+            "matrix_operation_result.html",
+            op=op,
+            operation=operation,
+            result=result,
+            steps_request=_steps_request("matrix_operations", A)
+        )
+    except BudgetExceeded as e:
+        return render_template("matrix_operation.html", op=op, operation=operation, step=1, error=f"Error: {e}"), e.status
+    except Exception as e:
+        return render_template("matrix_operation.html", op=op, operation=operation, step=1, error=f"Error: {str(e)}")
+
+# Pasos de una resolución, pedidos por la página al abrir "Mostrar Proceso"
+@app.route("/steps/<kind>", methods=["POST"])
+def solve_steps(kind):
+    """
+    Fragmento HTML con los pasos de la eliminación. Cuerpo JSON {"A": [[...]], "b": [...]}
+    ('gauss'), {"A", "B", "col"} ('matrix_equation') o {"A"} ('matrix_operations').
+    La caché de resultados guarda el Gauss resuelto, no los pasos: cada paso se reconstruye
+    y formatea mientras se envía (stream_template con STREAM_RESPONSES).
+    """
+    if kind not in STEP_KINDS:
+        abort(404)
+    solve, rhs_name = STEP_KINDS[kind]
+    payload = request.get_json(silent=True)
+    try:
+        if not isinstance(payload, dict):
+            raise ValueError("Se esperaba un objeto JSON.")
+        A = parse_matrix_json(payload.get("A"))
+        if rhs_name == "b":
+            if not isinstance(payload.get("b"), list):
+                raise ValueError("'b' debe ser una lista.")
+            rhs = [parse_number(x) for x in payload["b"]]
+            rhs_cols = 1
+        elif rhs_name == "B":
+            rhs = parse_matrix_json(payload.get("B"))
+            rhs_cols = len(rhs[0])
+        else:
+            rhs, rhs_cols = [], len(A)
+        if rhs_name is not None and len(rhs) != len(A):
+            raise ValueError("El lado derecho debe tener tantas filas como A.")
+    except ValueError as e:
+        return render_template("steps.html", error=str(e)), 400
+
+    def compute(deadline, collect):
+        solver = solve(A, rhs, deadline)
+        collect(solver.metrics)
+        return solver
+
+    try:
+        solver = _cached(f"{kind}_steps", A, rhs, compute, rhs_cols=rhs_cols)
+        col = {"b": 0, "B": int(payload.get("col", 0))}.get(rhs_name)
+        if col is not None and not 0 <= col < solver.k:
+            raise IndexError("columna fuera de rango")
+    except BudgetExceeded as e:
+        return render_template("steps.html", error=str(e)), e.status
+    except (ValueError, IndexError, TypeError) as e:
+        return render_template("steps.html", error=f"Error: {e}"), 400
+
+    format_metrics = PhaseTimer()
+
+    def steps():
+        # El formateo ocurre al enviar: se suma a la petición cuando termina
+        yield from solver.iter_steps(col, metrics=format_metrics)
+        g.timer.merge(format_metrics, prefix="gauss.")
+
+    return _render_result("steps.html", steps=steps())
+
+# API JSON: muchos sistemas por petición
+@app.route("/api/solve/batch", methods=["POST"])
+def solve_batch_api():
+    payload = request.get_json(silent=True)
+    systems = payload.get("systems") if isinstance(payload, dict) else payload
+    if not isinstance(systems, list):
+        return jsonify(error="Se esperaba una lista JSON de sistemas (o {\"systems\": [...]})."), 400
+    if len(systems) > app.config["BATCH_MAX_SYSTEMS"]:
+        return jsonify(error=f"Máximo {app.config['BATCH_MAX_SYSTEMS']} sistemas por petición."), 413
+
+    deadline = Deadline(app.config["SOLVE_TIMEOUT"])
+
+    def compute():
+        return solve_batch(systems, max_workers=app.config["BATCH_MAX_WORKERS"],
+                           max_cost=app.config["MAX_SOLVE_COST"],
+                           max_total_cost=app.config["MAX_BATCH_COST"], deadline=deadline)
+
+    try:
+        with g.timer.phase("solve"):
+            results = _run_solver(compute, deadline)
+    except BudgetExceeded as e:
+        return jsonify(error=str(e)), e.status
+    return jsonify(results=results)
+
+# API JSON: propiedades de espacio vectorial para muchas instancias (u, v, escalar)
+@app.route("/api/properties/batch", methods=["POST"])
+def properties_batch_api():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("instances"), list):
+        return jsonify(error="Se esperaba {\"instances\": [{\"u\": [...], \"v\": [...], \"scalar\": k}, ...]}."), 400
+    instances = payload["instances"]
+    if len(instances) > app.config["BATCH_MAX_SYSTEMS"]:
+        return jsonify(error=f"Máximo {app.config['BATCH_MAX_SYSTEMS']} instancias por petición."), 413
+    mode = payload.get("mode", "exact")
+    if mode not in MODES:
+        return jsonify(error=f"Modo no válido: {mode!r} (use 'exact' o 'float')."), 400
+
+    exact = mode == "exact"
+    # Trabajo lineal en cada instancia: una fila [u | v | k] de la estimación de Gauss
+    # (ponderada por el tamaño de las entradas), a EXACT/FLOAT_ENTRY_COST por entrada
+    entry_cost = EXACT_ENTRY_COST if exact else FLOAT_ENTRY_COST
+    max_cost = app.config["MAX_BATCH_COST"]
+    try:
+        for item in instances:
+            if not isinstance(item, dict) or not isinstance(item.get("u"), list) or not isinstance(item.get("v"), list):
+                raise ValueError("Cada instancia debe tener 'u', 'v' (listas) y 'scalar'.")
+        # Cota inferior sin leer los números: un lote enorme se rechaza antes de convertirlo
+        check_admission({"cost": entry_cost * sum(len(item["u"]) + len(item["v"]) + 1 for item in instances)},
+                        max_cost=max_cost)
+        us = [[parse_number(x, exact) for x in item["u"]] for item in instances]
+        vs = [[parse_number(x, exact) for x in item["v"]] for item in instances]
+        scalars = [parse_number(item.get("scalar"), exact) for item in instances]
+        total = entry_cost * sum(estimate_cost([u + v + [k]], 0, exact)["cost"]
+                                 for u, v, k in zip(us, vs, scalars))
+        check_admission({"cost": total}, max_cost=max_cost)
+        deadline = Deadline(app.config["SOLVE_TIMEOUT"])
+
+        def compute():
+            batch = PropertiesBatch(us, vs, scalars, use_fractions=exact)
+            results = [{"verifications": ver} for ver in batch.get_verifications()]
+            if payload.get("computations", True):
+                for out, computations in zip(results, batch.get_computations()):
+                    out["computations"] = {name: [_fmt_num_fast(x) for x in vec] for name, vec in computations.items()}
+            return results
+
+        with g.timer.phase("solve"):
+            results = _run_solver(compute, deadline)
+    except BudgetExceeded as e:
+        return jsonify(error=str(e)), e.status
+    except (ValueError, ZeroDivisionError, ArithmeticError) as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(results=results)
+
+# API JSON: consultas sobre un conjunto de vectores (una sola eliminación para todas)
+VECTOR_QUERIES = ("independent", "spans", "rank", "basis", "dependencies", "relations",
+                  "orthogonal_basis", "qr")
+VECTOR_QUERIES_WITH_VECTOR = ("contains", "coordinates", "project")
+
+def _vector_query(vector_set, query, exact):
+    fmt_vec = lambda vec: [_fmt_num_fast(x) for x in vec]
+    if isinstance(query, dict) and len(query) == 1:
+        name, b = next(iter(query.items()))
+        if name not in VECTOR_QUERIES_WITH_VECTOR or not isinstance(b, list):
+            raise ValueError(f"Consulta no válida: {query!r}.")
+        b = [parse_number(x, exact) for x in b]
+        if name == "contains":
+            return vector_set.contains(b)
+        if name == "coordinates":
+            coordinates = vector_set.coordinates(b)
+            return fmt_vec(coordinates) if coordinates is not None else None
+        return {"projection": fmt_vec(vector_set.project(b)), "residual": fmt_vec(vector_set.residual(b))}
+    if query == "independent":
+        return vector_set.is_independent()
+    if query == "spans":
+        return vector_set.spans_space()
+    if query == "rank":
+        return vector_set.rank
+    if query == "basis":
+        return {"indices": vector_set.pivot_cols, "vectors": [fmt_vec(v) for v in vector_set.basis()]}
+    if query == "dependencies":
+        return {str(j): {str(i): _fmt_num_fast(c) for i, c in coefs.items()}
+                for j, coefs in vector_set.dependencies().items()}
+    if query == "relations":
+        return [fmt_vec(v) for v in vector_set.relations()]
+    if query == "orthogonal_basis":
+        return [fmt_vec(v) for v in vector_set.orthogonal_basis()]
+    if query == "qr":
+        q, upper = vector_set.qr()
+        return {"Q": [fmt_vec(v) for v in q], "R": [fmt_vec(row) for row in upper]}
+    raise ValueError(f"Consulta no válida: {query!r}.")
+
+@app.route("/api/vectors", methods=["POST"])
+def vectors_api():
+    """
+    {"vectors": [[...], ...], "mode": "exact"|"float", "queries": [...]}: consultas
+    ("independent", "basis", {"contains": b}, {"project": b}, ...) sobre los mismos vectores,
+    resueltas con un único VectorSet (memorizado por contenido entre peticiones).
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("vectors"), list):
+        return jsonify(error="Se esperaba {\"vectors\": [[...], ...], \"queries\": [...]}."), 400
+    queries = payload.get("queries", ["independent", "rank", "basis", "dependencies"])
+    if not isinstance(queries, list):
+        return jsonify(error="'queries' debe ser una lista."), 400
+    if len(queries) > app.config["BATCH_MAX_SYSTEMS"]:
+        return jsonify(error=f"Máximo {app.config['BATCH_MAX_SYSTEMS']} consultas por petición."), 413
+    mode = payload.get("mode", "exact")
+    if mode not in MODES:
+        return jsonify(error=f"Modo no válido: {mode!r} (use 'exact' o 'float')."), 400
+
+    exact = mode == "exact"
+    try:
+        vectors = payload["vectors"]
+        if not vectors or not all(isinstance(v, list) for v in vectors):
+            raise ValueError("'vectors' debe ser una lista de vectores (listas).")
+        vectors = [[parse_number(x, exact) for x in v] for v in vectors]
+        columns = [list(col) for col in zip(*vectors)]
+        check_admission(estimate_cost(columns, len(columns), exact), max_cost=app.config["MAX_SOLVE_COST"])
+        deadline = Deadline(app.config["SOLVE_TIMEOUT"])
+
+        def compute():
+            vector_set = VectorSet.cached(vectors, use_fractions=exact, deadline=deadline)
+            return [_vector_query(vector_set, query, exact) for query in queries]
+
+        with g.timer.phase("solve"):
+            results = _run_solver(compute, deadline)
+    except BudgetExceeded as e:
+        return jsonify(error=str(e)), e.status
+    except (ValueError, ZeroDivisionError, ArithmeticError) as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(results=results)
+
+# API JSON: sesiones de edición incremental
+def _session_store():
+    if "session_store" not in app.extensions:
+        app.extensions["session_store"] = SessionStore.from_config(app.config)
+    return app.extensions["session_store"]
+
+def _apply_session_edit(session, payload):
+    """
+    Aplica UNA edición a la sesión:
+    {"rhs": {"index": i, "value": v}} | {"rhs": [...]} |
+    {"row": {"index": i, "values": [...]}} | {"cell": {"row": i, "col": j, "value": v}}
+    """
+    exact = session.use_fractions
+    if "rhs" in payload:
+        rhs = payload["rhs"]
+        if isinstance(rhs, list):
+            return session.set_rhs_vector([parse_number(x, exact) for x in rhs])
+        if isinstance(rhs, dict):
+            return session.set_rhs(int(rhs["index"]), parse_number(rhs["value"], exact))
+    elif "row" in payload:
+        row = payload["row"]
+        if isinstance(row, dict) and isinstance(row.get("values"), list):
+            return session.set_row(int(row["index"]), [parse_number(x, exact) for x in row["values"]])
+    elif "cell" in payload:
+        cell = payload["cell"]
+        if isinstance(cell, dict):
+            return session.set_coefficient(int(cell["row"]), int(cell["col"]), parse_number(cell["value"], exact))
+    raise ValueError("Edición no válida: use 'rhs', 'row' o 'cell'.")
+
+@app.route("/api/session", methods=["POST"])
+def create_session():
+    try:
+        matrix, results, exact = parse_system(request.get_json(silent=True))
+        check_admission(estimate_cost(matrix, 1, exact, results), max_cost=app.config["MAX_SOLVE_COST"])
+        deadline = Deadline(app.config["SOLVE_TIMEOUT"])
+        with g.timer.phase("solve"):
+            session = _run_solver(
+                lambda: SolverSession(matrix, results, use_fractions=exact, deadline=deadline), deadline)
+    except BudgetExceeded as e:
+        return jsonify(error=str(e)), e.status
+    except (ValueError, ZeroDivisionError, ArithmeticError) as e:
+        return jsonify(error=str(e)), 400
+    session_id = _session_store().create(session)
+    return jsonify(session_id=session_id, result=session.result()), 201
+
+@app.route("/api/session/<session_id>", methods=["GET"])
+def get_session(session_id):
+    session = _session_store().get(session_id)
+    if session is None:
+        return jsonify(error="Sesión no encontrada."), 404
+    return jsonify(session_id=session_id, result=session.result())
+
+@app.route("/api/session/<session_id>", methods=["PATCH"])
+def edit_session(session_id):
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify(error="Se esperaba un objeto JSON con la edición."), 400
+    deadline = Deadline(app.config["SOLVE_TIMEOUT"])
+
+    def edit(session):
+        # Una edición puede volver a eliminar desde cero: con el plazo de esta petición
+        session.deadline = deadline
+        _apply_session_edit(session, payload)
+
+    try:
+        with g.timer.phase("solve"):
+            session = _run_solver(lambda: _session_store().update(session_id, edit), deadline)
+    except BudgetExceeded as e:
+        return jsonify(error=str(e)), e.status
+    except UpdateConflict:
+        return jsonify(error="La sesión cambió mientras se editaba; intente de nuevo."), 409
+    except (ValueError, KeyError, TypeError, ZeroDivisionError, ArithmeticError) as e:
+        return jsonify(error=str(e)), 400
+    if session is None:
+        return jsonify(error="Sesión no encontrada."), 404
+    return jsonify(session_id=session_id, result=session.result())
+
+@app.route("/api/session/<session_id>", methods=["DELETE"])
+def delete_session(session_id):
+    if not _session_store().delete(session_id):
+        return jsonify(error="Sesión no encontrada."), 404
+    return "", 204
+
+@app.route("/api/metrics", methods=["GET"])
+def metrics():
+    cache = _result_cache()
+    store = _solution_store()
+    return jsonify(
+        requests=request_metrics.snapshot(),
+        cache=cache.stats() if cache is not None else None,
+        store=store.stats() if store is not None else None,
+        warm_up=app.extensions.get("warm_up"),
+    )
+
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    cache = _result_cache()
+    return jsonify(cache.stats() if cache is not None else {"backend": None})
+
+# ========= Arranque: plantillas precompiladas y calentamiento =========
+def _warm_up_requests():
+    """(nombre, método, ruta, datos) de una petición mínima a cada ruta y plantilla."""
+    system = "2 1 | 3\n1 3 | 5"
+    square = "2 1\n1 3"
+    pages = ["/", "/linear_system", "/properties", "/linear_combination", "/vector_equation",
+             "/matrix_equation", "/determinant", "/inverse", "/rank", "/nullspace"]
+    requests = [(f"GET {path}", "GET", path, None) for path in pages]
+    requests += [
+        ("POST /linear_system", "POST", "/linear_system", {"num_vars": "2", "num_eqs": "2"}),
+        ("POST /properties", "POST", "/properties", {"dimension": "2"}),
+        ("POST /linear_combination", "POST", "/linear_combination", {"dimension": "2", "num_vectors": "2"}),
+        ("POST /vector_equation", "POST", "/vector_equation", {"dimension": "2", "num_vectors": "2"}),
+        ("POST /matrix_equation", "POST", "/matrix_equation", {"rows_a": "2", "cols_a": "2", "cols_b": "2"}),
+        ("POST /determinant", "POST", "/determinant", {"size": "2"}),
+        ("POST /rank", "POST", "/rank", {"rows": "2", "cols": "2"}),
+        ("POST /solve", "POST", "/solve", {"matrix": system}),
+        ("POST /solve (celdas)", "POST", "/solve", {"num_vars": "1", "num_eqs": "1", "cell_0_0": "2", "cell_0_1": "1/2"}),
+        ("POST /solve_linear_combination", "POST", "/solve_linear_combination", {"matrix": system}),
+        ("POST /solve_vector_equation", "POST", "/solve_vector_equation", {"matrix": "1 2 | 3\n2 4 | 6"}),
+        ("POST /solve_matrix_equation", "POST", "/solve_matrix_equation", {"A": square, "B": "1 0\n0 1"}),
+        ("POST /compute_properties", "POST", "/compute_properties",
+         {"dimension": "2", "scalar": "1/2", "u_0": "1", "u_1": "2", "v_0": "3", "v_1": "0.5"}),
+    ]
+    requests += [(f"POST /compute_matrix_operation/{op}", "POST", f"/compute_matrix_operation/{op}", {"A": square})
+                 for op in MATRIX_OPERATIONS]
+    batch = {"systems": [
+        {"coefficients": [[2, 1], [1, 3]], "rhs": [3, 5]},
+        {"coefficients": [[2, 1], [1, 3]], "rhs": [3, 5], "mode": "float", "verify": True},
+        {"coefficients": [[1, 2], [2, 4]], "rhs": [1, 3], "classify_only": True},
+    ]}
+    requests += [
+        ("POST /api/solve/batch", "POST", "/api/solve/batch", batch),
+        ("POST /api/properties/batch", "POST", "/api/properties/batch",
+         {"instances": [{"u": [1, "1/2"], "v": [0, 2], "scalar": 3}]}),
+        ("POST /steps/gauss", "POST", "/steps/gauss", {"A": [[2, 1], [1, 3]], "b": [3, 5]}),
+        ("POST /steps/matrix_equation", "POST", "/steps/matrix_equation",
+         {"A": [[2, 1], [1, 3]], "B": [[1, 0], [0, 1]], "col": 1}),
+        ("POST /steps/matrix_operations", "POST", "/steps/matrix_operations", {"A": [[2, 1], [1, 3]]}),
+        ("POST /api/vectors", "POST", "/api/vectors",
+         {"vectors": [[1, 2], [2, 4], [0, 1]], "queries": ["basis", "qr", {"contains": [1, 1]}]}),
+    ]
+    return requests
+
+
+def precompile_templates():
+    """Compila todas las plantillas ahora (y las guarda en la caché de bytecode, si la hay)."""
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
+def warm_up():
+    """
+    Deja el worker listo antes de recibir tráfico: compila todas las plantillas, hace una
+    petición mínima a cada ruta (formularios, resultados, API y sesiones) y una resolución
+    diminuta con cada motor de Gauss, de modo que las importaciones diferidas (NumPy) y las
+    cachés internas ya estén cargadas. La caché de resultados y el almacén de soluciones
+    se desactivan mientras tanto y las métricas de estas peticiones se descartan.
+    Devuelve los tiempos (segundos) de cada paso; también quedan en app.extensions["warm_up"].
+    """
+    timings = {}
+
+    def timed(name, fn):
+        start = perf_counter()
+        fn()
+        timings[name] = perf_counter() - start
+
+    timed("templates", precompile_templates)
+
+    # Resolución mínima con cada motor (los de NumPy solo si está instalado)
+    for engine in ENGINES:
+        if engine in ("numpy", "modular") and _numpy() is None:
+            continue
+        exact = engine not in ("float", "numpy")
+
+        def solve(engine=engine, exact=exact):
+            solver = Gauss([[2, 1], [1, 3]], [3, 5], use_fractions=exact, engine=engine)
+            solver.get_formatted_solution()
+            for _ in solver.get_steps():
+                pass
+            if not exact:
+                solver.get_diagnostics()
+
+        timed(f"engine {engine}", solve)
+
+    saved = {name: app.extensions.pop(name) for name in ("result_cache", "solution_store", "session_store")
+             if name in app.extensions}
+    app.extensions["result_cache"] = None
+    app.extensions["solution_store"] = None
+    app.extensions["session_store"] = SessionStore()
+    try:
+        client = app.test_client()
+
+        def fetch(method, path, data):
+            # Leer el cuerpo y cerrar la respuesta, como el servidor (cierra la medición por partes)
+            if method == "GET":
+                response = client.get(path)
+            elif path.startswith(("/api/", "/steps/")):
+                response = client.post(path, json=data)
+            else:
+                response = client.post(path, data=data)
+            with response:
+                response.get_data()
+
+        for name, method, path, data in _warm_up_requests():
+            timed(name, lambda method=method, path=path, data=data: fetch(method, path, data))
+
+        def session_roundtrip():
+            created = client.post("/api/session", json={"coefficients": [[2, 1], [1, 3]], "rhs": [3, 5]}).get_json()
+            path = f"/api/session/{created['session_id']}"
+            client.patch(path, json={"rhs": {"index": 0, "value": 4}})
+            client.patch(path, json={"row": {"index": 1, "values": [2, 1]}})
+            client.get(path)
+            client.delete(path)
+
+        timed("session", session_roundtrip)
+    finally:
+        for name in ("result_cache", "solution_store", "session_store"):
+            app.extensions.pop(name, None)
+        app.extensions.update(saved)
+        request_metrics.reset()
+
+    app.extensions["warm_up"] = timings
+    return timings
+
+
+def create_app(config=None, warm=True):
+    """
+    Fábrica para el servidor (gunicorn "app:create_app()"): aplica la configuración,
+    activa la caché de bytecode de Jinja (TEMPLATE_BYTECODE_CACHE) y, con warm=True,
+    calienta el worker (warm_up) antes de devolver la aplicación.
+    """
+    if config:
+        app.config.update(config)
+    directory = app.config["TEMPLATE_BYTECODE_CACHE"]
+    if directory and app.jinja_env.bytecode_cache is None:
+        from jinja2 import FileSystemBytecodeCache
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    if warm:
+        warm_up()
+    return app
+
+
 if __name__ == "__main__":
     app.run(debug=True)
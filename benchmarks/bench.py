@@ -0,0 +1,353 @@
+# benchmarks/bench.py
+# Banco de pruebas de rendimiento para los modelos (Gauss, MatrixEquation, Properties) y las rutas Flask.
+#
+# Uso (desde la raíz del repositorio):
+#   python -m benchmarks.bench --out bench.json            # corre todo y guarda JSON
+#   python -m benchmarks.bench --quick                     # tamaños pequeños
+#   python -m benchmarks.bench --compare bench.json        # compara contra una línea base
+#   python -m benchmarks.bench --filter gauss/int          # solo los casos cuyo nombre contiene el texto
+#   python -m benchmarks.bench --filter startup            # arranque en frío de un worker
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from math import lcm
+
+from models.equations_solver import Gauss
+from models.matrix_equation import MatrixEquation
+from models.properties import Properties, PropertiesBatch
+
+SIZES = (4, 8, 16, 32, 64)
+QUICK_SIZES = (4, 8, 16)
+
+
+# ========= Generadores reproducibles de entradas =========
+def _rng(name):
+    # Semilla estable por caso (hash() de Python cambia entre ejecuciones)
+    return random.Random(zlib.crc32(name.encode("utf-8")))
+
+
+def well_conditioned(rnd, n, integer=True):
+    """Matriz diagonalmente dominante: siempre invertible y bien condicionada."""
+    value = (lambda: rnd.randint(-9, 9)) if integer else (lambda: round(rnd.uniform(-9, 9), 2))
+    A = [[value() for _ in range(n)] for _ in range(n)]
+    for i in range(n):
+        A[i][i] = sum(abs(x) for x in A[i]) + (1 if integer else 1.5)
+    return A
+
+
+def singular(rnd, n, integer=True):
+    """Matriz de rango n/2: las filas de la segunda mitad son combinaciones de la primera."""
+    A = well_conditioned(rnd, n, integer)
+    half = max(1, n // 2)
+    for i in range(half, n):
+        a, b = rnd.randint(-2, 2), rnd.randint(-2, 2)
+        A[i] = [a * A[i - half][j] + b * A[(i + 1) % half][j] for j in range(n)]
+    return A
+
+
+def hilbert_like(n):
+    """
+    Peor caso de crecimiento de coeficientes: la matriz de Hilbert H_ij = 1 / (i + j + 1)
+    multiplicada por mcm(1..2n-1) para que todas sus entradas sean enteras.
+    """
+    scale = lcm(*range(1, 2 * n))
+    return [[scale // (i + j + 1) for j in range(n)] for i in range(n)]
+
+
+def rhs(rnd, m, integer=True):
+    return [rnd.randint(-20, 20) if integer else round(rnd.uniform(-20, 20), 2) for _ in range(m)]
+
+
+# ========= Medición =========
+def measure(fn, repeat=5, min_time=0.05):
+    """
+    Ejecuta fn repetidamente y devuelve los tiempos por llamada (segundos).
+    Cada repetición agrupa tantas llamadas como hagan falta para superar min_time.
+    """
+    start = time.perf_counter()
+    fn()
+    single = time.perf_counter() - start
+    number = max(1, int(min_time / single)) if single > 0 else 1000
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def _summary(timings):
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "repeat": len(timings),
+    }
+
+
+# ========= Casos =========
+def gauss_cases(sizes):
+    kinds = (
+        ("int_wellcond", lambda rnd, n: (well_conditioned(rnd, n), rhs(rnd, n)), True),
+        ("int_singular", lambda rnd, n: (singular(rnd, n), rhs(rnd, n)), True),
+        ("int_worst", lambda rnd, n: (hilbert_like(n), rhs(rnd, n)), True),
+        ("decimal_wellcond", lambda rnd, n: (well_conditioned(rnd, n, False), rhs(rnd, n, False)), True),
+        ("float_wellcond", lambda rnd, n: (well_conditioned(rnd, n, False), rhs(rnd, n, False)), False),
+        ("float_singular", lambda rnd, n: (singular(rnd, n, False), rhs(rnd, n, False)), False),
+    )
+    for kind, make, use_fractions in kinds:
+        for n in sizes:
+            name = f"gauss/{kind}/n={n}"
+            A, b = make(_rng(name), n)
+
+            def solve_only(A=A, b=b, use_fractions=use_fractions):
+                Gauss(A, b, use_fractions=use_fractions, record_steps=False).solve()
+
+            def solve_with_steps(A=A, b=b, use_fractions=use_fractions):
+                Gauss(A, b, use_fractions=use_fractions).solve()
+
+            def solve_and_format(A=A, b=b, use_fractions=use_fractions):
+                g = Gauss(A, b, use_fractions=use_fractions)
+                g.get_formatted_solution()
+                g.get_pivot_report()
+                for _ in g.get_steps():
+                    pass
+
+            def classify_only(A=A, b=b, use_fractions=use_fractions):
+                # Tras la primera llamada el perfil de rango de A está memorizado: mide la vía rápida
+                Gauss(A, b, use_fractions=use_fractions, record_steps=False).get_classification()
+
+            yield f"{name}/solve", solve_only
+            yield f"{name}/classify", classify_only
+            yield f"{name}/solve+steps", solve_with_steps
+            yield f"{name}/solve+steps+format", solve_and_format
+
+
+def engine_cases(sizes):
+    # Motores exactos sin pasos sobre decimales (la elección por defecto de Gauss._default_engine)
+    for n in sorted(set(sizes) | {96}):
+        for kind, make in (("wellcond", well_conditioned), ("singular", singular)):
+            name = f"engine/decimal_{kind}/n={n}"
+            rnd = _rng(name)
+            A, b = make(rnd, n, False), rhs(rnd, n, False)
+            for engine in ("fraction", "bareiss", "hybrid", "modular"):
+                yield f"{name}/{engine}", lambda A=A, b=b, engine=engine: Gauss(
+                    A, b, engine=engine, record_steps=False).solve()
+
+    # Matrices en banda (tridiagonal y de semiancho 5): 'sparse' frente a 'modular' y la elección por defecto
+    for n in sorted(set(sizes) | {200}):
+        for width in (1, 5):
+            name = f"engine/banded_w{width}/n={n}"
+            rnd = _rng(name)
+            A = [[rnd.randint(1, 9) if abs(i - j) <= width else 0 for j in range(n)] for i in range(n)]
+            b = rhs(rnd, n)
+            for engine in ("fraction", "sparse", "modular", None):
+                yield f"{name}/{engine or 'default'}", lambda A=A, b=b, engine=engine: Gauss(
+                    A, b, engine=engine, record_steps=False).solve()
+
+
+def matrix_equation_cases(sizes):
+    n = sizes[min(1, len(sizes) - 1)]
+    for cols_b in (1, 8, 32):
+        name = f"matrix_equation/n={n}/cols_b={cols_b}"
+        rnd = _rng(name)
+        A = well_conditioned(rnd, n)
+        B = [[rnd.randint(-9, 9) for _ in range(cols_b)] for _ in range(n)]
+
+        def run(A=A, B=B):
+            me = MatrixEquation(A, B)
+            for col_steps in me.get_all_steps():
+                for _ in col_steps:
+                    pass
+
+        yield name, run
+
+    # A X = I sin pasos: una eliminación; la reconstrucción de las columnas de B en este
+    # proceso (por defecto) o por bloques repartidos entre un proceso por núcleo
+    n = sizes[-1]
+    name = f"matrix_equation/n={n}/inverse"
+    A = well_conditioned(_rng(name), n)
+    identity = [[int(i == j) for j in range(n)] for i in range(n)]
+    yield f"{name}/serial", lambda A=A: MatrixEquation(A, identity, record_steps=False)
+    yield f"{name}/chunked", lambda A=A: MatrixEquation(A, identity, record_steps=False, max_workers=None)
+
+
+def properties_cases():
+    for dim in (10, 1000):
+        name = f"properties/dim={dim}"
+        rnd = _rng(name)
+        u = [round(rnd.uniform(-9, 9), 2) for _ in range(dim)]
+        v = [round(rnd.uniform(-9, 9), 2) for _ in range(dim)]
+
+        def run(u=u, v=v, dim=dim):
+            props = Properties(u, v, 1.5, dim)
+            props.get_verifications()
+            props.get_computations()
+
+        yield name, run
+
+    for exact in (True, False):
+        name = f"properties/batch=1000/dim=10/{'exact' if exact else 'float'}"
+        rnd = _rng(name)
+        us = [[round(rnd.uniform(-9, 9), 2) for _ in range(10)] for _ in range(1000)]
+        vs = [[round(rnd.uniform(-9, 9), 2) for _ in range(10)] for _ in range(1000)]
+        scalars = [round(rnd.uniform(-3, 3), 1) for _ in range(1000)]
+
+        def run_batch(us=us, vs=vs, scalars=scalars, exact=exact):
+            batch = PropertiesBatch(us, vs, scalars, use_fractions=exact)
+            batch.get_verifications()
+            batch.get_computations()
+
+        yield name, run_batch
+
+
+def route_cases():
+    from app import app
+
+    app.config["RESULT_CACHE_BACKEND"] = "none"
+    app.extensions.pop("result_cache", None)
+    client = app.test_client()
+
+    def post(path, **kwargs):
+        # Con STREAM_RESPONSES el cuerpo se genera al leerlo: get_data() mide la página completa
+        # y close() el registro de la petición, que con respuestas por partes se hace al cerrar
+        with client.post(path, **kwargs) as response:
+            return response.get_data()
+
+    def system_form(A, b):
+        form = {"num_vars": str(len(A[0])), "num_eqs": str(len(A))}
+        for i, row in enumerate(A):
+            for j, x in enumerate(row + [b[i]]):
+                form[f"cell_{i}_{j}"] = str(x)
+        return form
+
+    for n in (3, 10):
+        name = f"route/solve/n={n}"
+        rnd = _rng(name)
+        A, b = well_conditioned(rnd, n), rhs(rnd, n)
+        form = system_form(A, b)
+        yield name, lambda form=form: post("/solve", data=form)
+        # Pasos pedidos por la página al abrir "Mostrar Proceso"
+        steps = {"A": A, "b": b}
+        yield f"{name}/steps", lambda steps=steps: post("/steps/gauss", json=steps)
+
+    name = "route/solve_matrix_equation/n=10/cols_b=10"
+    rnd = _rng(name)
+    form = {"rows_a": "10", "cols_a": "10", "cols_b": "10"}
+    for i, row in enumerate(well_conditioned(rnd, 10)):
+        for j, x in enumerate(row):
+            form[f"a_{i}_{j}"] = str(x)
+        for k in range(10):
+            form[f"b_{i}_{k}"] = str(rnd.randint(-9, 9))
+    yield name, lambda form=form: post("/solve_matrix_equation", data=form)
+
+    name = "route/compute_properties/dim=10"
+    rnd = _rng(name)
+    form = {"dimension": "10", "scalar": "2.5"}
+    for i in range(10):
+        form[f"u_{i}"] = str(rnd.randint(-9, 9))
+        form[f"v_{i}"] = str(rnd.randint(-9, 9))
+    yield name, lambda form=form: post("/compute_properties", data=form)
+
+
+def startup_cases():
+    # Cada caso lanza un intérprete nuevo: importación de app.py, importación más la primera
+    # petición (plantilla y solvers en frío) y arranque completo con create_app (warm_up)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    snippets = (
+        ("startup/import", "import app"),
+        ("startup/import+first_request",
+         "import app; app.app.test_client().post('/solve', data={'matrix': '2 1 | 3\\n1 3 | 5'}).get_data()"),
+        ("startup/create_app", "import app; app.create_app()"),
+    )
+    for name, code in snippets:
+        yield name, lambda code=code: subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def all_cases(quick=False):
+    sizes = QUICK_SIZES if quick else SIZES
+    yield from gauss_cases(sizes)
+    yield from engine_cases(sizes)
+    yield from matrix_equation_cases(sizes)
+    yield from properties_cases()
+    yield from route_cases()
+    yield from startup_cases()
+
+
+# ========= Ejecución y comparación =========
+def run(quick=False, repeat=5, name_filter=None, stream=sys.stdout):
+    results = {}
+    for name, fn in all_cases(quick):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = _summary(measure(fn, repeat=repeat))
+        print(f"{name:60s} {results[name]['min'] * 1e3:12.3f} ms", file=stream)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.2, stream=sys.stdout):
+    """
+    Compara los mínimos de cada caso contra la línea base.
+    Devuelve la lista de casos cuyo tiempo creció más que 'threshold' (0.2 = 20 %).
+    """
+    regressions = []
+    base = baseline["results"]
+    for name, data in current["results"].items():
+        if name not in base:
+            continue
+        ratio = data["min"] / base[name]["min"] if base[name]["min"] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "REGRESIÓN"
+            regressions.append({"name": name, "ratio": ratio})
+        elif ratio < 1 / (1 + threshold):
+            flag = "mejora"
+        print(f"{name:60s} x{ratio:6.2f} {flag}", file=stream)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de la calculadora de álgebra lineal.")
+    parser.add_argument("--quick", action="store_true", help="solo tamaños pequeños")
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones por caso")
+    parser.add_argument("--filter", dest="name_filter", help="solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--out", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de línea base contra el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.2, help="tolerancia de regresión (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    current = run(quick=args.quick, repeat=args.repeat, name_filter=args.name_filter)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(current, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regresión(es) por encima del {args.threshold:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# models/batch.py
+# Resolución de muchos sistemas A x = b por petición (API JSON), repartidos en un pool de procesos
+
+import math
+import os
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+
+from models.equations_solver import Gauss
+from models.limits import (BudgetExceeded, Deadline, SolveRejected, SolveTimeout, check_admission,
+                           estimate_cost)
+from models.parsing import parse_number
+
+MODES = ("exact", "float")
+# Por debajo de este número de sistemas no compensa enviar trabajo a otros procesos
+PARALLEL_MIN = 8
+
+_pool = None
+_pool_workers = None
+
+
+def _get_pool(max_workers=None):
+    # multiprocessing se importa solo cuando un lote de verdad necesita el pool
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool, _pool_workers
+    workers = max_workers or os.cpu_count() or 1
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def parse_system(spec):
+    """
+    Valida un sistema {'coefficients': [[...]], 'rhs': [...], 'mode': 'exact'|'float'}
+    y devuelve (coeficientes, resultados, use_fractions).
+    Los números pueden ser enteros, decimales o cadenas como '3/4'.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Cada sistema debe ser un objeto JSON.")
+    mode = spec.get("mode", "exact")
+    if mode not in MODES:
+        raise ValueError(f"Modo no válido: {mode!r} (use 'exact' o 'float').")
+    coefficients = spec.get("coefficients")
+    rhs = spec.get("rhs")
+    if not isinstance(coefficients, list) or not all(isinstance(row, list) for row in coefficients):
+        raise ValueError("'coefficients' debe ser una lista de filas.")
+    if not isinstance(rhs, list):
+        raise ValueError("'rhs' debe ser una lista.")
+
+    exact = mode == "exact"
+    matrix = [[parse_number(x, exact) for x in row] for row in coefficients]
+    results = [parse_number(x, exact) for x in rhs]
+    return matrix, results, exact
+
+
+def _json_diagnostics(diagnostics):
+    # JSON no admite inf: una matriz singular se informa con condition = None
+    return {key: (None if isinstance(value, float) and not math.isfinite(value) else value)
+            for key, value in diagnostics.items()}
+
+
+def solve_system(spec, max_cost=None, deadline=None):
+    """
+    Resuelve un sistema del lote. Los errores se devuelven en 'error', salvo SolveTimeout:
+    el plazo (deadline) es el de todo el lote, así que al vencer se detiene el lote entero.
+    Con max_cost, los sistemas cuyo coste estimado lo supera se rechazan sin resolverlos.
+    En modo 'float' el resultado incluye 'diagnostics' (Gauss.get_diagnostics); con
+    'verify': true los sistemas sospechosos se vuelven a resolver en modo exacto
+    ('rechecked': true) y el resto se queda con el resultado flotante.
+    Con 'classify_only': true solo se devuelven el rango y la compatibilidad
+    (Gauss.classify: sin RREF ni soluciones, y con rank(A) memorizado si A se repite).
+    """
+    try:
+        matrix, results, exact = parse_system(spec)
+        if max_cost is not None:
+            check_admission(estimate_cost(matrix, 1, exact, results), max_cost=max_cost)
+        solver = Gauss(matrix, results, use_fractions=exact, record_steps=False, deadline=deadline)
+        if spec.get("classify_only"):
+            info = solver.classify()[0]
+            return {key: info[key] for key in ("status", "consistent", "rank", "m", "n")}
+        solver.solve()
+        diagnostics = None if exact else solver.get_diagnostics()
+        if diagnostics is not None and diagnostics["suspicious"] and spec.get("verify"):
+            exact_spec = dict(spec, mode="exact", verify=False)
+            out = solve_system(exact_spec, max_cost, deadline)
+            out["rechecked"] = True
+            out["diagnostics"] = _json_diagnostics(diagnostics)
+            return out
+        info = solver.get_classification()
+        out = {
+            "status": info["status"],
+            "consistent": info["consistent"],
+            "rank": info["rank"],
+            "m": info["m"],
+            "n": info["n"],
+            "pivot_cols": solver.pivot_cols,
+            "solution": solver.get_formatted_solution(),
+        }
+        if solver.status == "unique":
+            out["values"] = [solver._format_number(x) for x in solver.solution]
+        if diagnostics is not None:
+            out["diagnostics"] = _json_diagnostics(diagnostics)
+        return out
+    except SolveTimeout:
+        raise
+    except (ValueError, ZeroDivisionError, ArithmeticError, BudgetExceeded) as e:
+        return {"error": str(e)}
+
+
+def _solve_system_in_process(spec, max_cost, seconds):
+    # En un proceso del pool: el Deadline no viaja entre procesos, se rehace con lo que queda
+    deadline = Deadline(seconds) if seconds is not None else None
+    return solve_system(spec, max_cost, deadline)
+
+
+def estimate_batch_cost(systems, stop_at=None):
+    """
+    Coste estimado de todo el lote: suma de estimate_cost de sus sistemas válidos
+    (los inválidos fallan por su cuenta sin resolverse y no cuentan).
+    Con stop_at deja de leer sistemas en cuanto la suma lo supera.
+    """
+    total = 0
+    for spec in systems:
+        try:
+            matrix, results, exact = parse_system(spec)
+            total += estimate_cost(matrix, 1, exact, results)["cost"]
+        except (ValueError, ZeroDivisionError, ArithmeticError):
+            continue
+        if stop_at is not None and total > stop_at:
+            break
+    return total
+
+
+def solve_batch(systems, max_workers=None, max_cost=None, max_total_cost=None, deadline=None):
+    """
+    Resuelve una lista de sistemas. Los lotes grandes se reparten en un
+    pool de procesos (uno por núcleo por defecto); los pequeños se resuelven aquí.
+    max_cost limita cada sistema y max_total_cost el lote entero: si la suma de costes
+    estimados lo supera se lanza SolveRejected sin resolver nada. Con deadline, al vencer
+    el plazo se lanza SolveTimeout y se cancelan los bloques que aún no empezaron.
+    Devuelve los resultados en el mismo orden que la entrada.
+    """
+    if max_total_cost is not None:
+        total = estimate_batch_cost(systems, stop_at=max_total_cost)
+        if total > max_total_cost:
+            raise SolveRejected(
+                f"El lote es demasiado costoso de resolver "
+                f"(coste estimado por encima del máximo {max_total_cost:.3g})."
+            )
+    if len(systems) < PARALLEL_MIN or max_workers == 1:
+        return [solve_system(spec, max_cost, deadline) for spec in systems]
+    if deadline is not None:
+        deadline.check()
+    seconds = deadline.remaining() if deadline is not None else None
+    pool = _get_pool(max_workers)
+    chunksize = max(1, len(systems) // (4 * _pool_workers))
+    solve = partial(_solve_system_in_process, max_cost=max_cost, seconds=seconds)
+    try:
+        # map cancela los bloques pendientes si se deja de esperar
+        return list(pool.map(solve, systems, chunksize=chunksize, timeout=seconds))
+    except FutureTimeout:
+        raise SolveTimeout(f"Se superó el tiempo máximo de resolución ({deadline.seconds:g} s).")
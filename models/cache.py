@@ -0,0 +1,346 @@
+# models/cache.py
+# Caché de resultados de los solvers indexada por el contenido del sistema (hash canónico)
+# y almacén persistente de sistemas resueltos indexado por su forma canónica
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from fractions import Fraction
+from math import gcd, lcm
+
+from models.parsing import to_fraction
+
+# Intentos de update() cuando otro escritor cambia el valor entre la lectura y la escritura
+UPDATE_RETRIES = 32
+
+
+class UpdateConflict(RuntimeError):
+    """update() no pudo guardar su edición: el valor cambió en cada uno de los intentos."""
+
+
+def _canonical_number(x, use_fractions):
+    # Mismo valor que verá Gauss: 2, 2.0 y "2" producen la misma clave
+    if use_fractions:
+        f = to_fraction(x)
+        return f"{f.numerator}/{f.denominator}"
+    return repr(float(x))
+
+
+def canonical_key(kind, matrix, rhs, use_fractions=True, tol=1e-12):
+    """
+    Hash SHA-256 de (tipo de problema, matriz, lado derecho, use_fractions, tol).
+    'rhs' puede ser un vector (Ax=b) o una matriz (AX=B).
+    """
+    def canon(value):
+        if isinstance(value, (list, tuple)):
+            return [canon(v) for v in value]
+        return _canonical_number(value, use_fractions)
+
+    payload = json.dumps([kind, canon(matrix), canon(rhs), bool(use_fractions), repr(tol)],
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def canonical_system(rows):
+    """
+    Forma canónica de un sistema exacto [A | B] (filas de Fraction/int): cada fila se
+    escala a enteros primitivos (mcd 1, primera entrada no nula positiva) y las filas
+    se ordenan. Los sistemas que solo difieren en el orden de las ecuaciones o en un
+    factor por ecuación tienen la misma forma canónica (y las mismas soluciones).
+    Devuelve (filas canónicas, orden, escalas): la fila canónica i es
+    escalas[i] · filas[orden[i]].
+    """
+    scaled = []
+    for idx, row in enumerate(rows):
+        values = [x if isinstance(x, Fraction) else Fraction(x) for x in row]
+        den = lcm(*(x.denominator for x in values)) if values else 1
+        nums = [x.numerator * (den // x.denominator) for x in values]
+        g = gcd(*nums)
+        if g == 0:
+            scaled.append((nums, idx, Fraction(1)))
+            continue
+        if next(x for x in nums if x) < 0:
+            g = -g
+        scaled.append(([x // g for x in nums], idx, Fraction(den, g)))
+    scaled.sort(key=lambda item: item[0])
+    return [item[0] for item in scaled], [item[1] for item in scaled], [item[2] for item in scaled]
+
+
+class MemoryBackend:
+    """LRU en memoria del proceso (OrderedDict)."""
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        """Guarda el valor y devuelve cuántas entradas se desalojaron."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def update(self, key, edit):
+        """
+        Aplica edit() a una copia del valor guardado, sin el candado, y la guarda solo si
+        el valor sigue siendo el mismo objeto (compare-and-swap); si cambió, repite con el
+        nuevo. Si edit lanza una excepción (un plazo vencido a mitad de una eliminación, por
+        ejemplo) el valor guardado queda intacto. Devuelve el valor nuevo, o None si la clave
+        no existe (o se borró durante la edición). Lanza UpdateConflict tras UPDATE_RETRIES.
+        """
+        for _ in range(UPDATE_RETRIES):
+            with self._lock:
+                current = self._data.get(key)
+                if current is None:
+                    return None
+                self._data.move_to_end(key)
+            value = copy.deepcopy(current)
+            edit(value)
+            with self._lock:
+                if key not in self._data:
+                    return None
+                if self._data[key] is current:
+                    self._data[key] = value
+                    return value
+        raise UpdateConflict(f"La entrada {key} cambió durante cada uno de los {UPDATE_RETRIES} intentos.")
+
+    def delete(self, key):
+        """Elimina la entrada; devuelve True si existía."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """
+    LRU en un archivo sqlite local: lo comparten varios workers de Gunicorn
+    en la misma máquina y sobrevive a reinicios.
+    """
+    def __init__(self, path, maxsize=256):
+        self.path = path
+        self.maxsize = maxsize
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    def _connect(self):
+        # sqlite3 se importa solo con este backend (arranque más rápido con 'memory')
+        import sqlite3
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+                (key, blob, time.time()),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            evicted = max(0, count - self.maxsize)
+            if evicted:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    " SELECT key FROM results ORDER BY last_used ASC LIMIT ?)",
+                    (evicted,),
+                )
+        return evicted
+
+    def update(self, key, edit):
+        """
+        Lee el valor, aplica edit(valor) fuera de toda transacción (puede ser una eliminación
+        larga) y lo guarda con un compare-and-swap: el UPDATE solo se aplica si el valor
+        guardado sigue siendo el que se leyó. Si otro worker escribió entretanto se repite
+        con el valor nuevo, así que las ediciones concurrentes no se pisan y la base solo
+        se bloquea durante la escritura. Si edit lanza una excepción no se guarda nada.
+        Devuelve el valor, o None si no existe. Lanza UpdateConflict tras UPDATE_RETRIES.
+        """
+        for _ in range(UPDATE_RETRIES):
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value = pickle.loads(row[0])
+            edit(value)
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._connect() as conn:
+                updated = conn.execute(
+                    "UPDATE results SET value = ?, last_used = ? WHERE key = ? AND value = ?",
+                    (blob, time.time(), key, row[0]),
+                ).rowcount
+            if updated:
+                return value
+        raise UpdateConflict(f"La entrada {key} cambió durante cada uno de los {UPDATE_RETRIES} intentos.")
+
+    def delete(self, key):
+        """Elimina la entrada; devuelve True si existía."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM results WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM results")
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Caché de resultados con contadores de aciertos/fallos.
+    Los valores deben ser datos planos (listas, dicts, str, int, bool)
+    para poder guardarse en cualquier backend.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Construye la caché a partir de la configuración de Flask:
+        RESULT_CACHE_BACKEND ('memory' | 'sqlite' | 'none'), RESULT_CACHE_SIZE, RESULT_CACHE_PATH.
+        Devuelve None si la caché está desactivada.
+        """
+        kind = config.get("RESULT_CACHE_BACKEND", "memory")
+        size = config.get("RESULT_CACHE_SIZE", 256)
+        if kind == "none" or not size:
+            return None
+        if kind == "memory":
+            return cls(MemoryBackend(size))
+        if kind == "sqlite":
+            return cls(SQLiteBackend(config.get("RESULT_CACHE_PATH", "instance/results.sqlite3"), size))
+        raise ValueError(f"Backend de caché desconocido: {kind}.")
+
+    def get_or_compute(self, key, compute):
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+        value = compute()
+        evicted = self.backend.set(key, value)
+        with self._lock:
+            self.misses += 1
+            self.evictions += evicted
+        return value
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "maxsize": self.backend.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SolutionStore:
+    """
+    Almacén de sistemas exactos ya resueltos, indexado por su forma canónica
+    (canonical_system): guarda la RREF, la clasificación y las soluciones por columna
+    y, si se registraron, los pasos de la eliminación del sistema canónico.
+    Gauss lo consulta antes de eliminar (parámetro store). Con el backend sqlite
+    lo comparten los workers y sobrevive a reinicios.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        SOLUTION_STORE_BACKEND ('none' | 'memory' | 'sqlite'), SOLUTION_STORE_SIZE,
+        SOLUTION_STORE_PATH. Devuelve None si el almacén está desactivado.
+        """
+        kind = config.get("SOLUTION_STORE_BACKEND", "none")
+        size = config.get("SOLUTION_STORE_SIZE", 100000)
+        if kind == "none" or not size:
+            return None
+        if kind == "memory":
+            return cls(MemoryBackend(size))
+        if kind == "sqlite":
+            return cls(SQLiteBackend(config.get("SOLUTION_STORE_PATH", "instance/solutions.sqlite3"), size))
+        raise ValueError(f"Backend de almacén desconocido: {kind}.")
+
+    @staticmethod
+    def key(rows, n, engine):
+        """Hash de la forma canónica, del número de columnas de A y del motor (los pasos dependen de él)."""
+        payload = json.dumps([n, engine, rows], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key, need_steps=False):
+        """Registro guardado, o None si no existe (o no tiene pasos y need_steps)."""
+        record = self.backend.get(key)
+        if record is not None and need_steps and record["steps"] is None:
+            record = None
+        with self._lock:
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return record
+
+    def put(self, key, record):
+        evicted = self.backend.set(key, record)
+        with self._lock:
+            self.evictions += evicted
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "maxsize": self.backend.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,7 +1,205 @@
 from fractions import Fraction
+from math import lcm
+from time import perf_counter
+
+from models.cache import MemoryBackend, canonical_key, canonical_system
+from models.metrics import PhaseTimer
+from models.modular import BLOCK_SIZE, PRIMES, dixon_solve, inverse_mod, multimodular_rref
+from models.parsing import to_fraction
+from models.rational import RationalRow
+
+ENGINES = ("fraction", "bareiss", "float", "numpy", "sparse", "hybrid", "modular")
+# Pivoteo con umbral del motor disperso en punto flotante: se aceptan pivotes
+# con |valor| >= SPARSE_PIVOT_THRESHOLD · máximo de la columna
+SPARSE_PIVOT_THRESHOLD = 0.1
+# Sin pasos que mostrar y sin NumPy (sin 'modular'), los sistemas exactos desde este tamaño
+# usan el motor 'hybrid': por debajo 'bareiss' es más rápido (benchmarks: engine/decimal)
+HYBRID_MIN_SIZE = 96
+# Con NumPy, los sistemas exactos desde este tamaño usan el motor 'modular' (también
+# con pasos: a este tamaño las tablas intermedias no se leen)
+MODULAR_MIN_SIZE = 48
+# Sistemas exactos de ese tamaño en banda (toda entrada no nula de A a distancia de la
+# diagonal <= SPARSE_BAND_RATIO · min(m, n)) usan 'sparse': la eliminación no rellena fuera
+# de la banda (benchmarks: engine/banded). Una dispersión sin banda sí rellena: no cuenta
+SPARSE_BAND_RATIO = 1 / 16
+# Diagnóstico en punto flotante (get_diagnostics): por encima de estos umbrales el
+# resultado es sospechoso y conviene repetirlo en modo exacto
+SUSPICIOUS_CONDITION = 1e10
+SUSPICIOUS_GROWTH = 1e3
+SUSPICIOUS_RESIDUAL = 1e-10
+# Un pivote aceptado (o descartado) a menos de este factor de rank_tol es una decisión de rango dudosa
+BORDERLINE_PIVOT = 1e2
+
+# Perfiles de rango (RankProfile) memorizados por contenido de A: clasificar otro b con
+# la misma A solo repite las operaciones de fila sobre b
+RANK_PROFILE_CACHE_SIZE = 256
+
+_np = None
+_rank_profiles = MemoryBackend(RANK_PROFILE_CACHE_SIZE)
+
+def _numpy():
+    """Importa NumPy bajo demanda; devuelve None si no está instalado."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        _np = numpy
+    return _np
+
+
+def format_number(num, use_fractions=True, tol=1e-12):
+    """Texto de un valor de la solución: 'a/b' para Fraction, 6 decimales para float."""
+    if type(num) is float:
+        return "0" if abs(num) < tol else f"{num:.6f}"
+    if isinstance(num, Fraction):
+        if num.denominator == 1:
+            return str(num.numerator)
+        return f"{num.numerator}/{num.denominator}"
+    if use_fractions and isinstance(num, int):
+        return str(num)
+    if abs(num) < tol:
+        return "0"
+    return f"{num:.6f}"
+
+
+# Fragmentos HTML de las tablas de pasos (clases de result.html / matrix_result.html).
+# Las celdas son números formateados (dígitos, '-', '/', '.'), no necesitan escape.
+_CELL = '<div class="matrix-cell">{}</div>'
+_CELLS_OPEN, _CELLS_SEP, _CELLS_CLOSE = _CELL.partition("{}")[0], "</div>" + _CELL.partition("{}")[0], "</div>"
+
+
+def _matrix_html(row_html, rhs, full_rhs=False):
+    """Tabla [A | b] de un paso: filas de A ya renderizadas + celdas del lado derecho."""
+    if full_rhs:
+        rhs_html = ["".join(_CELL.format(x) for x in row) for row in rhs]
+    else:
+        rhs_html = [_CELL.format(x) for x in rhs]
+    return "".join(
+        f'<div class="matrix-row">{a}<div class="matrix-separator">|</div>{b}</div>'
+        for a, b in zip(row_html, rhs_html)
+    )
+
+
+class StepLog:
+    """
+    Vista perezosa de los pasos de una eliminación para una columna del lado derecho.
+    Las matrices intermedias se reconstruyen a partir del registro de operaciones
+    de fila y se formatean SOLO cuando se itera sobre los pasos.
+    """
+    def __init__(self, solver, col=0):
+        self.solver = solver
+        self.col = col
+        self._items = None
+
+    def __iter__(self):
+        if self._items is not None:
+            return iter(self._items)
+        return self.solver.iter_steps(self.col)
+
+    def __len__(self):
+        return self.solver._step_count()
+
+    def __getitem__(self, idx):
+        if self._items is None:
+            self._items = list(self.solver.iter_steps(self.col))
+        return self._items[idx]
+
+
+def _inverse_norm_1(perm, lower, upper, max_iter=5):
+    """
+    Estimación de ‖A⁻¹‖₁ (Hager, con la mejora de Higham) a partir de P·A = L·U
+    (L triangular inferior con los pivotes en la diagonal, U triangular superior
+    unitaria, A cuadrada e invertible): unas pocas resoluciones triangulares, O(n²) cada una.
+    """
+    n = len(upper)
+
+    def solve(y):
+        # A·x = y  ⇔  L·U·x = (P·y)
+        w = [0.0] * n
+        for i in range(n):
+            w[i] = (y[perm[i]] - sum(lower[i][j] * w[j] for j in range(i))) / lower[i][i]
+        x = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            x[i] = w[i] - sum(upper[i][j] * x[j] for j in range(i + 1, n))
+        return x
+
+    def solve_transposed(y):
+        # Aᵀ·z = y  ⇔  Uᵀ·Lᵀ·(P·z) = y
+        v = [0.0] * n
+        for i in range(n):
+            v[i] = y[i] - sum(upper[j][i] * v[j] for j in range(i))
+        t = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            t[i] = (v[i] - sum(lower[j][i] * t[j] for j in range(i + 1, n))) / lower[i][i]
+        z = [0.0] * n
+        for i in range(n):
+            z[perm[i]] = t[i]
+        return z
+
+    x = [1.0 / n] * n
+    estimate = 0.0
+    for it in range(max_iter):
+        y = solve(x)
+        estimate = sum(abs(v) for v in y)
+        z = solve_transposed([1.0 if v >= 0 else -1.0 for v in y])
+        j = max(range(n), key=lambda i: abs(z[i]))
+        if it > 0 and abs(z[j]) <= sum(zi * xi for zi, xi in zip(z, x)):
+            break
+        x = [0.0] * n
+        x[j] = 1.0
+    # Vector alternativo de Higham: corrige los casos en que el método de Hager se queda corto
+    alt = solve([(-1) ** i * (1 + i / (n - 1)) if n > 1 else 1.0 for i in range(n)])
+    return max(estimate, 2 * sum(abs(v) for v in alt) / (3 * n))
+
 
 class Gauss:
-    def __init__(self, matrix, results, use_fractions=True, tol=1e-12):
+    def __init__(self, matrix, results, use_fractions=True, tol=1e-12, multi_rhs=False, engine=None, record_steps=True,
+                 deadline=None, store=None, executor=None, chunk_size=BLOCK_SIZE):
+        """
+        Si multi_rhs=True, 'results' es una matriz B (m x k) y se resuelven
+        todas sus columnas con UNA sola eliminación sobre [A | B].
+
+        engine elige el motor de eliminación:
+        - 'fraction': Gauss-Jordan con Fraction (divide cada fila por su pivote)
+        - 'bareiss': eliminación libre de fracciones sobre enteros (exacta)
+        - 'float': aritmética de punto flotante en Python puro (use_fractions=False)
+        - 'numpy': punto flotante vectorizado con NumPy (use_fractions=False)
+        - 'sparse': filas dispersas {col: valor}, solo recorre entradas no nulas
+          (exacto o flotante según use_fractions)
+        - 'hybrid': exacto a velocidad de punto flotante: elige las filas pivote en float,
+          obtiene la solución por levantamiento p-ádico + reconstrucción racional y la
+          verifica contra el sistema original; si no hay solución única verificada,
+          resuelve con 'bareiss'/'fraction'
+        - 'modular': RREF exacta por imágenes módulo varios primos, Teorema Chino del Resto
+          y reconstrucción racional, verificada contra el sistema original (rango e
+          incompatibilidad salen de las imágenes); si no se verifica, 'bareiss'/'fraction'
+        Por defecto se usa 'modular' en sistemas exactos de al menos MODULAR_MIN_SIZE
+        si NumPy está instalado ('sparse' si A es de banda estrecha, SPARSE_BAND_RATIO); si no, 'hybrid' desde HYBRID_MIN_SIZE sin registro de pasos.
+        Por debajo, 'bareiss' (escala a enteros las filas con fracciones), salvo con pasos
+        y entradas no enteras, donde 'fraction' muestra los pivotes normalizados a 1.
+        Con use_fractions=False, 'numpy' si está instalado o 'float' si no.
+
+        Con record_steps=False no se registra ningún paso (get_steps queda vacío).
+
+        deadline (models.limits.Deadline) se comprueba entre operaciones de fila:
+        si vence o se cancela, solve() se detiene con SolveTimeout.
+
+        executor (concurrent.futures, motor 'modular'): con B ancha, la reconstrucción y
+        verificación de las columnas sin pivote se reparten en él por bloques de chunk_size
+        columnas; la eliminación de A sigue siendo una sola.
+
+        En punto flotante la tolerancia es relativa: rank_tol = tol · max|A| decide los
+        pivotes candidatos (aún sin normalizar); las filas ya normalizadas (pivote 1) se
+        comparan con tol, y una fila nula es incompatible si su b supera tol · max|fila
+        original de [A | B]|. get_diagnostics estima el condicionamiento, el crecimiento
+        de los pivotes y los residuos.
+
+        store (models.cache.SolutionStore, solo modo exacto): se resuelve la forma canónica
+        del sistema (filas enteras primitivas y ordenadas) y antes de eliminar se busca en
+        el almacén; el primer paso muestra el paso a la forma canónica.
+        """
         if len(matrix) == 0:
             raise ValueError("La matriz no puede estar vacía.")
         self.m = len(matrix)
@@ -11,37 +209,258 @@ class Gauss:
         if len(results) != self.m:
             raise ValueError("El vector de resultados debe tener la misma longitud que las filas de la matriz.")
 
-        if use_fractions:
-            self.aug = [[Fraction(x).limit_denominator() for x in row] + [Fraction(b).limit_denominator()]
-                        for row, b in zip(matrix, results)]
+        if multi_rhs:
+            self.k = len(results[0])
+            if any(len(row) != self.k for row in results):
+                raise ValueError("Todas las filas de B deben tener la misma longitud.")
+            rhs_rows = results
         else:
-            self.aug = [[x for x in row] + [b] for row, b in zip(matrix, results)]
+            self.k = 1
+            rhs_rows = [[b] for b in results]
 
+        # Tiempos por fase y contadores (operaciones de fila, pasos formateados, operaciones con Fraction)
+        self.metrics = PhaseTimer()
+        with self.metrics.phase("convert"):
+            if use_fractions:
+                self.aug = [[to_fraction(x) for x in row] + [to_fraction(b) for b in rhs]
+                            for row, rhs in zip(matrix, rhs_rows)]
+            else:
+                self.aug = [[x for x in row] + [b for b in rhs] for row, rhs in zip(matrix, rhs_rows)]
+
+        # Con almacén se resuelve la forma canónica (entera): el motor por defecto se elige sobre ella
+        self._auto_engine = engine is None
+        if engine is None:
+            engine = self._default_engine(use_fractions, record_steps)
+        if engine not in ENGINES:
+            raise ValueError(f"Motor desconocido: {engine}.")
+        if engine != "sparse" and (engine in ("float", "numpy")) == use_fractions:
+            raise ValueError(f"El motor '{engine}' no es compatible con use_fractions={use_fractions}.")
+        if engine == "numpy" and _numpy() is None:
+            raise ValueError("El motor 'numpy' requiere tener NumPy instalado.")
+
+        self.engine = engine
+        self.multi_rhs = multi_rhs
         self.use_fractions = use_fractions
         self.tol = tol
+        if use_fractions:
+            self.rank_tol = tol
+        else:
+            scale_a = max((abs(x) for row in self.aug for x in row[:self.n]), default=0.0)
+            self._scale = scale_a
+            self.rank_tol = tol * scale_a if scale_a > 0 else tol
+        self.record_steps = record_steps
+        self.deadline = deadline
+        self.store = store if use_fractions else None
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self._canonical = False
+        # Registro compacto de operaciones de fila: tuplas (tipo, argumentos...)
         self.steps = []
+        self._initial = None
+        self._frames_cache = None
+        self._array = None
+        self._sparse_rows = None
+        self._source_rows = None
+        self._classifications = None
         self._solved = False
         self.status = None
         self.pivot_cols = []
         self.solution = None
+        # Resultado por columna de B (en modo simple, una sola entrada)
+        self.statuses = []
+        self.solutions = []
+        self._closing_steps = []
+
+    def __getstate__(self):
+        # El almacén (con su lock), el plazo y el pool pertenecen a la petición: no viajan al serializar
+        state = self.__dict__.copy()
+        state["store"] = None
+        state["deadline"] = None
+        state["executor"] = None
+        state["_frames_cache"] = None
+        return state
+
+    def _default_engine(self, use_fractions, record_steps):
+        if not use_fractions:
+            return "numpy" if _numpy() is not None else "float"
+        size = min(self.m, self.n)
+        if size >= MODULAR_MIN_SIZE and self._is_banded(int(size * SPARSE_BAND_RATIO)):
+            return "sparse"
+        if size >= MODULAR_MIN_SIZE and _numpy() is not None:
+            return "modular"
+        if not record_steps:
+            return "hybrid" if size >= HYBRID_MIN_SIZE else "bareiss"
+        if all(x.denominator == 1 for row in self.aug for x in row):
+            return "bareiss"
+        return "fraction"
+
+    def _is_banded(self, width):
+        """True si toda entrada no nula de A está a lo sumo a width columnas de la diagonal."""
+        n = self.n
+        for i, row in enumerate(self.aug):
+            lo, hi = max(0, i - width), min(n, i + width + 1)
+            if any(row[:lo]) or any(row[hi:n]):
+                return False
+        return True
 
     def _format_number(self, num):
-        if isinstance(num, Fraction):
-            if num.denominator == 1:
-                return str(num.numerator)
-            return f"{num.numerator}/{num.denominator}"
-        if abs(num) < self.tol:
-            return "0"
-        return f"{num:.6f}"
-
-    def _snapshot(self, description):
-        matrix = [[self._format_number(c) for c in row[:-1]] for row in self.aug]
-        results = [self._format_number(row[-1]) for row in self.aug]
-        self.steps.append({
-            "description": description,
-            "matrix": matrix,
-            "results": results
-        })
+        return format_number(num, self.use_fractions, self.tol)
+
+    def _record(self, *op):
+        """
+        Registra una operación de fila. Tipos:
+        ('mark', descripción) · ('swap', i, j) · ('scale', i, pivote)
+        ('axpy', i, factor, j) · ('bareiss', i, pivote, factor, j, previo)
+        ('mul', i, escala) · ('normalize', d)
+        """
+        kind = op[0]
+        if kind != "mark":
+            if self.deadline is not None:
+                self.deadline.check()
+            self._track_determinant(op)
+            self.metrics.count("row_ops")
+            if self.engine == "fraction":
+                width = self.n + self.k
+                self.metrics.count("fraction_ops", width if kind == "scale" else 2 * width)
+            elif kind == "normalize":
+                self.metrics.count("fraction_ops", self.m * (self.n + self.k))
+        if self.record_steps:
+            self.steps.append(op)
+
+    def _replay(self):
+        """
+        Reaplica el registro sobre una copia de la matriz inicial.
+        Produce (descripción, matriz aumentada) después de cada operación.
+        """
+        fmt = self._format_number
+        aug = [row[:] for row in self._initial]
+        for op in self.steps:
+            kind = op[0]
+            if kind == "mark":
+                description = op[1]
+            elif kind == "swap":
+                _, i, j = op
+                aug[i], aug[j] = aug[j], aug[i]
+                description = f"F{i+1} ↔ F{j+1}"
+            elif kind == "scale":
+                _, i, pivot = op
+                aug[i] = [v / pivot for v in aug[i]]
+                description = f"F{i+1} ← F{i+1} ÷ {fmt(pivot)}"
+            elif kind == "axpy":
+                _, i, factor, j = op
+                aug[i] = [a - factor * b for a, b in zip(aug[i], aug[j])]
+                description = f"F{i+1} ← F{i+1} − ({fmt(factor)})·F{j+1}"
+            elif kind == "bareiss":
+                _, i, pivot, factor, j, prev = op
+                aug[i] = [(pivot * x - factor * y) // prev for x, y in zip(aug[i], aug[j])]
+                combo = f"{pivot}·F{i+1}" if factor == 0 else f"{pivot}·F{i+1} − ({factor})·F{j+1}"
+                description = f"F{i+1} ← ({combo})" + (f" ÷ {prev}" if prev != 1 else "")
+            elif kind == "mul":
+                _, i, scale = op
+                aug[i] = [x.numerator * (scale // x.denominator) for x in aug[i]]
+                description = f"F{i+1} ← {scale}·F{i+1}"
+            elif kind == "normalize":
+                _, d = op
+                aug = [[Fraction(x, d) for x in row] for row in aug]
+                description = f"Fi ← Fi ÷ {d} (todas las filas)"
+            elif kind == "rref":
+                _, rows = op
+                aug = [row[:] for row in rows]
+                description = "Forma reducida (RREF) por reconstrucción racional, verificada con el sistema original"
+            elif kind == "canonical":
+                _, rows, order, scales = op
+                aug = [row[:] for row in rows]
+                moves = ", ".join(f"F{i+1} ← {fmt(s)}·F{j+1}" for i, (j, s) in enumerate(zip(order, scales))
+                                  if i != j or s != 1)
+                description = "Forma canónica (filas enteras primitivas, ordenadas)" + (f": {moves}" if moves else "")
+            else:
+                raise ValueError(f"Operación desconocida en el registro: {kind}.")
+            yield description, aug
+
+    def _frames(self, metrics=None):
+        """
+        Pasos ya formateados: (descripción, matriz A, valores del lado derecho por fila).
+        Con varias columnas en B se memorizan para no repetir la reconstrucción por columna,
+        salvo si se pasa metrics (una petición que formatea solo sus pasos sobre un solver
+        que puede estar en una caché compartida: no debe crecer con las instantáneas).
+        """
+        if self._frames_cache is not None:
+            return self._frames_cache
+        frames = self._format_frames(metrics)
+        if self.k > 1 and metrics is None:
+            self._frames_cache = list(frames)
+            return self._frames_cache
+        return frames
+
+    def _format_frames(self, metrics=None):
+        n, fmt = self.n, self._format_number
+        metrics = self.metrics if metrics is None else metrics
+        # Cada operación reconstruye solo las filas que cambia (las demás son el mismo objeto):
+        # el texto y el HTML de una fila se reutilizan mientras la fila no cambie
+        formatted = {}
+        for description, aug in self._replay():
+            start = perf_counter()
+            current = {}
+            for row in aug:
+                entry = formatted.get(id(row))
+                if entry is None or entry[0] is not row:
+                    cells = [fmt(c) for c in row[:n]]
+                    # Celdas de A ya en HTML, una cadena por fila: se comparten entre
+                    # todas las columnas del lado derecho
+                    entry = (row, cells, [fmt(b) for b in row[n:]],
+                             _CELLS_OPEN + _CELLS_SEP.join(cells) + _CELLS_CLOSE)
+                current[id(row)] = entry
+            formatted = current
+            entries = [current[id(row)] for row in aug]
+            matrix = [entry[1] for entry in entries]
+            results = [entry[2] for entry in entries]
+            row_html = [entry[3] for entry in entries]
+            metrics.add_time("format", perf_counter() - start)
+            metrics.count("snapshots")
+            yield description, matrix, results, row_html
+
+    def _step_count(self):
+        if not self.record_steps:
+            return 0
+        if not self._solved:
+            self.solve()
+        return len(self.steps) + (1 if self._closing_steps else 0)
+
+    def _track_determinant(self, op):
+        # det(A original) se deduce del signo de los intercambios y de los pivotes usados
+        kind = op[0]
+        if kind == "swap":
+            self._det_sign = -self._det_sign
+        elif kind == "scale":
+            self._pivot_product *= op[2]
+        elif kind == "mul":
+            self._row_scale *= op[2]
+
+    def iter_steps(self, col=0, metrics=None):
+        """
+        Genera los pasos para la columna 'col' del lado derecho en el formato
+        {'description', 'matrix', 'results'} que usan las plantillas.
+        Con col=None, 'results' trae por fila todas las columnas del lado derecho.
+        Resuelve primero si hace falta; cada paso se reconstruye y formatea
+        justo antes de entregarlo, así que nunca se guardan todas las instantáneas.
+        Con metrics (PhaseTimer) el formateo se mide ahí en lugar de en self.metrics.
+        """
+        if not self.record_steps:
+            return
+        if not self._solved:
+            self.solve()
+        last = None
+        for description, matrix, results, row_html in self._frames(metrics):
+            rhs = results if col is None else [row[col] for row in results]
+            last = {
+                "description": description,
+                "matrix": matrix,
+                "results": rhs,
+                "html": _matrix_html(row_html, rhs, col is None),
+            }
+            yield last
+        if col is not None and self._closing_steps and last is not None:
+            yield dict(last, description=self._closing_steps[col])
 
     def _ref(self):
         """
@@ -52,110 +471,618 @@ class Gauss:
         m, n = self.m, self.n
         row = 0
         pivot_pos = []
-        self._snapshot("Matriz inicial")
+        # Motor exacto: filas RationalRow (numeradores enteros + denominador común)
+        # que se actualizan en su sitio
+        rational = self.engine == "fraction"
+        # Punto flotante: factores de P·A = L·U (L[i][j] = pivote o multiplicador) para get_diagnostics
+        lower = None if self.use_fractions else [[0.0] * m for _ in range(m)]
+        perm = list(range(m))
+        self._record("mark", "Matriz inicial")
 
         for col in range(n):
             # Buscar pivote (mayor |valor| desde 'row' hacia abajo)
             pivot_row = None
             pivot_abs = 0.0
             for r in range(row, m):
-                val = abs(float(self.aug[r][col]))
+                val = self.aug[r].abs_float(col) if rational else abs(float(self.aug[r][col]))
                 if val > pivot_abs:
                     pivot_abs = val
                     pivot_row = r
-            if pivot_row is None or pivot_abs <= self.tol:
+            if lower is not None:
+                self._note_pivot(pivot_abs)
+            if pivot_row is None or pivot_abs <= self.rank_tol:
                 continue
 
             # Intercambio si hace falta
             if pivot_row != row:
                 self.aug[row], self.aug[pivot_row] = self.aug[pivot_row], self.aug[row]
-                self._snapshot(f"F{row+1} ↔ F{pivot_row+1}")
+                if lower is not None:
+                    lower[row], lower[pivot_row] = lower[pivot_row], lower[row]
+                    perm[row], perm[pivot_row] = perm[pivot_row], perm[row]
+                self._record("swap", row, pivot_row)
 
             # Normalizar pivote a 1
             pivot = self.aug[row][col]
             if pivot != 0:
-                self.aug[row] = [v / pivot for v in self.aug[row]]
-                self._snapshot(f"F{row+1} ← F{row+1} ÷ {self._format_number(pivot)}")
+                if rational:
+                    self.aug[row].divide(pivot)
+                else:
+                    self.aug[row] = [v / pivot for v in self.aug[row]]
+                if lower is not None:
+                    lower[row][row] = float(pivot)
+                self._record("scale", row, pivot)
 
             # Anular por DEBAJO del pivote
             for r in range(row + 1, m):
+                if rational:
+                    if self.aug[r].is_zero_at(col):
+                        continue
+                    factor = self.aug[r][col]
+                    self.aug[r].sub_scaled(factor, self.aug[row])
+                    self._record("axpy", r, factor, row)
+                    continue
                 factor = self.aug[r][col]
-                if (isinstance(factor, Fraction) and factor == 0) or (not isinstance(factor, Fraction) and abs(float(factor)) <= self.tol):
+                if (isinstance(factor, Fraction) and factor == 0) or (not isinstance(factor, Fraction) and abs(float(factor)) <= self.rank_tol):
                     continue
-                self.aug[r] = [self.aug[r][j] - factor * self.aug[row][j] for j in range(n + 1)]
-                self._snapshot(f"F{r+1} ← F{r+1} − ({self._format_number(factor)})·F{row+1}")
+                self.aug[r] = [self.aug[r][j] - factor * self.aug[row][j] for j in range(n + self.k)]
+                if lower is not None:
+                    lower[r][row] = float(factor)
+                self._record("axpy", r, factor, row)
 
             pivot_pos.append((row, col))
             row += 1
             if row >= m:
                 break
 
-        self._snapshot("FORMA ESCALONADA (REF)")
+        if lower is not None:
+            self._lu = (perm, lower, [[float(x) for x in r[:n]] for r in self.aug], list(pivot_pos))
+            self._row_origin = perm
+        self._record("mark", "FORMA ESCALONADA (REF)")
         return pivot_pos
 
+    def _note_pivot(self, value):
+        # Menor pivote aceptado y mayor candidato rechazado: decisiones de rango dudosas
+        if value > self.rank_tol:
+            self._pivot_extremes[0] = min(self._pivot_extremes[0], value)
+        else:
+            self._pivot_extremes[1] = max(self._pivot_extremes[1], value)
+
     def _to_rref(self, pivot_pos):
         """
         Parte desde REF y realiza la eliminación hacia ARRIBA
         para obtener RREF (forma escalonada reducida por filas).
         """
+        rational = self.engine == "fraction"
         for r, c in reversed(pivot_pos):
             for up in range(r - 1, -1, -1):
+                if rational:
+                    if self.aug[up].is_zero_at(c):
+                        continue
+                    factor = self.aug[up][c]
+                    self.aug[up].sub_scaled(factor, self.aug[r])
+                    self._record("axpy", up, factor, r)
+                    continue
                 factor = self.aug[up][c]
+                # La fila de arriba ya está normalizada (pivote 1): se compara con tol sin escalar
                 if (isinstance(factor, Fraction) and factor == 0) or (not isinstance(factor, Fraction) and abs(float(factor)) <= self.tol):
                     continue
-                self.aug[up] = [self.aug[up][j] - factor * self.aug[r][j] for j in range(self.n + 1)]
-                self._snapshot(f"F{up+1} ← F{up+1} − ({self._format_number(factor)})·F{r+1}")
+                self.aug[up] = [self.aug[up][j] - factor * self.aug[r][j] for j in range(self.n + self.k)]
+                self._record("axpy", up, factor, r)
+
+        self._record("mark", "Matriz en forma reducida (RREF)")
+
+    def _bareiss(self):
+        """
+        Gauss-Jordan LIBRE DE FRACCIONES (Bareiss) sobre enteros.
+        Cada fila distinta de la del pivote se actualiza con
+        F_i ← (p·F_i − a·F_r) ÷ p_anterior, donde la división es exacta,
+        así que no hay gcd ni crecimiento de denominadores en el camino.
+        Al final todos los pivotes valen d (el último pivote) y se hace
+        una única normalización racional F ← F ÷ d para llegar a la RREF.
+        Devuelve la lista de posiciones de pivote en orden: [(fila, col), ...]
+        """
+        m, n = self.m, self.n
+        self._record("mark", "Matriz inicial")
+
+        # Filas con entradas racionales: se multiplican por el mcm de sus denominadores
+        for r in range(m):
+            scale = lcm(*(x.denominator for x in self.aug[r]))
+            self.aug[r] = [x.numerator * (scale // x.denominator) for x in self.aug[r]]
+            if scale != 1:
+                self._record("mul", r, scale)
+
+        row = 0
+        prev = 1
+        pivot_pos = []
+        for col in range(n):
+            # Buscar pivote (mayor |valor| desde 'row' hacia abajo)
+            pivot_row = None
+            pivot_abs = 0
+            for r in range(row, m):
+                val = abs(self.aug[r][col])
+                if val > pivot_abs:
+                    pivot_abs = val
+                    pivot_row = r
+            if pivot_row is None:
+                continue
+
+            if pivot_row != row:
+                self.aug[row], self.aug[pivot_row] = self.aug[pivot_row], self.aug[row]
+                self._record("swap", row, pivot_row)
+
+            pivot = self.aug[row][col]
+            pivot_line = self.aug[row]
+            for r in range(m):
+                if r == row:
+                    continue
+                factor = self.aug[r][col]
+                if factor == 0 and pivot == prev:
+                    continue
+                self.aug[r] = [(pivot * x - factor * y) // prev for x, y in zip(self.aug[r], pivot_line)]
+                self._record("bareiss", r, pivot, factor, row, prev)
 
-        self._snapshot("Matriz en forma reducida (RREF)")
+            pivot_pos.append((row, col))
+            prev = pivot
+            self._last_pivot = pivot
+            row += 1
+            if row >= m:
+                break
 
+        self._record("mark", "Forma reducida sin fracciones (cada pivote vale " + str(prev) + ")")
+        self.aug = [[Fraction(x, prev) for x in r] for r in self.aug]
+        if prev != 1:
+            self._record("normalize", prev)
+        self._record("mark", "Matriz en forma reducida (RREF)")
+        return pivot_pos
 
-    def solve(self, do_rref=True):
-        self.steps = []
-        self._solved = False
-        self.pivot_cols = []
-        self.solution = None
-        self.status = None
 
-        pivot_pos = self._ref()
-        self._to_rref(pivot_pos)
-        
-        self.pivot_cols = [c for (_, c) in pivot_pos]
+    def _numpy_gauss_jordan(self):
+        """
+        REF + RREF en punto flotante sobre un arreglo NumPy.
+        Mismo orden de operaciones que _ref/_to_rref, pero el pivote se
+        busca con argmax y cada eliminación actualiza todas las filas
+        afectadas de una vez. Devuelve [(fila, col), ...] de los pivotes.
+        """
+        np = _numpy()
+        m, n, tol = self.m, self.n, self.rank_tol
+        a = np.array(self.aug, dtype=float)
+        # Factores de P·A = L·U para get_diagnostics (ver _ref)
+        lower = np.zeros((m, m))
+        perm = list(range(m))
+        row = 0
+        pivot_pos = []
+        self._record("mark", "Matriz inicial")
 
-        inconsistent = False
-        for r in range(self.m):
-            all_zero_coeffs = all(abs(float(self.aug[r][c])) <= self.tol for c in range(self.n))
-            rhs_nonzero = abs(float(self.aug[r][self.n])) > self.tol
-            if all_zero_coeffs and rhs_nonzero:
-                inconsistent = True
+        for col in range(n):
+            column = np.abs(a[row:, col])
+            best = int(np.argmax(column))
+            self._note_pivot(float(column[best]))
+            if column[best] <= tol:
+                continue
+            pivot_row = row + best
+
+            if pivot_row != row:
+                a[[row, pivot_row]] = a[[pivot_row, row]]
+                lower[[row, pivot_row]] = lower[[pivot_row, row]]
+                perm[row], perm[pivot_row] = perm[pivot_row], perm[row]
+                self._record("swap", row, pivot_row)
+
+            # El registro guarda float de Python: la reconstrucción de los pasos no opera con escalares NumPy
+            pivot = float(a[row, col])
+            a[row] /= pivot
+            lower[row, row] = pivot
+            self._record("scale", row, pivot)
+
+            below = row + 1 + np.flatnonzero(np.abs(a[row + 1:, col]) > tol)
+            if below.size:
+                factors = a[below, col].copy()
+                a[below] -= factors[:, None] * a[row]
+                lower[below, row] = factors
+                for r, factor in zip(below.tolist(), factors.tolist()):
+                    self._record("axpy", r, factor, row)
+
+            pivot_pos.append((row, col))
+            row += 1
+            if row >= m:
                 break
-        if inconsistent:
-            self.status = "inconsistent"
-            self._snapshot("Sistema incompatible (fila 0...0 | b distinto de 0)")
-            self._solved = True
-            return {"status": self.status}
+
+        self._lu = (perm, lower.tolist(), a[:, :n].tolist(), list(pivot_pos))
+        self._row_origin = perm
+        self._record("mark", "FORMA ESCALONADA (REF)")
+
+        # Las filas de arriba ya están normalizadas (pivote 1): tol sin escalar
+        for r, c in reversed(pivot_pos):
+            above = np.flatnonzero(np.abs(a[:r, c]) > self.tol)[::-1]
+            if above.size:
+                factors = a[above, c].copy()
+                a[above] -= factors[:, None] * a[r]
+                for up, factor in zip(above.tolist(), factors.tolist()):
+                    self._record("axpy", up, factor, r)
+
+        self._record("mark", "Matriz en forma reducida (RREF)")
+        self._array = a
+        self.aug = a.tolist()
+        return pivot_pos
+
+    def _sparse_gauss_jordan(self):
+        """
+        REF + RREF sobre filas dispersas {col: valor} (solo entradas no nulas).
+        Las columnas se recorren en su orden natural para que la RREF (y por tanto
+        la solución, los pivotes y las variables libres) sea la misma que en el
+        camino denso; para reducir el relleno se elige como pivote la fila con
+        menos entradas no nulas (criterio de Markowitz). En punto flotante solo
+        se consideran filas con |valor| >= SPARSE_PIVOT_THRESHOLD · máximo.
+        Devuelve [(fila, col), ...] de los pivotes.
+        """
+        m, n, tol = self.m, self.n, self.rank_tol
+        exact = self.use_fractions
+        zero = Fraction(0) if exact else 0.0
+        rows = [{c: v for c, v in enumerate(r) if v != 0} for r in self.aug]
+        # Filas (por identificador) con entrada no nula en cada columna
+        col_rows = [set() for _ in range(n)]
+        for i, r in enumerate(rows):
+            for c in r:
+                if c < n:
+                    col_rows[c].add(i)
+        order = list(range(m))       # posición -> identificador de fila
+        pos_of = list(range(m))      # identificador -> posición
+        placed = set()
+
+        def is_zero(v):
+            return v == 0 if exact else abs(float(v)) <= tol
+
+        def axpy(target, factor, source):
+            # F_target ← F_target − factor·F_source, solo sobre no nulos de la fuente
+            t = rows[target]
+            if exact:
+                self.metrics.count("fraction_ops", 2 * len(rows[source]))
+            for c, v in rows[source].items():
+                new = t.get(c, zero) - factor * v
+                if new == 0:
+                    if c in t:
+                        del t[c]
+                        if c < n:
+                            col_rows[c].discard(target)
+                else:
+                    if c not in t and c < n:
+                        col_rows[c].add(target)
+                    t[c] = new
+
+        row = 0
+        pivot_pos = []
+        self._record("mark", "Matriz inicial")
+
+        for col in range(n):
+            if not exact:
+                self._note_pivot(max((abs(rows[i][col]) for i in col_rows[col] - placed), default=0.0))
+            candidates = [i for i in col_rows[col] - placed if not is_zero(rows[i][col])]
+            if not candidates:
+                continue
+            if not exact:
+                best = max(abs(rows[i][col]) for i in candidates)
+                candidates = [i for i in candidates if abs(rows[i][col]) >= SPARSE_PIVOT_THRESHOLD * best]
+            pivot_id = min(candidates, key=lambda i: (len(rows[i]), pos_of[i]))
+
+            pivot_row = pos_of[pivot_id]
+            if pivot_row != row:
+                other = order[row]
+                order[row], order[pivot_row] = pivot_id, other
+                pos_of[pivot_id], pos_of[other] = row, pivot_row
+                self._record("swap", row, pivot_row)
+
+            pivot = rows[pivot_id][col]
+            rows[pivot_id] = {c: v / pivot for c, v in rows[pivot_id].items()}
+            self._record("scale", row, pivot)
+            if exact:
+                self.metrics.count("fraction_ops", len(rows[pivot_id]))
+            placed.add(pivot_id)
+
+            below = sorted(col_rows[col] - placed, key=lambda i: pos_of[i])
+            for i in below:
+                factor = rows[i][col]
+                if is_zero(factor):
+                    continue
+                axpy(i, factor, pivot_id)
+                self._record("axpy", pos_of[i], factor, row)
+
+            pivot_pos.append((row, col))
+            row += 1
+            if row >= m:
+                break
+
+        self._record("mark", "FORMA ESCALONADA (REF)")
+
+        # Las filas de arriba ya están normalizadas (pivote 1): tol sin escalar
+        tol = self.tol
+        for r, c in reversed(pivot_pos):
+            pivot_id = order[r]
+            above = sorted((i for i in col_rows[c] if pos_of[i] < r), key=lambda i: -pos_of[i])
+            for i in above:
+                factor = rows[i][c]
+                if is_zero(factor):
+                    continue
+                axpy(i, factor, pivot_id)
+                self._record("axpy", pos_of[i], factor, r)
+
+        self._record("mark", "Matriz en forma reducida (RREF)")
+        self._sparse_rows = [rows[i] for i in order]
+        self._row_origin = list(order)
+        width = n + self.k
+        self.aug = [[r.get(c, zero) for c in range(width)] for r in self._sparse_rows]
+        return pivot_pos
+
+    def _hybrid(self):
+        """
+        Motor mixto: devuelve las posiciones de pivote si obtuvo una solución única
+        EXACTA y verificada (deja self.aug en RREF), o None para resolver por la vía exacta.
+        1. Cada fila de [A | B] se escala a enteros (no cambia las soluciones).
+        2. En punto flotante se eligen n filas independientes de A (pivotes de Aᵀ).
+        3. Esas filas se resuelven módulo p con levantamiento p-ádico y reconstrucción racional.
+        4. La solución se comprueba con aritmética entera contra TODAS las filas.
+        """
+        m, n, k = self.m, self.n, self.k
+        if m < n:
+            return None
+        rows = [RationalRow.from_values(row).nums for row in self.aug]
+        A = [row[:n] for row in rows]
+
+        if m == n:
+            selected = list(range(n))
+        else:
+            # Filas independientes = columnas pivote de Aᵀ (en float, solo para elegirlas)
+            transposed = [[float(self.aug[r][c]) for r in range(m)] for c in range(n)]
+            probe = Gauss(transposed, [0.0] * n, use_fractions=False, tol=self.tol, record_steps=False)
+            probe.solve()
+            selected = sorted(probe.pivot_cols)
+            if len(selected) < n:
+                return None
+        M = [A[r] for r in selected]
+        B = [rows[r][n:] for r in selected]
+
+        columns = None
+        for p in PRIMES[:3]:
+            if self.deadline is not None:
+                self.deadline.check()
+            inverse = inverse_mod(M, p)
+            if inverse is not None:
+                columns = dixon_solve(M, B, p, inverse)
+                break
+        if columns is None:
+            return None
+        if self.deadline is not None:
+            self.deadline.check()
+
+        # Verificación exacta: A·x = b en todas las filas (x con denominador común)
+        for c, x in enumerate(columns):
+            den = 1
+            for v in x:
+                den = lcm(den, v.denominator)
+            scaled = [v.numerator * (den // v.denominator) for v in x]
+            for row in rows:
+                if sum(a * xv for a, xv in zip(row[:n], scaled)) != row[n + c] * den:
+                    return None
+
+        zero, one = Fraction(0), Fraction(1)
+        self.aug = [[one if j == i else zero for j in range(n)] + [columns[c][i] for c in range(k)]
+                    for i in range(n)]
+        self.aug += [[zero] * (n + k) for _ in range(m - n)]
+        self._record("rref", [row[:] for row in self.aug])
+        return [(i, i) for i in range(n)]
+
+    def _modular(self):
+        """
+        Motor multimodular: deja self.aug en la RREF exacta de [A | B] (reconstruida de
+        sus imágenes módulo p y verificada) y devuelve las posiciones de pivote de A,
+        o None para resolver por la vía exacta.
+        """
+        rows = [RationalRow.from_values(row).nums for row in self.aug]
+        result = multimodular_rref(rows, check=self.deadline.check if self.deadline is not None else None,
+                                   executor=self.executor, block_size=self.chunk_size)
+        if result is None:
+            return None
+        pivot_cols, self.aug = result
+        self._record("rref", [row[:] for row in self.aug])
+        return [(r, c) for r, c in enumerate(pivot_cols) if c < self.n]
+
+    def _pivot_structure(self, pivot_pos):
+        """
+        A partir de la RREF devuelve (pivotes {fila: col}, incompatibles por columna de B).
+        En punto flotante los pivotes son los que aceptó la eliminación (con rank_tol, antes
+        de normalizar): las filas nulas conservan ruido a la escala de A y no se releen. Una
+        fila nula es incompatible si su b supera tol · max|fila original de [A | B]|.
+        """
+        n = self.n
+        if not self.use_fractions:
+            pivots = {r: c for r, c in pivot_pos if c < n}
+            source, origin = self._float_source, self._row_origin
+            inconsistent = [False] * self.k
+            for r in range(self.m):
+                if r in pivots:
+                    continue
+                original = source[origin[r]] if origin is not None else source[r]
+                scale_a = max((abs(x) for x in original[:n]), default=0.0)
+                for k in range(self.k):
+                    scale = max(scale_a, abs(original[n + k]))
+                    if abs(float(self.aug[r][n + k])) > (self.tol * scale if scale > 0 else self.tol):
+                        inconsistent[k] = True
+            return pivots, inconsistent
+
+        tol = self.tol
+        if self._sparse_rows is not None:
+            pivots = {}
+            for r, row in enumerate(self._sparse_rows):
+                cols = [c for c, v in row.items() if c < n and abs(float(v)) > tol]
+                if cols:
+                    pivots[r] = min(cols)
+            zero_rows = [r for r in range(self.m) if r not in pivots]
+            inconsistent = [any(abs(float(self._sparse_rows[r].get(n + k, 0))) > tol for r in zero_rows)
+                            for k in range(self.k)]
+            return pivots, inconsistent
 
         pivots = {}
         for r in range(self.m):
             pivot_col = None
-            for c in range(self.n):
-                if abs(float(self.aug[r][c])) > self.tol:
+            for c in range(n):
+                if abs(float(self.aug[r][c])) > tol:
                     pivot_col = c
                     break
             if pivot_col is not None:
                 pivots[r] = pivot_col
-        pivot_cols = sorted(set(pivots.values()))
-        self.pivot_cols = pivot_cols
+        zero_rows = [r for r in range(self.m) if r not in pivots]
+        inconsistent = [any(abs(float(self.aug[r][n + k])) > tol for r in zero_rows) for k in range(self.k)]
+        return pivots, inconsistent
+
+    def solve(self, do_rref=True):
+        if self.store is not None:
+            return self._solve_with_store(do_rref)
+        return self._solve(do_rref)
+
+    def _solve_with_store(self, do_rref):
+        """
+        Resuelve la forma canónica del sistema, consultando antes el almacén. Los pasos son
+        la matriz inicial, el paso a la forma canónica y la eliminación del sistema canónico.
+        """
+        original = [row[:] for row in self.aug]
+        rows, order, scales = canonical_system(original)
+        self.aug = [[Fraction(x) for x in row] for row in rows]
+        if self._auto_engine:
+            self.engine = self._default_engine(True, self.record_steps)
+        key = self.store.key(rows, self.n, self.engine)
+        record = self.store.get(key, need_steps=self.record_steps)
+        if record is None:
+            self.metrics.count("store_misses")
+            result = self._solve(do_rref)
+            steps = self.steps
+            if steps and steps[0] == ("mark", "Matriz inicial"):
+                steps = steps[1:]
+            record = {
+                "aug": self.aug, "pivots": self._pivots, "pivot_cols": self.pivot_cols,
+                "statuses": self.statuses, "solutions": self.solutions, "results": result,
+                "closing_steps": self._closing_steps, "steps": steps if self.record_steps else None,
+            }
+            self.store.put(key, record)
+        else:
+            self.metrics.count("store_hits")
+            self.aug = [row[:] for row in record["aug"]]
+            self._pivots = dict(record["pivots"])
+            self.pivot_cols = list(record["pivot_cols"])
+            self.statuses = list(record["statuses"])
+            self.solutions = list(record["solutions"])
+            self._closing_steps = list(record["closing_steps"])
+            self.status = self.statuses[0] if self.statuses else None
+            self.solution = self.solutions[0] if self.solutions else None
+            self._frames_cache = None
+            self._solved = True
+            result = record["results"]
+
+        self._canonical = True
+        self._source_rows = [row[:self.n] for row in original]
+        if self.record_steps:
+            self._initial = original
+            self.steps = [("mark", "Matriz inicial"), ("canonical", rows, order, scales)] + list(record["steps"])
+        return result
+
+    def _solve(self, do_rref=True):
+        self.steps = []
+        self._frames_cache = None
+        self._array = None
+        self._sparse_rows = None
+        self._pivots = {}
+        self._det_sign = 1
+        self._pivot_product = Fraction(1) if self.use_fractions else 1.0
+        self._row_scale = 1
+        self._last_pivot = 1
+        self._initial = [row[:] for row in self.aug] if self.record_steps else None
+        # Punto flotante: copia de [A | B] (residuos) y factorización P·A = L·U de la eliminación
+        self._float_source = None if self.use_fractions else [list(row) for row in self.aug]
+        self._lu = None
+        # Fila original de cada fila final (punto flotante, para la compatibilidad por fila)
+        self._row_origin = None
+        # [menor pivote aceptado, mayor candidato rechazado] (en valor absoluto)
+        self._pivot_extremes = None if self.use_fractions else [float("inf"), 0.0]
+        self._solved = False
+        self.pivot_cols = []
+        self.solution = None
+        self.status = None
+        self.statuses = []
+        self.solutions = []
+        self._closing_steps = []
+
+        phase = self.metrics.phase
+        if self.engine == "bareiss":
+            with phase("eliminate"):
+                pivot_pos = self._bareiss()
+        elif self.engine == "numpy":
+            with phase("eliminate"):
+                pivot_pos = self._numpy_gauss_jordan()
+        elif self.engine == "sparse":
+            with phase("eliminate"):
+                pivot_pos = self._sparse_gauss_jordan()
+        elif self.engine in ("hybrid", "modular"):
+            with phase("eliminate"):
+                self._source_rows = [row[:self.n] for row in self.aug]
+                self._record("mark", "Matriz inicial")
+                pivot_pos = self._hybrid() if self.engine == "hybrid" else self._modular()
+                if pivot_pos is None:
+                    # Sin resultado verificado: vía exacta completa (clasifica rango e incompatibilidad)
+                    self.metrics.count(self.engine + "_fallback")
+                    integral = all(x.denominator == 1 for row in self.aug for x in row)
+                    self.engine = "bareiss" if integral or not self.record_steps else "fraction"
+                    return self._solve(do_rref)
+        else:
+            if self.engine == "fraction":
+                self.aug = [RationalRow.from_values(row) for row in self.aug]
+            with phase("ref"):
+                pivot_pos = self._ref()
+            with phase("rref"):
+                self._to_rref(pivot_pos)
+            if self.engine == "fraction":
+                self.aug = [row.to_fractions() for row in self.aug]
+
+        self.pivot_cols = [c for (_, c) in pivot_pos]
+
+        with phase("classify"):
+            # La estructura de pivotes solo depende de A: se calcula una vez
+            # y se comparte entre todas las columnas del lado derecho.
+            pivots, inconsistent = self._pivot_structure(pivot_pos)
+            pivot_cols = sorted(set(pivots.values()))
+            self._pivots = pivots
+
+            results = []
+            for k in range(self.k):
+                results.append(self._solve_column(k, pivots, pivot_cols, inconsistent[k]))
+            if any(status != "inconsistent" for status in self.statuses):
+                self.pivot_cols = pivot_cols
+
+        self.status = self.statuses[0] if self.statuses else None
+        self.solution = self.solutions[0] if self.solutions else None
+        self._solved = True
+        if self.multi_rhs:
+            return results
+        return results[0]
+
+    def _solve_column(self, k, pivots, pivot_cols, inconsistent):
+        """
+        Clasifica y resuelve la columna k del lado derecho a partir de la RREF ya calculada.
+        """
+        b = self.n + k
+
+        if inconsistent:
+            self.statuses.append("inconsistent")
+            self.solutions.append(None)
+            self._closing_steps.append("Sistema incompatible (fila 0...0 | b distinto de 0)")
+            return {"status": "inconsistent"}
+
         rank = len(pivot_cols)
 
         if rank == self.n:
             sol = [Fraction(0) for _ in range(self.n)]
             for r, c in pivots.items():
-                sol[c] = self.aug[r][self.n]
-            self.status = "unique"
-            self.solution = sol
-            self._snapshot("Sistema compatible determinado (solución única)")
-            self._solved = True
-            return {"status": self.status, "solution": sol}
+                sol[c] = self.aug[r][b]
+            self.statuses.append("unique")
+            self.solutions.append(sol)
+            self._closing_steps.append("Sistema compatible determinado (solución única)")
+            return {"status": "unique", "solution": sol}
 
         free_cols = [c for c in range(self.n) if c not in pivot_cols]
         param_names = {free_cols[i]: f"t{i+1}" for i in range(len(free_cols))}
@@ -166,33 +1093,185 @@ class Gauss:
                 param_solution[j] = {"const": Fraction(0), "params": {param_names[j]: Fraction(1)}}
             else:
                 r = next(r for r, pc in pivots.items() if pc == j)
-                const = self.aug[r][self.n]
+                const = self.aug[r][b]
                 coeffs = {}
                 for f in free_cols:
                     if abs(float(self.aug[r][f])) > self.tol:
                         coeffs[param_names[f]] = -self.aug[r][f]
                 param_solution[j] = {"const": const, "params": coeffs}
 
-        self.status = "infinite"
-        self.solution = {"free_cols": free_cols, "params": param_names, "expr": param_solution}
-        self._snapshot("Sistema compatible indeterminado (infinitas soluciones, forma paramétrica)")
-        self._solved = True
-        return {"status": self.status, "solution": self.solution}
+        solution = {"free_cols": free_cols, "params": param_names, "expr": param_solution}
+        self.statuses.append("infinite")
+        self.solutions.append(solution)
+        self._closing_steps.append("Sistema compatible indeterminado (infinitas soluciones, forma paramétrica)")
+        return {"status": "infinite", "solution": solution}
 
-    def get_steps(self):
-        return self.steps
+    def rank(self):
+        if not self._solved:
+            # rank(A) no necesita la RREF ni el lado derecho: sale del perfil de rango (memorizado)
+            if self._classifications is not None:
+                return self._classifications[0].rank
+            rows = [row[:self.n] for row in self.aug]
+            return RankProfile.classify_system(rows, [], self.use_fractions, self.tol)[0].rank
+        return len(set(self._pivots.values()))
+
+    def _rank_profile(self):
+        """(RankProfile de A, clasificaciones de cada columna de B), calculado una sola vez."""
+        if self._classifications is None:
+            rows = [row[:self.n] for row in self.aug]
+            columns = [[row[self.n + k] for row in self.aug] for k in range(self.k)]
+            self._classifications = RankProfile.classify_system(rows, columns, self.use_fractions, self.tol)
+        return self._classifications
+
+    def classify(self):
+        """
+        Solo rango y compatibilidad, sin RREF, sin soluciones y sin pasos: una pasada
+        hacia adelante sobre [A | B] (RankProfile) da rank(A) y rank([A | b]) de cada
+        columna. Si ya se resolvió, se usa la resolución. Devuelve una lista de dicts
+        como los de get_classification, uno por columna de B.
+        """
+        if self._solved:
+            return [self.get_classification(k) for k in range(self.k)]
+        return [dict(info) for info in self._rank_profile()[1]]
+
+    def determinant(self):
+        """
+        det(A) a partir de la misma eliminación (solo matrices cuadradas):
+        signo de los intercambios por el producto de los pivotes; en Bareiss,
+        el último pivote dividido por los factores con que se escalaron las filas.
+        """
+        if self.m != self.n:
+            raise ValueError("El determinante solo está definido para matrices cuadradas.")
+        if not self._solved:
+            self.solve()
+        zero = Fraction(0) if self.use_fractions else 0.0
+        if self.rank() < self.n:
+            return zero
+        if self.engine in ("hybrid", "modular") or self._canonical:
+            # La reconstrucción (o la forma canónica) no deja los pivotes de A: se calcula aparte con Bareiss/Fraction
+            return Gauss(self._source_rows, [0] * self.m, record_steps=False,
+                         engine="bareiss" if all(x.denominator == 1 for row in self._source_rows for x in row)
+                         else "fraction").determinant()
+        if self.engine == "bareiss":
+            return Fraction(self._det_sign * self._last_pivot, self._row_scale)
+        return self._det_sign * self._pivot_product
+
+    def nullspace(self):
+        """
+        Base del espacio nulo de A leída de la RREF: un vector por variable libre.
+        """
+        if not self._solved:
+            self.solve()
+        one, zero = (Fraction(1), Fraction(0)) if self.use_fractions else (1.0, 0.0)
+        pivot_of_col = {c: r for r, c in self._pivots.items()}
+        free_cols = [c for c in range(self.n) if c not in pivot_of_col]
+        basis = []
+        for f in free_cols:
+            vec = [zero] * self.n
+            vec[f] = one
+            for c, r in pivot_of_col.items():
+                vec[c] = -self.aug[r][f] if abs(float(self.aug[r][f])) > self.tol else zero
+            basis.append(vec)
+        return basis
+
+    def get_metrics(self):
+        """
+        Tiempos por fase (segundos) y contadores de la última resolución.
+        'format' solo incluye los pasos que ya se iteraron.
+        """
+        data = self.metrics.as_dict()
+        data["engine"] = self.engine
+        return data
 
-    def get_formatted_solution(self):
+    def get_diagnostics(self):
+        """
+        Diagnóstico numérico de la última resolución en punto flotante (None en modo exacto):
+        - condition: estimación de κ₁(A) = ‖A‖₁·‖A⁻¹‖₁ (Hager/Higham) con la factorización
+          P·A = L·U de la eliminación; inf si A es cuadrada y singular, None si A no es
+          cuadrada o el motor no deja la factorización ('sparse')
+        - growth: crecimiento de los pivotes, max|U| / max|A|
+        - residuals: por columna de B, ‖A·x − b‖∞ / (‖A‖∞·‖x‖∞ + ‖b‖∞) si la solución es única
+        - rank_tol, min_pivot (menor pivote aceptado) y max_rejected (mayor candidato descartado)
+        - suspicious / reasons: si conviene repetir la resolución en modo exacto
+        """
+        if self.use_fractions:
+            return None
         if not self._solved:
             self.solve()
+        n = self.n
+        source = self._float_source
+        rows_a = [row[:n] for row in source]
+        scale = self._scale
+        norm_inf = max((sum(abs(x) for x in row) for row in rows_a), default=0.0)
+
+        condition = None
+        growth = None
+        if self._lu is not None:
+            perm, lower, upper, pivot_pos = self._lu
+            if scale > 0:
+                growth = max((abs(lower[r][r] * x) for r, _ in pivot_pos for x in upper[r]), default=0.0) / scale
+            if self.m == n:
+                if len(pivot_pos) < n:
+                    condition = float("inf")
+                else:
+                    norm_1 = max(sum(abs(row[c]) for row in rows_a) for c in range(n))
+                    condition = norm_1 * _inverse_norm_1(perm, lower, upper)
+        elif self.m == n and self.rank() < n:
+            condition = float("inf")
 
-        if self.status == "inconsistent":
+        residuals = []
+        for k, (status, x) in enumerate(zip(self.statuses, self.solutions)):
+            if status != "unique":
+                residuals.append(None)
+                continue
+            b = [row[n + k] for row in source]
+            r = max((abs(sum(a * xi for a, xi in zip(row, x)) - bi) for row, bi in zip(rows_a, b)), default=0.0)
+            denom = norm_inf * max((abs(v) for v in x), default=0.0) + max((abs(v) for v in b), default=0.0)
+            residuals.append(r / denom if denom > 0 else r)
+
+        min_pivot, max_rejected = self._pivot_extremes
+        min_pivot = None if min_pivot == float("inf") else min_pivot
+        reasons = []
+        if condition is not None and condition != float("inf") and condition > SUSPICIOUS_CONDITION:
+            reasons.append(f"Matriz mal condicionada (κ₁ ≈ {condition:.3g}).")
+        if growth is not None and growth > SUSPICIOUS_GROWTH:
+            reasons.append(f"Crecimiento grande de los pivotes ({growth:.3g}).")
+        if any(r is not None and r > SUSPICIOUS_RESIDUAL for r in residuals):
+            reasons.append(f"Residuo relativo grande ({max(r for r in residuals if r is not None):.3g}).")
+        if (min_pivot is not None and min_pivot < self.rank_tol * BORDERLINE_PIVOT) or \
+                max_rejected > self.rank_tol / BORDERLINE_PIVOT:
+            reasons.append("Un pivote quedó cerca de la tolerancia de rango: el rango es dudoso.")
+        return {
+            "condition": condition,
+            "growth": growth,
+            "residuals": residuals,
+            "rank_tol": self.rank_tol,
+            "min_pivot": min_pivot,
+            "max_rejected": max_rejected,
+            "suspicious": bool(reasons),
+            "reasons": reasons,
+        }
+
+    def get_steps(self, col=0):
+        """
+        Pasos de la eliminación vistos desde la columna 'col' del lado derecho.
+        Se devuelve una vista perezosa: las matrices se formatean al iterarla.
+        """
+        return StepLog(self, col)
+
+    def get_formatted_solution(self, col=0):
+        if not self._solved:
+            self.solve()
+
+        status = self.statuses[col]
+        solution = self.solutions[col]
+        if status == "inconsistent":
             return ["Sistema incompatible: no tiene soluciones."]
-        if self.status == "unique":
-            return [f"x{idx+1} = {self._format_number(val)}" for idx, val in enumerate(self.solution)]
+        if status == "unique":
+            return [f"x{idx+1} = {self._format_number(val)}" for idx, val in enumerate(solution)]
         out = []
-        expr = self.solution["expr"]
-        params = self.solution["params"]
+        expr = solution["expr"]
+        params = solution["params"]
         for col, tname in params.items():
             out.append(f"{tname} = parámetro libre (corresponde a x{col+1})")
         for j in range(self.n):
@@ -217,7 +1296,7 @@ class Gauss:
             out.append(f"x{j+1} = {expr_str}")
         return out
 
-    def get_classification(self):
+    def get_classification(self, col=0):
             """
             Devuelve un dict con:
             - consistent: bool
@@ -226,10 +1305,11 @@ class Gauss:
             - m, n
             """
             if not self._solved:
-                self.solve()
+                return self.classify()[col]
+            status = self.statuses[col]
             return {
-                "consistent": self.status != "inconsistent",
-                "status": self.status,
+                "consistent": status != "inconsistent",
+                "status": status,
                 "rank": len(self.pivot_cols),
                 "m": self.m,
                 "n": self.n,
@@ -259,4 +1339,196 @@ class Gauss:
                 report.append(f"Columna {j+1}: pivote en fila {col2row[j]+1} (valor 1)")
             else:
                 report.append(f"Columna {j+1}: sin pivote (variable libre)")
-        return report
\ No newline at end of file
+        return report
+
+
+class RankProfile:
+    """
+    Perfil de rango de A: una eliminación HACIA ADELANTE (hasta la REF, sin la RREF)
+    que guarda rank(A), las columnas pivote y las operaciones de fila aplicadas.
+    rank([A | b]) sale de las filas nulas de A: b es compatible si, tras repetir esas
+    operaciones sobre b (O(m·r)), sus entradas en esas filas son cero; si rank(A) = m,
+    todo b es compatible y no hace falta ni eso.
+    - exacto: Bareiss libre de fracciones sobre filas enteras (división exacta)
+    - flotante: pivoteo parcial con la misma tolerancia relativa que Gauss
+    """
+    def __init__(self, rows, use_fractions=True, tol=1e-12):
+        self.m = len(rows)
+        self.n = len(rows[0]) if rows else 0
+        self.use_fractions = use_fractions
+        self.tol = tol
+        self.ops = []
+        self.row_scales = [1] * self.m
+        if use_fractions:
+            self.scale = None
+            self.rank_tol = tol
+        else:
+            self.scale = max((abs(x) for row in rows for x in row), default=0.0)
+            self.rank_tol = tol * self.scale if self.scale > 0 else tol
+        self.pivot_cols = []
+
+    @property
+    def rank(self):
+        return len(self.pivot_cols)
+
+    @classmethod
+    def classify_system(cls, rows, columns, use_fractions=True, tol=1e-12):
+        """
+        (perfil, clasificaciones de cada columna): con A ya memorizada solo se repiten las
+        operaciones sobre las columnas; si no, una sola pasada sobre [A | B] da el perfil
+        y rank([A | b]) a la vez.
+        """
+        key = canonical_key("rank_profile", rows, [], use_fractions, tol)
+        profile = _rank_profiles.get(key)
+        if profile is not None:
+            return profile, [profile.classify(b) for b in columns]
+        profile = cls(rows, use_fractions, tol)
+        transformed = profile._eliminate(rows, columns)
+        _rank_profiles.set(key, profile)
+        return profile, [profile._classification(b, t) for b, t in zip(columns, transformed)]
+
+    def _eliminate(self, rows, columns):
+        # Eliminación hacia adelante de [A | B]; registra en self.ops lo necesario para repetirla sobre otro b
+        m, n, k = self.m, self.n, len(columns)
+        if self.use_fractions:
+            aug = []
+            for r, row in enumerate(rows):
+                values = [to_fraction(x) for x in row]
+                scale = lcm(*(x.denominator for x in values))
+                self.row_scales[r] = scale
+                aug.append([x.numerator * (scale // x.denominator) for x in values])
+            for col in columns:
+                for line, x in zip(aug, self._integral(col)):
+                    line.append(x)
+        else:
+            aug = [[float(x) for x in row] + [float(col[r]) for col in columns] for r, row in enumerate(rows)]
+
+        row = 0
+        prev = 1
+        for col in range(n):
+            if row >= m:
+                break
+            best = max(range(row, m), key=lambda r: abs(aug[r][col]))
+            pivot_abs = abs(aug[best][col])
+            if pivot_abs == 0 or (not self.use_fractions and pivot_abs <= self.rank_tol):
+                continue
+            if best != row:
+                aug[row], aug[best] = aug[best], aug[row]
+                self.ops.append(("swap", row, best))
+            pivot_line = aug[row]
+            pivot = pivot_line[col]
+            if self.use_fractions:
+                for r in range(row + 1, m):
+                    factor = aug[r][col]
+                    if factor == 0 and pivot == prev:
+                        continue
+                    aug[r] = [(pivot * x - factor * y) // prev for x, y in zip(aug[r], pivot_line)]
+                    self.ops.append(("bareiss", r, pivot, factor, row, prev))
+                prev = pivot
+            else:
+                aug[row] = pivot_line = [v / pivot for v in pivot_line]
+                self.ops.append(("scale", row, pivot))
+                for r in range(row + 1, m):
+                    factor = aug[r][col]
+                    if abs(factor) <= self.rank_tol:
+                        continue
+                    aug[r] = [x - factor * y for x, y in zip(aug[r], pivot_line)]
+                    self.ops.append(("axpy", r, factor, row))
+            self.pivot_cols.append(col)
+            row += 1
+        return [[line[n + j] for line in aug] for j in range(k)]
+
+    def _integral(self, b):
+        # b con las escalas de fila de A y multiplicado por el mcm de sus denominadores: enteros.
+        # Escalar b no cambia qué entradas son cero, y con enteros la división de Bareiss es exacta
+        values = [to_fraction(x) * s for x, s in zip(b, self.row_scales)]
+        den = lcm(*(x.denominator for x in values))
+        return [x.numerator * (den // x.denominator) for x in values]
+
+    def _apply(self, b):
+        # Repite las operaciones de fila registradas sobre el vector b
+        if self.use_fractions:
+            b = self._integral(b)
+        else:
+            b = [float(x) for x in b]
+        for op in self.ops:
+            kind = op[0]
+            if kind == "swap":
+                _, i, j = op
+                b[i], b[j] = b[j], b[i]
+            elif kind == "bareiss":
+                _, r, pivot, factor, row, prev = op
+                b[r] = (pivot * b[r] - factor * b[row]) // prev
+            elif kind == "scale":
+                b[op[1]] = b[op[1]] / op[2]
+            else:
+                _, r, factor, row = op
+                b[r] = b[r] - factor * b[row]
+        return b
+
+    def _classification(self, b, transformed=None):
+        rank = self.rank
+        if rank == self.m:
+            consistent = True
+        else:
+            if transformed is None:
+                transformed = self._apply(b)
+            rest = transformed[rank:]
+            if self.use_fractions:
+                consistent = all(x == 0 for x in rest)
+            else:
+                scale = max(self.scale, max((abs(float(x)) for x in b), default=0.0))
+                tol = self.tol * scale if scale > 0 else self.tol
+                consistent = all(abs(x) <= tol for x in rest)
+        status = "inconsistent" if not consistent else ("unique" if rank == self.n else "infinite")
+        return {"consistent": consistent, "status": status, "rank": rank, "m": self.m, "n": self.n}
+
+    def classify(self, b):
+        """Clasificación de A x = b (mismo dict que Gauss.get_classification)."""
+        if len(b) != self.m:
+            raise ValueError("El vector de resultados debe tener la misma longitud que las filas de la matriz.")
+        return self._classification(b)
+
+
+class MatrixOperations:
+    """
+    Determinante, inversa, rango y espacio nulo de A con UNA sola
+    eliminación de Gauss-Jordan sobre [A | I] (exacta o en punto flotante).
+    """
+    def __init__(self, A, use_fractions=True, tol=1e-12, engine=None, record_steps=True, deadline=None):
+        if len(A) == 0:
+            raise ValueError("La matriz no puede estar vacía.")
+        m = len(A)
+        identity = [[1 if i == j else 0 for j in range(m)] for i in range(m)]
+        self.gauss = Gauss(A, identity, use_fractions=use_fractions, tol=tol, multi_rhs=True,
+                           engine=engine, record_steps=record_steps, deadline=deadline)
+        self.gauss.solve()
+        self.m = self.gauss.m
+        self.n = self.gauss.n
+        self.is_square = self.m == self.n
+
+    def rank(self):
+        return self.gauss.rank()
+
+    def determinant(self):
+        return self.gauss.determinant()
+
+    def is_invertible(self):
+        return self.is_square and self.rank() == self.n
+
+    def inverse(self):
+        """A⁻¹ como lista de filas, o None si A no es cuadrada o es singular."""
+        if not self.is_invertible():
+            return None
+        n = self.n
+        return [row[n:] for row in self.gauss.aug]
+
+    def nullspace(self):
+        return self.gauss.nullspace()
+
+    def get_steps(self):
+        # Pasos con el bloque derecho completo [A | I]
+        return StepLog(self.gauss, col=None)
+
+    def get_pivot_report(self):
+        return self.gauss.get_pivot_report()
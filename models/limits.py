@@ -0,0 +1,145 @@
+# models/limits.py
+# Presupuestos por petición: estimación de coste (admisión), plazos cooperativos
+# y un pool acotado de hilos para las resoluciones
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from time import perf_counter
+
+from models.parsing import to_fraction
+
+
+class BudgetExceeded(RuntimeError):
+    """Error base: la petición no cabe en el presupuesto. 'status' es el código HTTP sugerido."""
+    status = 503
+
+
+class SolveRejected(BudgetExceeded):
+    """El sistema es demasiado grande o costoso; se rechaza antes de empezar."""
+    status = 413
+
+
+class SolveTimeout(BudgetExceeded):
+    """Se agotó el plazo de la petición durante la eliminación."""
+    status = 503
+
+
+class SolverBusy(BudgetExceeded):
+    """Todos los hilos del pool están ocupados y la cola está llena."""
+    status = 503
+
+
+class Deadline:
+    """
+    Plazo cooperativo: Gauss llama a check() entre operaciones de fila y se
+    detiene con SolveTimeout si el plazo venció o si alguien llamó a cancel().
+    seconds=None significa sin límite de tiempo (solo cancelación).
+    """
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.expires = perf_counter() + seconds if seconds else None
+        self.cancelled = False
+
+    def remaining(self):
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - perf_counter())
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        if self.cancelled or (self.expires is not None and perf_counter() > self.expires):
+            raise SolveTimeout(
+                f"Se superó el tiempo máximo de resolución ({self.seconds:g} s)." if self.seconds
+                else "La resolución fue cancelada."
+            )
+
+
+def _bit_length(x, exact):
+    if not exact:
+        return 0
+    try:
+        f = to_fraction(x)
+    except (OverflowError, ValueError):
+        raise ValueError(f"Valor no finito: {x!r}.")
+    return max(f.numerator.bit_length(), f.denominator.bit_length())
+
+
+def estimate_cost(matrix, rhs_cols=1, exact=True, rhs=None):
+    """
+    Estimación del trabajo de Gauss-Jordan sobre [A | B] (m x n, con rhs_cols columnas a la derecha):
+    operaciones de fila m·r (r = min(m, n)) de ancho n + rhs_cols. En modo exacto cada
+    operación cuesta más a medida que crecen los coeficientes: hasta ~r·bits bits por entrada
+    (cota de Hadamard), así que se pondera por 1 + r·bits/64 (palabras de máquina).
+    Devuelve un dict con m, n, rhs_cols, bits, row_ops y cost.
+    """
+    m = len(matrix)
+    n = len(matrix[0]) if m else 0
+    r = min(m, n)
+    bits = 0
+    if exact:
+        values = [x for row in matrix for x in row]
+        # rhs puede ser un vector b o una matriz B
+        for item in rhs or ():
+            if isinstance(item, (list, tuple)):
+                values.extend(item)
+            else:
+                values.append(item)
+        bits = max((_bit_length(x, exact) for x in values), default=0)
+    row_ops = m * r
+    cost = row_ops * (n + rhs_cols)
+    if exact:
+        cost *= 1 + r * bits / 64
+    return {"m": m, "n": n, "rhs_cols": rhs_cols, "bits": bits, "row_ops": row_ops, "cost": cost}
+
+
+def check_admission(estimate, max_dimension=None, max_cost=None):
+    """Lanza SolveRejected si el sistema supera la dimensión o el coste máximos."""
+    if max_dimension is not None:
+        dims = (estimate["m"], estimate["n"], estimate["rhs_cols"])
+        if any(d > max_dimension for d in dims):
+            raise SolveRejected(f"Las dimensiones deben ser entre 1 y {max_dimension}.")
+    if max_cost is not None and estimate["cost"] > max_cost:
+        raise SolveRejected(
+            f"El sistema es demasiado costoso de resolver "
+            f"(coste estimado {estimate['cost']:.3g}, máximo {max_cost:.3g})."
+        )
+
+
+class SolverPool:
+    """
+    Pool acotado de hilos para las resoluciones: como mucho max_workers a la vez
+    y max_pending esperando. Si está lleno se falla enseguida con SolverBusy
+    en lugar de acumular peticiones.
+    """
+    def __init__(self, max_workers=4, max_pending=16):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solver")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def run(self, fn, deadline=None):
+        """
+        Ejecuta fn() en el pool (con una copia del contexto actual, así sigue viendo
+        el contexto de Flask) y espera su resultado hasta el plazo. Al vencer el plazo
+        se cancela el Deadline: la eliminación se detiene en la siguiente operación de fila.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise SolverBusy("El servidor está ocupado; intente de nuevo en unos segundos.")
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, fn)
+        except BaseException:
+            self._slots.release()
+            raise
+        # El hueco se libera cuando el hilo termina de verdad, no cuando se deja de esperar
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=deadline.remaining() if deadline is not None else None)
+        except FutureTimeout:
+            deadline.cancel()
+            raise SolveTimeout(f"Se superó el tiempo máximo de resolución ({deadline.seconds:g} s).")
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
@@ -1,26 +1,82 @@
 # models/matrix_equation.py
 # Nuevo archivo para resolver A X = B con B posiblemente matriz
 
+import os
+import threading
+
 from models.equations_solver import Gauss  # Asumiendo que existe este import
 
+# Columnas de B por bloque en la reconstrucción en paralelo
+CHUNK_SIZE = 16
+# Por debajo de este trabajo (filas · columnas de A · columnas de B) no compensa
+# repartir entre procesos: se reconstruye todo en este proceso
+PARALLEL_MIN_WORK = 40000
+
+# Pools propios de A X = B (uno por número de procesos): no se comparten con models.batch
+# ni se cierran, así que un cambio de max_workers no corta bloques en curso
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(max_workers=None):
+    workers = max_workers or os.cpu_count() or 1
+    with _pools_lock:
+        if workers not in _pools:
+            # Importado aquí: arrancar la aplicación no carga multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _pools[workers]
+
+
 class MatrixEquation:
-    def __init__(self, A, B, use_fractions=True):
+    """
+    A X = B con una sola eliminación sobre [A | B]: cada columna de X se lee de la RREF
+    compartida (con los pasos de cada columna).
+    Por defecto todo se hace en este proceso: en los benchmarks (matrix_equation/.../inverse)
+    repartir no ha medido una ganancia. Con max_workers > 1 (None: uno por núcleo), B ancha,
+    un sistema grande y el motor multimodular, la reconstrucción racional y la verificación
+    de las columnas de B se reparten en bloques de chunk_size columnas entre los procesos
+    de un pool propio.
+    """
+    def __init__(self, A, B, use_fractions=True, deadline=None, store=None, record_steps=True,
+                 chunk_size=None, max_workers=1):
         self.A = A
         self.B = B
         self.cols_b = len(B[0]) if B else 0
         self.use_fractions = use_fractions
+        self.chunk_size = CHUNK_SIZE if chunk_size is None else chunk_size
         self.solutions = []
         self.steps = []
         self.infos = []
         self.pivot_reports = []
+        self.metrics = None
 
+        if self.cols_b == 0:
+            return
+
+        gauss_solver = Gauss(self.A, self.B, use_fractions=self.use_fractions, multi_rhs=True,
+                             deadline=deadline, store=store, record_steps=record_steps,
+                             chunk_size=self.chunk_size)
+        # Solo el motor multimodular reparte bloques: con cualquier otro no se crea el pool
+        if gauss_solver.engine == "modular" and self._use_parallel(max_workers):
+            gauss_solver.executor = _get_pool(max_workers)
+        gauss_solver.solve()
+        self.metrics = gauss_solver.metrics
+        pivot_report = gauss_solver.get_pivot_report()
         for col in range(self.cols_b):
-            b_col = [row[col] for row in B]
-            gauss_solver = Gauss(self.A, b_col, use_fractions=self.use_fractions)
-            self.solutions.append(gauss_solver.get_formatted_solution())
-            self.steps.append(gauss_solver.get_steps())
-            self.infos.append(gauss_solver.get_classification())
-            self.pivot_reports.append(gauss_solver.get_pivot_report())
+            self.solutions.append(gauss_solver.get_formatted_solution(col))
+            self.steps.append(gauss_solver.get_steps(col))
+            self.infos.append(gauss_solver.get_classification(col))
+            self.pivot_reports.append(pivot_report)
+
+    def _use_parallel(self, max_workers):
+        if not self.use_fractions or self.chunk_size <= 0:
+            return False
+        if (max_workers or os.cpu_count() or 1) <= 1:
+            return False
+        if self.cols_b < 2 * self.chunk_size:
+            return False
+        return len(self.A) * len(self.A[0]) * self.cols_b >= PARALLEL_MIN_WORK
 
     def get_formatted_solutions(self):
         # Devuelve las soluciones como lista de columnas de X
@@ -44,4 +100,4 @@ class MatrixEquation:
         return self.steps
 
     def get_all_pivot_reports(self):
-        return self.pivot_reports
\ No newline at end of file
+        return self.pivot_reports
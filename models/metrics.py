@@ -0,0 +1,93 @@
+# models/metrics.py
+# Instrumentación: tiempos por fase y contadores para los solvers y las peticiones
+
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class PhaseTimer:
+    """
+    Acumula la duración (segundos) de cada fase y contadores arbitrarios.
+    Uso:
+        with timer.phase("ref"):
+            ...
+        timer.count("row_ops")
+    """
+    def __init__(self):
+        self.phases = {}
+        self.counts = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def merge(self, other, prefix=""):
+        for name, seconds in other.phases.items():
+            self.add_time(prefix + name, seconds)
+        for name, amount in other.counts.items():
+            self.count(prefix + name, amount)
+
+    def as_dict(self):
+        return {"phases": dict(self.phases), "counts": dict(self.counts)}
+
+
+class MetricsRegistry:
+    """
+    Agregado por endpoint (dentro del proceso) de tiempos y contadores de las peticiones.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def observe(self, endpoint, total, timer):
+        with self._lock:
+            data = self._endpoints.setdefault(endpoint, {
+                "requests": 0, "total": 0.0, "max": 0.0, "phases": {}, "counts": {}
+            })
+            data["requests"] += 1
+            data["total"] += total
+            data["max"] = max(data["max"], total)
+            for name, seconds in timer.phases.items():
+                data["phases"][name] = data["phases"].get(name, 0.0) + seconds
+            for name, amount in timer.counts.items():
+                data["counts"][name] = data["counts"].get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            out = {}
+            for endpoint, data in self._endpoints.items():
+                out[endpoint] = {
+                    "requests": data["requests"],
+                    "total": data["total"],
+                    "mean": data["total"] / data["requests"],
+                    "max": data["max"],
+                    "phases": dict(data["phases"]),
+                    "counts": dict(data["counts"]),
+                }
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def server_timing_header(total, timer, total_name="total"):
+    """
+    Valor de la cabecera Server-Timing (duraciones en milisegundos). total_name='headers'
+    marca una respuesta por partes, medida solo hasta el envío de las cabeceras.
+    """
+    parts = [f"{total_name};dur={total * 1000:.3f}"]
+    for name, seconds in timer.phases.items():
+        parts.append(f"{name.replace('.', '-')};dur={seconds * 1000:.3f}")
+    return ", ".join(parts)
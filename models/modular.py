@@ -0,0 +1,399 @@
+# models/modular.py
+# Aritmética modular para los solvers exactos: inversa módulo p, cotas de Hadamard,
+# levantamiento p-ádico (Dixon), reconstrucción racional y RREF multimodular (CRT)
+
+from fractions import Fraction
+from math import lcm, prod
+
+# Primos de 31 bits: los productos de dos residuos caben en 62 bits
+PRIMES = (2147483647, 2147483629, 2147483587, 2147483579, 2147483563, 2147483549,
+          2147483543, 2147483497, 2147483489, 2147483477, 2147483423, 2147483399)
+# Columnas sin pivote por bloque cuando la reconstrucción se reparte entre procesos
+BLOCK_SIZE = 16
+
+
+def hadamard_bits(rows):
+    """
+    log2 (redondeado hacia arriba) de la cota de Hadamard ∏ ‖fila‖₂ de una matriz entera:
+    acota |det| de cualquier submatriz cuadrada formada con esas filas.
+    """
+    bits = 0
+    for row in rows:
+        sq = sum(x * x for x in row)
+        if sq:
+            bits += (sq.bit_length() + 1) // 2
+    return bits + 1
+
+
+def inverse_mod(M, p):
+    """Inversa de la matriz cuadrada entera M módulo p (Gauss-Jordan), o None si es singular mod p."""
+    n = len(M)
+    a = [[x % p for x in row] + [1 if i == j else 0 for j in range(n)] for i, row in enumerate(M)]
+    for col in range(n):
+        pivot_row = next((r for r in range(col, n) if a[r][col]), None)
+        if pivot_row is None:
+            return None
+        a[col], a[pivot_row] = a[pivot_row], a[col]
+        inv = pow(a[col][col], -1, p)
+        prow = a[col] = [x * inv % p for x in a[col]]
+        for r in range(n):
+            factor = a[r][col]
+            if r != col and factor:
+                a[r] = [(x - factor * y) % p for x, y in zip(a[r], prow)]
+    return [row[n:] for row in a]
+
+
+def rational_reconstruction(a, modulus, bound_n, bound_d):
+    """
+    Fracción r/t con |r| <= bound_n y 0 < t <= bound_d tal que r ≡ a·t (mod modulus),
+    por el algoritmo de Euclides extendido. Es única si 2·bound_n·bound_d < modulus.
+    Devuelve None si no existe.
+    """
+    r0, r1 = modulus, a % modulus
+    t0, t1 = 0, 1
+    while r1 > bound_n:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+    if t1 == 0 or abs(t1) > bound_d:
+        return None
+    if t1 < 0:
+        r1, t1 = -r1, -t1
+    value = Fraction(r1, t1)
+    # Si r y t no eran coprimos la fracción reducida no es la buscada
+    return value if value.denominator == t1 else None
+
+
+def dixon_solve(M, B, p, inverse=None):
+    """
+    Resuelve M X = B (M n x n entera e invertible, B n x k entera) de forma exacta
+    por levantamiento p-ádico: con C = M⁻¹ mod p, cada paso calcula
+        Xᵢ = C·R mod p,   R ← (R − M·Xᵢ) / p      (división exacta)
+    y X ≡ Σ Xᵢ pⁱ (mod pˢ). Todas las columnas de B se levantan juntas. Cada componente
+    se recupera por reconstrucción racional con las cotas de Hadamard (regla de Cramer).
+    Devuelve las columnas de X como listas de Fraction, o None si M es singular
+    módulo p o la reconstrucción falla.
+    """
+    n = len(M)
+    k = len(B[0]) if B else 0
+    C = inverse if inverse is not None else inverse_mod(M, p)
+    if C is None:
+        return None
+    den_bits = hadamard_bits(M)
+    # Numeradores de Cramer: det de M con una columna sustituida por b (peor columna)
+    num_bits = max([den_bits] + [hadamard_bits([row + [b[c]] for row, b in zip(M, B)]) for c in range(k)])
+    bound_n, bound_d = 1 << num_bits, 1 << den_bits
+    needed = num_bits + den_bits + 2
+
+    R = [row[:] for row in B]
+    acc = [[0] * k for _ in range(n)]
+    power = 1
+    while power.bit_length() - 1 < needed:
+        X = [[sum(cj * R[j][c] for j, cj in enumerate(row)) % p for c in range(k)] for row in C]
+        R = [[(R[i][c] - sum(mij * X[j][c] for j, mij in enumerate(row))) // p for c in range(k)]
+             for i, row in enumerate(M)]
+        acc = [[a + x * power for a, x in zip(arow, xrow)] for arow, xrow in zip(acc, X)]
+        power *= p
+
+    columns = []
+    for c in range(k):
+        column = []
+        for i in range(n):
+            value = rational_reconstruction(acc[i][c], power, bound_n, bound_d)
+            if value is None:
+                return None
+            column.append(value)
+        columns.append(column)
+    return columns
+
+
+def _is_prime(n):
+    # Miller-Rabin determinista para n < 3 474 749 660 383 (bases 2, 3, 5, 7, 11, 13)
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7, 11, 13):
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7, 11, 13):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+_prime_list = list(PRIMES)
+
+
+def iter_primes():
+    """Primos de 31 bits en orden decreciente (PRIMES primero); la lista se amplía bajo demanda."""
+    i = 0
+    while True:
+        if i == len(_prime_list):
+            candidate = _prime_list[-1] - 2
+            while not _is_prime(candidate):
+                candidate -= 2
+            _prime_list.append(candidate)
+        yield _prime_list[i]
+        i += 1
+
+
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        _np = numpy
+    return _np
+
+
+def rref_mod(rows, p):
+    """
+    Forma reducida (RREF) de una matriz entera módulo p, pivotando en todas las columnas
+    (Gauss-Jordan en Python puro). Devuelve (columnas pivote, filas de la RREF con
+    residuos en [0, p)).
+    """
+    m = len(rows)
+    width = len(rows[0]) if m else 0
+    a = [[x % p for x in row] for row in rows]
+    pivot_cols = []
+    row = 0
+    for col in range(width):
+        if row >= m:
+            break
+        r = next((i for i in range(row, m) if a[i][col]), None)
+        if r is None:
+            continue
+        a[row], a[r] = a[r], a[row]
+        inv = pow(a[row][col], -1, p)
+        prow = a[row] = [x * inv % p for x in a[row]]
+        for i in range(m):
+            factor = a[i][col]
+            if i != row and factor:
+                a[i] = [(x - factor * y) % p for x, y in zip(a[i], prow)]
+        pivot_cols.append(col)
+        row += 1
+    return pivot_cols, a
+
+
+def rref_mod_many(rows, primes):
+    """
+    rref_mod para varios primos a la vez. Con NumPy las imágenes se eliminan juntas
+    sobre un arreglo int64 (primos x filas x columnas; los productos de dos residuos
+    de 31 bits caben en 62 bits):
+    1. Eliminación hacia abajo, solo sobre la submatriz activa, con pivotes unitarios.
+    2. Sustitución hacia atrás restringida a las columnas sin pivote (en las columnas
+       pivote la RREF es la identidad).
+    Si en una columna unos primos tienen pivote y otros no, estos últimos se separan
+    y se resuelven aparte (su estructura de pivotes difiere). Devuelve un resultado
+    (columnas pivote, filas de la RREF) por primo, en orden.
+    """
+    np = _numpy()
+    m = len(rows)
+    width = len(rows[0]) if m else 0
+    if np is None or m == 0 or width == 0:
+        return [rref_mod(rows, p) for p in primes]
+
+    moduli = np.array(primes, dtype=np.int64)
+    if all(abs(x) < 1 << 62 for row in rows for x in row):
+        a = np.array(rows, dtype=np.int64)[None, :, :] % moduli[:, None, None]
+    else:
+        a = np.array([[[x % p for x in row] for row in rows] for p in primes], dtype=np.int64)
+
+    active = np.arange(len(primes))
+    diverged = []
+    pivot_cols = []
+    row = 0
+    for col in range(width):
+        if row >= m:
+            break
+        nonzero = a[:, row:, col] != 0
+        has_pivot = nonzero.any(axis=1)
+        if not has_pivot.any():
+            continue
+        if not has_pivot.all():
+            diverged.extend(active[~has_pivot].tolist())
+            a, active, moduli, nonzero = a[has_pivot], active[has_pivot], moduli[has_pivot], nonzero[has_pivot]
+        layers = np.arange(len(active))
+        source = row + nonzero.argmax(axis=1)
+        top = a[layers, row].copy()
+        a[layers, row] = a[layers, source]
+        a[layers, source] = top
+        inverses = np.array([pow(int(v), -1, int(p)) for v, p in zip(a[:, row, col], moduli)], dtype=np.int64)
+        a[:, row, col:] = a[:, row, col:] * inverses[:, None] % moduli[:, None]
+        if row + 1 < m:
+            factors = a[:, row + 1:, col, None]
+            a[:, row + 1:, col:] = (a[:, row + 1:, col:] - factors * a[:, row, None, col:]) % moduli[:, None, None]
+        pivot_cols.append(col)
+        row += 1
+
+    rank = len(pivot_cols)
+    pivot_set = set(pivot_cols)
+    free_cols = [c for c in range(width) if c not in pivot_set]
+    # Al eliminar el pivote i de las filas de arriba solo cambian sus columnas sin pivote
+    upper = a[:, :rank][:, :, pivot_cols]
+    free = a[:, :rank][:, :, free_cols]
+    for i in range(rank - 1, 0, -1):
+        free[:, :i] = (free[:, :i] - upper[:, :i, i, None] * free[:, i, None, :]) % moduli[:, None, None]
+
+    out = np.zeros_like(a)
+    out[:, np.arange(rank), pivot_cols] = 1
+    out[:, :rank][:, :, free_cols] = free
+    results = [None] * len(primes)
+    for layer, i in enumerate(active.tolist()):
+        results[i] = (pivot_cols, out[layer].tolist())
+    for i in diverged:
+        results[i] = rref_mod_many(rows, [primes[i]])[0]
+    return results
+
+
+def reconstruct_block(coeffs, targets, residues, moduli):
+    """
+    Recupera y verifica un bloque de columnas sin pivote de la RREF multimodular.
+    residues[i][r][j] es la imagen módulo moduli[i] de la entrada (fila r, columna j del
+    bloque); coeffs[i] y targets[i] son las entradas de la fila original i en las columnas
+    pivote y en las del bloque. Cada entrada se combina por el Teorema Chino del Resto y se
+    recupera por reconstrucción racional; después se comprueba con enteros que cada fila
+    original es combinación de las filas reconstruidas: fila_i[c] = Σ_r fila_i[pivote_r] · R_r[c].
+    Como R tiene a lo sumo rango(original) filas independientes, ambas generan el mismo
+    espacio y R es la RREF. Devuelve las filas del bloque como pares (numerador, denominador)
+    o None. Solo recibe y devuelve enteros: los bloques pueden resolverse en otros procesos.
+    """
+    modulus = prod(moduli)
+    # Teorema Chino del Resto: x = Σ rᵢ·cᵢ mod M con cᵢ = (M/pᵢ)·((M/pᵢ)⁻¹ mod pᵢ)
+    basis = [(modulus // q) * pow(modulus // q, -1, q) for q in moduli]
+    limit = 1 << max(1, (modulus.bit_length() - 2) // 2)
+    width = len(targets[0]) if targets else 0
+    entries = []
+    for r in range(len(residues[0]) if residues else 0):
+        row = []
+        for j in range(width):
+            value = rational_reconstruction(sum(img[r][j] * c for img, c in zip(residues, basis)) % modulus,
+                                            modulus, limit, limit)
+            if value is None:
+                return None
+            row.append(value)
+        entries.append(row)
+
+    den = 1
+    for row in entries:
+        for v in row:
+            den = lcm(den, v.denominator)
+    scaled = [[v.numerator * (den // v.denominator) for v in row] for row in entries]
+    for coeff_row, target in zip(coeffs, targets):
+        for j in range(width):
+            if sum(a * g[j] for a, g in zip(coeff_row, scaled)) != target[j] * den:
+                return None
+    return [[(v.numerator, v.denominator) for v in row] for row in entries]
+
+
+def _reconstruct(rows, pivot_cols, free_cols, residues, moduli, check, executor, block_size):
+    """
+    Entradas (Fraction) de las columnas sin pivote, o None si falta algún primo o no se
+    verifican. Con executor y al menos dos bloques de block_size columnas, los bloques se
+    reparten en él; si no, se resuelve todo como un solo bloque aquí.
+    """
+    if not free_cols:
+        return [[] for _ in pivot_cols]
+    step = len(free_cols)
+    if executor is not None and 0 < block_size and len(free_cols) >= 2 * block_size:
+        step = block_size
+    coeffs = [[row[c] for c in pivot_cols] for row in rows]
+    tasks = [(coeffs, [[row[c] for c in free_cols[start:start + step]] for row in rows],
+              [[img_row[start:start + step] for img_row in img] for img in residues], moduli)
+             for start in range(0, len(free_cols), step)]
+    if len(tasks) == 1:
+        blocks, futures = [reconstruct_block(*tasks[0])], []
+    else:
+        futures = [executor.submit(reconstruct_block, *task) for task in tasks]
+        blocks = (future.result() for future in futures)
+    entries = [[] for _ in pivot_cols]
+    try:
+        for block in blocks:
+            if block is None:
+                return None
+            for row, part in zip(entries, block):
+                row.extend(Fraction(num, den) for num, den in part)
+            if check is not None:
+                check()
+    finally:
+        for future in futures:
+            future.cancel()
+    return entries
+
+
+def multimodular_rref(rows, check=None, executor=None, block_size=BLOCK_SIZE):
+    """
+    RREF EXACTA de una matriz entera (todas las columnas pivotan) por imágenes modulares:
+    1. Se calcula la RREF módulo varios primos; las imágenes con menos pivotes o con
+       columnas pivote lexicográficamente mayores vienen de primos "malos" y se descartan.
+    2. Las entradas de las columnas no pivote se combinan por el Teorema Chino del Resto
+       y se recuperan por reconstrucción racional.
+    3. El resultado se verifica con aritmética entera contra las filas originales.
+    Se intenta reconstruir cada vez que se duplica el número de primos (cada tanda se
+    elimina en paralelo con rref_mod_many), hasta la cota de Hadamard (los menores de la
+    matriz acotan numeradores y denominadores). check() se llama antes de cada tanda
+    (plazos). Con executor (concurrent.futures) los pasos 2 y 3 se reparten por bloques de
+    block_size columnas sin pivote (reconstruct_block); la eliminación se hace una sola vez.
+    Devuelve (columnas pivote, filas de Fraction) o None si no se logró una RREF verificada.
+    """
+    m = len(rows)
+    width = len(rows[0]) if m else 0
+    zero, one = Fraction(0), Fraction(1)
+    needed = 2 * hadamard_bits(rows) + 2
+
+    primes = iter_primes()
+    best = None
+    free_cols = []
+    residues = []
+    moduli = []
+    modulus = 1
+    while True:
+        if check is not None:
+            check()
+        # Tanda: duplica los primos acumulados sin pasarse mucho de la cota
+        missing = max(1, (needed - modulus.bit_length()) // 30 + 1)
+        chunk = [next(primes) for _ in range(min(max(1, len(moduli)), missing))]
+        for p, (pivot_cols, image) in zip(chunk, rref_mod_many(rows, chunk)):
+            key = (-len(pivot_cols), pivot_cols)
+            if best is None or key < best:
+                # Primo bueno con mejor estructura: lo anterior venía de primos malos
+                best = key
+                pivot_set = set(pivot_cols)
+                free_cols = [c for c in range(width) if c not in pivot_set]
+                residues, moduli, modulus = [], [], 1
+            elif key > best:
+                continue
+            residues.append([[image[r][c] for c in free_cols] for r in range(len(pivot_cols))])
+            moduli.append(p)
+            modulus *= p
+        pivot_cols = best[1]
+        rank = len(pivot_cols)
+
+        entries = _reconstruct(rows, pivot_cols, free_cols, residues, moduli, check, executor, block_size)
+        if entries is not None:
+            out = []
+            for r in range(m):
+                line = [zero] * width
+                if r < rank:
+                    line[pivot_cols[r]] = one
+                    for j, c in enumerate(free_cols):
+                        line[c] = entries[r][j]
+                out.append(line)
+            return pivot_cols, out
+        if modulus.bit_length() > needed:
+            return None
@@ -0,0 +1,96 @@
+# models/parsing.py
+# Lectura de números y matrices completas: enteros, decimales y 'a/b' van directo a
+# racionales exactos, sin pasar por float
+
+import re
+from fractions import Fraction
+
+# Separadores de celdas en el texto pegado: comas, espacios, tabuladores y la barra
+# del lado derecho en [A | b]; las filas se separan con saltos de línea o ';'
+_CELL_SEPARATOR = re.compile(r"[,\s|]+")
+_ROW_SEPARATOR = re.compile(r"[;\r\n]+")
+# Tamaño máximo de una celda de texto: Fraction("1e10000000") expande el exponente
+# sin límite (segundos de CPU y memoria antes de la admisión por coste), así que
+# las celdas con más dígitos o con un exponente mayor se rechazan antes de convertirlas
+MAX_CELL_DIGITS = 1000
+MAX_CELL_EXPONENT = 1000
+_EXPONENT = re.compile(r"[eE]([+-]?[\d_]+)$")
+
+
+def to_fraction(x):
+    """
+    Conversión a Fraction que usan los solvers exactos. Los valores exactos (int,
+    Fraction, texto) se conservan tal cual; solo los float se aproximan con
+    limit_denominator (0.1 → 1/10 en lugar de 3602879701896397/36028797018963968).
+    """
+    if type(x) is Fraction:
+        return x
+    if type(x) is int:
+        return Fraction(x)
+    if isinstance(x, float):
+        return Fraction(x).limit_denominator()
+    if isinstance(x, str):
+        return Fraction(parse_exact(x))
+    return Fraction(x)
+
+
+def parse_exact(text):
+    """
+    Texto de una celda → int (enteros) o Fraction (decimales, 'a/b', notación científica).
+    Lanza ValueError si no es un número o si supera MAX_CELL_DIGITS / MAX_CELL_EXPONENT.
+    """
+    text = text.strip()
+    if sum(c.isdigit() for c in text) > MAX_CELL_DIGITS:
+        raise ValueError(f"Número demasiado largo (máximo {MAX_CELL_DIGITS} dígitos): {text[:20]!r}….")
+    exponent = _EXPONENT.search(text)
+    if exponent is not None and abs(int(exponent.group(1))) > MAX_CELL_EXPONENT:
+        raise ValueError(f"Exponente demasiado grande (máximo {MAX_CELL_EXPONENT}): {text!r}.")
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Valor no numérico: {text!r}.")
+
+
+def parse_number(x, exact=True):
+    """Número JSON o texto: exacto (int/Fraction) o float según 'exact'."""
+    if isinstance(x, bool) or not isinstance(x, (int, float, str)):
+        raise ValueError(f"Valor no numérico: {x!r}.")
+    if isinstance(x, str):
+        x = parse_exact(x)
+        return x if exact else float(x)
+    return x
+
+
+def _check_rectangular(rows):
+    if not rows:
+        raise ValueError("La matriz no puede estar vacía.")
+    width = len(rows[0])
+    if width == 0 or any(len(row) != width for row in rows):
+        raise ValueError("Todas las filas deben tener la misma longitud.")
+    return rows
+
+
+def parse_matrix_text(text, exact=True):
+    """
+    Matriz completa pegada en un área de texto o CSV, en una sola pasada:
+    una fila por línea (o separadas por ';'), celdas separadas por comas, espacios,
+    tabuladores o '|'. Ejemplo: "1 2 | 3\\n4, 5, 6" o "1/2,0.25;3,-1".
+    """
+    convert = parse_exact if exact else (lambda cell: float(parse_exact(cell)))
+    rows = []
+    for line in _ROW_SEPARATOR.split(text):
+        cells = [cell for cell in _CELL_SEPARATOR.split(line) if cell]
+        if cells:
+            rows.append([convert(cell) for cell in cells])
+    return _check_rectangular(rows)
+
+
+def parse_matrix_json(data, exact=True):
+    """Matriz como lista JSON de filas; las celdas pueden ser números o texto ('3/4', '0.1')."""
+    if not isinstance(data, list) or not all(isinstance(row, list) for row in data):
+        raise ValueError("La matriz debe ser una lista de filas.")
+    return _check_rectangular([[parse_number(x, exact) for x in row] for row in data])
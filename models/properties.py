@@ -1,50 +1,75 @@
 # models/properties.py
-from fractions import Fraction
+
+from models.equations_solver import _numpy
+from models.parsing import to_fraction
+from models.rational import RationalRow
+
+# Con entradas de hasta este número de bits los productos del modo exacto caben en int64;
+# si no, los arreglos exactos usan enteros de Python (dtype=object)
+_INT64_SAFE_BITS = 30
+# Coste de una entrada de PropertiesBatch (con su formateo) en las unidades de
+# models.limits.estimate_cost, medido contra Gauss: una fracción cuesta ~6 veces un flotante
+EXACT_ENTRY_COST = 400
+FLOAT_ENTRY_COST = 60
 
 class Properties:
     def __init__(self, u, v, scalar, dimension, use_fractions=True):
         # conversión opcional a fracciones
-        toF = (lambda x: Fraction(x).limit_denominator()) if use_fractions else (lambda x: x)
-        self.u = [toF(x) for x in u]
-        self.v = [toF(x) for x in v]
+        toF = to_fraction if use_fractions else (lambda x: x)
         self.scalar = toF(scalar)
         self.dimension = dimension
         self.use_fractions = use_fractions
-
-        self.zero = [toF(0)] * dimension
-        self.opposite_u = [-x for x in self.u]
+        if use_fractions:
+            # Vectores exactos compactos: numeradores enteros + denominador común
+            self.u = RationalRow.from_values(toF(x) for x in u)
+            self.v = RationalRow.from_values(toF(x) for x in v)
+        else:
+            self.u = [toF(x) for x in u]
+            self.v = [toF(x) for x in v]
+        self._computations = None
 
     def sum_vectors(self, a, b):
+        if isinstance(a, RationalRow) and isinstance(b, RationalRow):
+            return a + b
         return [ai + bi for ai, bi in zip(a, b)]
 
     def scalar_mult(self, k, a):
+        if isinstance(a, RationalRow):
+            return a.scaled(k)
         return [k * ai for ai in a]
 
     def get_computations(self):
+        # get_verifications y la vista usan las mismas sumas: se calculan una sola vez
+        if self._computations is not None:
+            return self._computations
         u, v, k = self.u, self.v, self.scalar
+        # El cero y el opuesto solo se construyen cuando se piden los cálculos
+        zero       = RationalRow.zeros(self.dimension) if self.use_fractions else [0] * self.dimension
+        opposite_u = -u if self.use_fractions else [-x for x in u]
         sum_uv     = self.sum_vectors(u, v)
         sum_vu     = self.sum_vectors(v, u)
         k_u        = self.scalar_mult(k, u)
-        sum_u_zero = self.sum_vectors(u, self.zero)
-        sum_u_opp  = self.sum_vectors(u, self.opposite_u)
+        sum_u_zero = self.sum_vectors(u, zero)
+        sum_u_opp  = self.sum_vectors(u, opposite_u)
 
         # asociativa de la suma: tomamos w = k·v
         w          = self.scalar_mult(k, v)
         sum_uv_w   = self.sum_vectors(sum_uv, w)
         sum_u_vw   = self.sum_vectors(u, self.sum_vectors(v, w))
 
-        return {
+        self._computations = {
             'sum_uv': sum_uv,
             'sum_vu': sum_vu,
             'k_u': k_u,
-            'zero': self.zero,
-            'opposite_u': self.opposite_u,
+            'zero': zero,
+            'opposite_u': opposite_u,
             'sum_u_zero': sum_u_zero,
             'sum_u_opp': sum_u_opp,
             'w': w,
             'sum_uv_w': sum_uv_w,
             'sum_u_vw': sum_u_vw
         }
+        return self._computations
 
     def get_verifications(self):
         c = self.get_computations()
@@ -52,5 +77,149 @@ class Properties:
             'commutative':     c['sum_uv'] == c['sum_vu'],
             'associative':     c['sum_uv_w'] == c['sum_u_vw'],
             'zero_exists':     c['sum_u_zero'] == self.u,
-            'opposite_exists': c['sum_u_opp'] == self.zero
+            'opposite_exists': c['sum_u_opp'] == c['zero']
         }
+
+
+class PropertiesBatch:
+    """
+    Los mismos cálculos y verificaciones que Properties para muchas instancias
+    (u, v, escalar) a la vez, con UNA pasada vectorizada de NumPy por operación:
+    - exacto: cada instancia se guarda como numeradores enteros con un denominador
+      común d (el de u y v); con el escalar k = p/q todas las sumas que lo usan
+      comparten el denominador q·d, así que cada verificación compara enteros.
+    - flotante (use_fractions=False): arreglos float64, en el mismo orden de
+      operaciones que Properties.
+    us y vs son listas de vectores (todos de la misma dimensión); scalars, un escalar
+    por instancia. Los resultados se calculan una vez y se reutilizan.
+    """
+    def __init__(self, us, vs, scalars, use_fractions=True):
+        np = _numpy()
+        if np is None:
+            raise ValueError("PropertiesBatch requiere tener NumPy instalado.")
+        if not (len(us) == len(vs) == len(scalars)):
+            raise ValueError("u, v y los escalares deben tener el mismo número de instancias.")
+        self.count = len(us)
+        self.dimension = len(us[0]) if us else 0
+        if any(len(x) != self.dimension for x in (*us, *vs)):
+            raise ValueError("Todos los vectores deben tener la misma dimensión.")
+        self.use_fractions = use_fractions
+        self._verifications = None
+        self._computations = None
+
+        if not use_fractions:
+            self.u = np.array(us, dtype=float).reshape(self.count, self.dimension)
+            self.v = np.array(vs, dtype=float).reshape(self.count, self.dimension)
+            self.scalar = np.array(scalars, dtype=float)[:, None]
+            return
+
+        # Conversión memorizada por valor: los ejercicios generados repiten mucho las entradas
+        converted = {}
+
+        def toF(x):
+            f = converted.get(x)
+            if f is None:
+                f = converted[x] = to_fraction(x)
+            return f
+
+        rows = [RationalRow.from_values([toF(x) for x in u] + [toF(x) for x in v]) for u, v in zip(us, vs)]
+        ks = [toF(k) for k in scalars]
+        nums = [row.nums for row in rows]
+        dens = [row.den for row in rows]
+        p = [k.numerator for k in ks]
+        q = [k.denominator for k in ks]
+        bits = max((abs(x).bit_length() for x in (*(x for row in nums for x in row), *p, *q, *dens)), default=0)
+        dtype = np.int64 if bits <= _INT64_SAFE_BITS else object
+        d = self.dimension
+        a = np.array(nums, dtype=dtype).reshape(self.count, 2 * d)
+        self.u, self.v = a[:, :d], a[:, d:]
+        self.den = np.array(dens, dtype=dtype)[:, None]
+        self.p = np.array(p, dtype=dtype)[:, None]
+        self.q = np.array(q, dtype=dtype)[:, None]
+
+    def _compute(self):
+        """Todas las sumas y productos, una operación por arreglo; devuelve (arreglos, denominadores)."""
+        u, v = self.u, self.v
+        if not self.use_fractions:
+            np = _numpy()
+            k = self.scalar
+            w = k * v
+            sum_uv = u + v
+            arrays = {
+                'sum_uv': sum_uv,
+                'sum_vu': v + u,
+                'k_u': k * u,
+                'zero': np.zeros_like(u),
+                'opposite_u': -u,
+                'sum_u_zero': u + 0.0,
+                'sum_u_opp': u + (-u),
+                'w': w,
+                'sum_uv_w': sum_uv + w,
+                'sum_u_vw': u + (v + w),
+            }
+            return arrays, {}
+
+        p, q, den = self.p, self.q, self.den
+        # Numeradores: las entradas con escalar tienen denominador q·d, el resto d
+        sum_uv = u + v
+        pv = p * v
+        opposite = -u
+        arrays = {
+            'sum_uv': sum_uv,
+            'sum_vu': v + u,
+            'k_u': p * u,
+            'zero': u * 0,
+            'opposite_u': opposite,
+            'sum_u_zero': u + 0,
+            'sum_u_opp': u + opposite,
+            'w': pv,
+            'sum_uv_w': q * sum_uv + pv,
+            'sum_u_vw': q * u + (q * v + pv),
+        }
+        scaled = den * q
+        dens = {name: scaled if name in ('k_u', 'w', 'sum_uv_w', 'sum_u_vw') else den for name in arrays}
+        return arrays, dens
+
+    def _results(self):
+        if self._verifications is None:
+            arrays, dens = self._compute()
+            self._arrays, self._dens = arrays, dens
+            c = arrays
+            self._verifications = {
+                'commutative': (c['sum_uv'] == c['sum_vu']).all(axis=1),
+                'associative': (c['sum_uv_w'] == c['sum_u_vw']).all(axis=1),
+                'zero_exists': (c['sum_u_zero'] == self.u).all(axis=1),
+                'opposite_exists': (c['sum_u_opp'] == 0).all(axis=1),
+            }
+        return self._arrays, self._dens, self._verifications
+
+    def get_verifications(self):
+        """Lista con el dict de verificaciones de cada instancia (mismas claves que Properties)."""
+        _, _, checks = self._results()
+        columns = {name: values.tolist() for name, values in checks.items()}
+        return [{name: bool(values[i]) for name, values in columns.items()} for i in range(self.count)]
+
+    def get_computations(self):
+        """
+        Lista con el dict de cálculos de cada instancia (mismas claves que Properties):
+        RationalRow en modo exacto, listas de float en modo flotante.
+        """
+        if self._computations is not None:
+            return self._computations
+        arrays, dens, _ = self._results()
+        columns = {name: values.tolist() for name, values in arrays.items()}
+        if self.use_fractions:
+            den_columns = {name: [int(x) for x in values[:, 0].tolist()] for name, values in dens.items()}
+            self._computations = [
+                {name: RationalRow([int(x) for x in columns[name][i]], den_columns[name][i]).normalize()
+                 for name in columns}
+                for i in range(self.count)
+            ]
+        else:
+            self._computations = [{name: columns[name][i] for name in columns} for i in range(self.count)]
+        return self._computations
+
+    def get_results(self):
+        """Por instancia: {'verifications': {...}, 'computations': {...}}."""
+        return [{'verifications': ver, 'computations': comp}
+                for ver, comp in zip(self.get_verifications(), self.get_computations())]
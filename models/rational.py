@@ -0,0 +1,138 @@
+# models/rational.py
+# Filas/vectores racionales compactos: numeradores enteros con un denominador común por fila
+
+from fractions import Fraction
+from math import gcd
+
+
+class RationalRow:
+    """
+    Vector de racionales guardado como numeradores enteros + UN denominador positivo
+    compartido (valor j = nums[j] / den), en vez de un objeto Fraction por entrada.
+
+    Las operaciones de fila de la eliminación (divide, sub_scaled) modifican la fila
+    en su sitio; la lectura por índice devuelve Fraction para compatibilidad.
+    """
+    __slots__ = ("nums", "den")
+
+    def __init__(self, nums, den=1):
+        self.nums = nums
+        self.den = den
+
+    @classmethod
+    def from_values(cls, values):
+        """Construye la fila a partir de Fraction/int (usa el mcm de los denominadores)."""
+        values = [v if isinstance(v, Fraction) else Fraction(v) for v in values]
+        den = 1
+        for v in values:
+            d = v.denominator
+            if d != 1 and den % d:
+                den = den // gcd(den, d) * d
+        return cls([v.numerator * (den // v.denominator) for v in values], den)
+
+    @classmethod
+    def zeros(cls, size):
+        return cls([0] * size, 1)
+
+    def copy(self):
+        return RationalRow(self.nums[:], self.den)
+
+    # ========= Lectura =========
+    def __len__(self):
+        return len(self.nums)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [Fraction(x, self.den) for x in self.nums[idx]]
+        return Fraction(self.nums[idx], self.den)
+
+    def __iter__(self):
+        den = self.den
+        return (Fraction(x, den) for x in self.nums)
+
+    def __eq__(self, other):
+        if isinstance(other, RationalRow):
+            if len(self.nums) != len(other.nums):
+                return False
+            if self.den == other.den:
+                return self.nums == other.nums
+            d1, d2 = self.den, other.den
+            return all(a * d2 == b * d1 for a, b in zip(self.nums, other.nums))
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self.nums) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RationalRow({self.to_fractions()!r})"
+
+    def is_zero_at(self, j):
+        return self.nums[j] == 0
+
+    def abs_float(self, j):
+        # División entera verdadera: correctamente redondeada, igual que float(Fraction)
+        return abs(self.nums[j]) / self.den
+
+    def to_fractions(self):
+        den = self.den
+        return [Fraction(x, den) for x in self.nums]
+
+    # ========= Operaciones en el sitio =========
+    def normalize(self):
+        """Divide numeradores y denominador por su mcd común."""
+        g = gcd(self.den, *self.nums)
+        if g > 1:
+            self.nums = [x // g for x in self.nums]
+            self.den //= g
+        return self
+
+    def divide(self, pivot):
+        """fila ← fila / pivote (pivote Fraction no nulo)."""
+        p, q = pivot.numerator, pivot.denominator
+        if p < 0:
+            p, q = -p, -q
+        nums = self.nums
+        if q != 1:
+            for j, x in enumerate(nums):
+                if x:
+                    nums[j] = x * q
+        self.den *= p
+        return self.normalize()
+
+    def sub_scaled(self, factor, other):
+        """fila ← fila − factor · otra (factor Fraction), recorriendo solo entradas no nulas de 'otra'."""
+        p, q = factor.numerator, factor.denominator
+        d1, d2 = self.den, other.den * q
+        # Denominador común mcm(d1, q·d2): cada lado se multiplica por su cofactor
+        g = gcd(d1, d2)
+        mine = d2 // g
+        theirs = p * (d1 // g)
+        nums = self.nums
+        if mine != 1:
+            for j, x in enumerate(nums):
+                if x:
+                    nums[j] = x * mine
+        for j, y in enumerate(other.nums):
+            if y:
+                nums[j] -= theirs * y
+        self.den = d1 // g * d2
+        return self.normalize()
+
+    # ========= Operaciones que devuelven un vector nuevo =========
+    def __add__(self, other):
+        if not isinstance(other, RationalRow):
+            return NotImplemented
+        d1, d2 = self.den, other.den
+        g = gcd(d1, d2)
+        a, b = d2 // g, d1 // g
+        return RationalRow([x * a + y * b for x, y in zip(self.nums, other.nums)], d1 // g * d2).normalize()
+
+    def __neg__(self):
+        return RationalRow([-x for x in self.nums], self.den)
+
+    def scaled(self, k):
+        """k · fila como vector nuevo (k Fraction o int)."""
+        k = k if isinstance(k, Fraction) else Fraction(k)
+        p, q = k.numerator, k.denominator
+        return RationalRow([x * p for x in self.nums], self.den * q).normalize()
@@ -0,0 +1,259 @@
+# models/session.py
+# Sesiones de resolución incremental: conservan A⁻¹ y re-resuelven A x = b
+# sin repetir la eliminación cuando cambia una entrada de b o una fila de A
+
+import threading
+import uuid
+
+from models.cache import MemoryBackend, SQLiteBackend
+from models.equations_solver import Gauss, MatrixOperations, format_number
+from models.parsing import to_fraction
+
+# En punto flotante se refactoriza desde cero cada tantas actualizaciones de rango uno
+# para que el error de redondeo acumulado no crezca sin límite
+FLOAT_REFACTOR_EVERY = 32
+
+
+class SolverSession:
+    """
+    Sistema A x = b que admite ediciones de una celda o una fila.
+
+    Si A es cuadrada e invertible se guarda A⁻¹ (una sola eliminación sobre [A | I]):
+    - cambio de b[i]: x += Δ · A⁻¹[:, i]                         → O(n)
+    - cambio de la fila i de A (A' = A + e_i vᵀ): Sherman–Morrison
+        A'⁻¹ = A⁻¹ − (A⁻¹ e_i)(vᵀ A⁻¹) / (1 + vᵀ A⁻¹ e_i)         → O(n²)
+    Si A no es invertible (o la actualización la vuelve singular) se resuelve
+    de nuevo con Gauss desde cero.
+    deadline (models.limits.Deadline) acota las eliminaciones completas; es de la
+    petición en curso, así que se cambia en cada edición y no se guarda con la sesión.
+    """
+    def __init__(self, matrix, results, use_fractions=True, tol=1e-12, deadline=None):
+        if len(matrix) == 0:
+            raise ValueError("La matriz no puede estar vacía.")
+        self.m = len(matrix)
+        self.n = len(matrix[0])
+        if any(len(row) != self.n for row in matrix):
+            raise ValueError("Todas las filas deben tener la misma longitud.")
+        if len(results) != self.m:
+            raise ValueError("El vector de resultados debe tener la misma longitud que las filas de la matriz.")
+        self.use_fractions = use_fractions
+        self.tol = tol
+        self.deadline = deadline
+        self.A = [[self._convert(x) for x in row] for row in matrix]
+        self.b = [self._convert(x) for x in results]
+        # Cómo se obtuvo el último resultado: 'full' | 'rhs-update' | 'sherman-morrison'
+        self.method = None
+        self.updates = 0
+        self._refactor()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["deadline"] = None
+        return state
+
+    def _convert(self, x):
+        # Misma conversión que Gauss, para que la sesión y una resolución completa coincidan
+        return to_fraction(x) if self.use_fractions else float(x)
+
+    def _is_zero(self, x, scale=1.0):
+        # En punto flotante la tolerancia es relativa (como rank_tol = tol · max|A| en Gauss)
+        return x == 0 if self.use_fractions else abs(x) <= self.tol * scale
+
+    # ========= Resolución completa =========
+    def _refactor(self):
+        self.method = "full"
+        self._since_refactor = 0
+        self.inverse = None
+        self.x = None
+        self._gauss = None
+        if self.m == self.n:
+            operations = MatrixOperations(self.A, use_fractions=self.use_fractions, tol=self.tol,
+                                          record_steps=False, deadline=self.deadline)
+            self.inverse = operations.inverse()
+        if self.inverse is not None:
+            self.x = self._apply_inverse(self.b)
+        else:
+            self._gauss = Gauss(self.A, self.b, use_fractions=self.use_fractions, tol=self.tol,
+                                record_steps=False, deadline=self.deadline)
+            self._gauss.solve()
+
+    def _apply_inverse(self, b):
+        return [sum(a * bj for a, bj in zip(row, b)) for row in self.inverse]
+
+    # ========= Ediciones =========
+    def set_rhs(self, i, value):
+        """Cambia b[i]."""
+        if not 0 <= i < self.m:
+            raise ValueError(f"Índice de fila fuera de rango: {i}.")
+        value = self._convert(value)
+        delta = value - self.b[i]
+        self.b[i] = value
+        self.updates += 1
+        if self.inverse is None:
+            self._refactor()
+            return self.method
+        if delta != 0:
+            self.x = [xj + delta * row[i] for xj, row in zip(self.x, self.inverse)]
+        self.method = "rhs-update"
+        return self.method
+
+    def set_rhs_vector(self, results):
+        """Reemplaza b completo: x = A⁻¹ b en O(n²)."""
+        if len(results) != self.m:
+            raise ValueError("El vector de resultados debe tener la misma longitud que las filas de la matriz.")
+        self.b = [self._convert(x) for x in results]
+        self.updates += 1
+        if self.inverse is None:
+            self._refactor()
+            return self.method
+        self.x = self._apply_inverse(self.b)
+        self.method = "rhs-update"
+        return self.method
+
+    def set_coefficient(self, i, j, value):
+        """Cambia A[i][j] (actualización de rango uno con un solo término)."""
+        if not 0 <= j < self.n:
+            raise ValueError(f"Índice de columna fuera de rango: {j}.")
+        if not 0 <= i < self.m:
+            raise ValueError(f"Índice de fila fuera de rango: {i}.")
+        row = list(self.A[i])
+        row[j] = value
+        return self.set_row(i, row)
+
+    def set_row(self, i, values):
+        """Reemplaza la fila i de A."""
+        if not 0 <= i < self.m:
+            raise ValueError(f"Índice de fila fuera de rango: {i}.")
+        if len(values) != self.n:
+            raise ValueError("Todas las filas deben tener la misma longitud.")
+        values = [self._convert(x) for x in values]
+        # v = fila nueva − fila vieja, solo entradas no nulas
+        v = {j: new - old for j, (new, old) in enumerate(zip(values, self.A[i])) if new != old}
+        self.A[i] = values
+        self.updates += 1
+        if self.inverse is None or (not self.use_fractions and self._since_refactor >= FLOAT_REFACTOR_EVERY):
+            self._refactor()
+            return self.method
+        if not v:
+            self.method = "sherman-morrison"
+            return self.method
+
+        inv = self.inverse
+        # w = vᵀ A⁻¹ (combina solo las filas de A⁻¹ donde v no es cero)
+        w = [0] * self.n
+        for k, vk in v.items():
+            w = [wj + vk * a for wj, a in zip(w, inv[k])]
+        denom = 1 + w[i]
+        u = [row[i] for row in inv]  # A⁻¹ e_i
+        # σ_min(A') ≈ |denom| / (‖u‖·‖w‖): la nueva A es singular si ese pivote efectivo
+        # no supera rank_tol = tol · max|A'| (la misma escala que Gauss en punto flotante)
+        scale = 1.0
+        if not self.use_fractions:
+            scale_a = max(abs(x) for row in self.A for x in row)
+            scale = (scale_a or 1.0) * max(abs(x) for x in u) * max(abs(x) for x in w)
+        if self._is_zero(denom, scale):
+            # La nueva A es singular: hay que clasificar el sistema con Gauss
+            self._refactor()
+            return self.method
+
+        for r, ur in enumerate(u):
+            if ur != 0:
+                scale = ur / denom
+                inv[r] = [a - scale * wj for a, wj in zip(inv[r], w)]
+        # x' = x − A⁻¹ e_i · (v · x) / denom
+        vx = sum(vk * self.x[k] for k, vk in v.items())
+        if vx != 0:
+            factor = vx / denom
+            self.x = [xj - factor * uj for xj, uj in zip(self.x, u)]
+        self._since_refactor += 1
+        self.method = "sherman-morrison"
+        return self.method
+
+    # ========= Resultado =========
+    def get_classification(self):
+        if self._gauss is not None:
+            return self._gauss.get_classification()
+        return {"consistent": True, "status": "unique", "rank": self.n, "m": self.m, "n": self.n}
+
+    def get_formatted_solution(self):
+        if self._gauss is not None:
+            return self._gauss.get_formatted_solution()
+        return [f"x{idx+1} = {self._format(val)}" for idx, val in enumerate(self.x)]
+
+    def get_pivot_report(self):
+        if self._gauss is not None:
+            return self._gauss.get_pivot_report()
+        return [f"Columna {j+1}: pivote en fila {j+1} (valor 1)" for j in range(self.n)]
+
+    def _format(self, num):
+        return format_number(num, self.use_fractions, self.tol)
+
+    def result(self):
+        """Resumen en datos planos (mismo formato que la API por lotes)."""
+        info = self.get_classification()
+        out = {
+            "status": info["status"],
+            "consistent": info["consistent"],
+            "rank": info["rank"],
+            "m": info["m"],
+            "n": info["n"],
+            "pivot_cols": self._gauss.pivot_cols if self._gauss is not None else list(range(self.n)),
+            "solution": self.get_formatted_solution(),
+            "method": self.method,
+        }
+        if info["status"] == "unique":
+            values = self.x if self._gauss is None else self._gauss.solution
+            out["values"] = [self._format(x) for x in values]
+        return out
+
+
+class SessionStore:
+    """
+    Sesiones indexadas por un ID aleatorio, sobre un backend LRU de models.cache
+    ('memory' por proceso, o 'sqlite' compartido entre workers).
+    """
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend(1024)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """SESSION_STORE_BACKEND ('memory' | 'sqlite'), SESSION_STORE_SIZE, SESSION_STORE_PATH."""
+        kind = config.get("SESSION_STORE_BACKEND", "memory")
+        size = config.get("SESSION_STORE_SIZE", 1024)
+        if kind == "memory":
+            return cls(MemoryBackend(size))
+        if kind == "sqlite":
+            return cls(SQLiteBackend(config.get("SESSION_STORE_PATH", "instance/sessions.sqlite3"), size))
+        raise ValueError(f"Backend de sesiones desconocido: {kind}.")
+
+    def create(self, session):
+        session_id = uuid.uuid4().hex
+        self.backend.set(session_id, session)
+        return session_id
+
+    def get(self, session_id):
+        return self.backend.get(session_id)
+
+    def update(self, session_id, edit):
+        """
+        Aplica edit(session) y guarda la sesión (backend.update). Cada sesión tiene su propio
+        candado, así que una reeliminación larga no detiene las ediciones de otras sesiones;
+        entre workers de Gunicorn el backend guarda con compare-and-swap y repite la edición
+        si otro worker escribió antes. Devuelve la sesión o None si no existe.
+        """
+        with self._locks_guard:
+            entry = self._locks.setdefault(session_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                return self.backend.update(session_id, edit)
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[session_id]
+
+    def delete(self, session_id):
+        return self.backend.delete(session_id)
@@ -0,0 +1,189 @@
+# models/vector_space.py
+# Operaciones de espacio vectorial sobre conjuntos grandes de vectores (exactas o en punto
+# flotante): pertenencia al espacio generado, independencia, base, Gram–Schmidt/QR y
+# proyecciones, todo a partir de UNA eliminación sobre los vectores puestos como columnas
+
+from models.cache import MemoryBackend, canonical_key
+from models.equations_solver import MatrixOperations, _numpy
+from models.parsing import to_fraction
+
+# Conjuntos de vectores memorizados por contenido (VectorSet.cached): las consultas
+# repetidas sobre los mismos vectores no repiten la eliminación
+VECTOR_SET_CACHE_SIZE = 128
+
+_vector_sets = MemoryBackend(VECTOR_SET_CACHE_SIZE)
+
+
+def _dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+class VectorSet:
+    """
+    Vectores v1..vk de Rⁿ. Se reduce UNA vez [V | I] (V con los vectores como columnas,
+    MatrixOperations) y de ahí sale todo:
+    - RREF de V: rango, columnas pivote (la base son los vectores originales de esas
+      columnas) y cada vector dependiente como combinación de la base
+    - E (bloque derecho, E·V = RREF): b está en el espacio generado si E·b se anula en
+      las filas sin pivote, y las filas con pivote dan sus coordenadas → O(n²) por consulta
+    Gram–Schmidt, QR y proyecciones se calculan al pedirlos y se guardan.
+    En modo exacto la base ortogonal no se normaliza (las normas pueden ser irracionales).
+    """
+    def __init__(self, vectors, use_fractions=True, tol=1e-12, deadline=None):
+        if not vectors:
+            raise ValueError("Se necesita al menos un vector.")
+        self.n = len(vectors[0])
+        if self.n == 0 or any(len(v) != self.n for v in vectors):
+            raise ValueError("Todos los vectores deben tener la misma dimensión.")
+        self.k = len(vectors)
+        self.use_fractions = use_fractions
+        self.tol = tol
+        convert = to_fraction if use_fractions else float
+        self.vectors = [[convert(x) for x in v] for v in vectors]
+        columns = [[v[i] for v in self.vectors] for i in range(self.n)]
+        self._scale = 0 if use_fractions else max(abs(x) for v in self.vectors for x in v)
+
+        operations = MatrixOperations(columns, use_fractions=use_fractions, tol=tol,
+                                      record_steps=False, deadline=deadline)
+        gauss = operations.gauss
+        self.rank = gauss.rank()
+        self.pivot_cols = sorted(gauss.pivot_cols)[:self.rank]
+        self._rref = [row[:self.k] for row in gauss.aug]
+        self._transform = [row[self.k:] for row in gauss.aug]
+        self._operations = operations
+        self._orthogonal = None
+        self._qr = None
+
+    @classmethod
+    def cached(cls, vectors, use_fractions=True, tol=1e-12, deadline=None):
+        """Mismo VectorSet para los mismos vectores (LRU por contenido, en el proceso)."""
+        key = canonical_key("vector_set", vectors, [], use_fractions, tol)
+        vector_set = _vector_sets.get(key)
+        if vector_set is None:
+            vector_set = cls(vectors, use_fractions, tol, deadline)
+            _vector_sets.set(key, vector_set)
+        return vector_set
+
+    def _convert(self, b):
+        if len(b) != self.n:
+            raise ValueError(f"El vector debe tener dimensión {self.n}.")
+        convert = to_fraction if self.use_fractions else float
+        return [convert(x) for x in b]
+
+    def _is_zero(self, x, scale):
+        if self.use_fractions:
+            return x == 0
+        return abs(x) <= self.tol * scale if scale > 0 else abs(x) <= self.tol
+
+    # ========= Independencia y base =========
+    def is_independent(self):
+        return self.rank == self.k
+
+    def spans_space(self):
+        """True si los vectores generan todo Rⁿ."""
+        return self.rank == self.n
+
+    def basis(self):
+        """Base del espacio generado: los vectores originales de las columnas pivote."""
+        return [self.vectors[c] for c in self.pivot_cols]
+
+    def dependencies(self):
+        """
+        {j: {i: coeficiente}} para cada vector dependiente: v_j = Σ coeficiente · v_i,
+        con i en la base (se lee de la columna j de la RREF).
+        """
+        out = {}
+        for j in range(self.k):
+            if j in self.pivot_cols:
+                continue
+            out[j] = {c: self._rref[row][j] for row, c in enumerate(self.pivot_cols)
+                      if not self._is_zero(self._rref[row][j], 1)}
+        return out
+
+    def relations(self):
+        """Base de las relaciones Σ c_j v_j = 0 (espacio nulo de V)."""
+        return self._operations.nullspace()
+
+    # ========= Pertenencia al espacio generado =========
+    def coordinates(self, b):
+        """
+        Coeficientes c (uno por vector) con Σ c_j v_j = b, usando solo vectores de la
+        base (los dependientes quedan en 0); None si b no está en el espacio generado.
+        """
+        b = self._convert(b)
+        y = [_dot(row, b) for row in self._transform]
+        scale = max(self._scale, max((abs(x) for x in b), default=0))
+        if not all(self._is_zero(x, scale) for x in y[self.rank:]):
+            return None
+        zero = to_fraction(0) if self.use_fractions else 0.0
+        coefficients = [zero] * self.k
+        for row, c in enumerate(self.pivot_cols):
+            coefficients[c] = y[row]
+        return coefficients
+
+    def contains(self, b):
+        """True si b es combinación lineal de los vectores."""
+        return self.coordinates(b) is not None
+
+    # ========= Gram–Schmidt, QR y proyecciones =========
+    def orthogonal_basis(self):
+        """
+        Gram–Schmidt (modificado) sobre la base: vectores ortogonales que generan el
+        mismo espacio; ortonormales en punto flotante.
+        """
+        if self._orthogonal is None:
+            self._orthogonal = self.qr()[0]
+        return self._orthogonal
+
+    def qr(self):
+        """
+        Factorización de la base B (vectores como columnas) B = Q·R, con Q dada por
+        columnas (lista de vectores) y R triangular superior (lista de filas):
+        - exacto: Q ortogonal sin normalizar y R con unos en la diagonal
+        - flotante: Q ortonormal (Householder de NumPy si está instalado)
+        """
+        if self._qr is not None:
+            return self._qr
+        basis = self.basis()
+        r = len(basis)
+        np = _numpy()
+        if not self.use_fractions and np is not None and r:
+            q, upper = np.linalg.qr(np.array(basis, dtype=float).T)
+            self._qr = (q.T.tolist(), upper.tolist())
+            return self._qr
+
+        q = []
+        upper = [[0] * r for _ in range(r)]
+        for j, v in enumerate(basis):
+            w = list(v)
+            for i, qi in enumerate(q):
+                if self.use_fractions:
+                    coefficient = _dot(qi, w) / _dot(qi, qi)
+                else:
+                    coefficient = _dot(qi, w)
+                upper[i][j] = coefficient
+                w = [x - coefficient * y for x, y in zip(w, qi)]
+            if self.use_fractions:
+                upper[j][j] = to_fraction(1)
+            else:
+                norm = _dot(w, w) ** 0.5
+                upper[j][j] = norm
+                w = [x / norm for x in w]
+            q.append(w)
+        self._qr = (q, upper)
+        return self._qr
+
+    def project(self, b):
+        """Proyección ortogonal de b sobre el espacio generado."""
+        b = self._convert(b)
+        zero = to_fraction(0) if self.use_fractions else 0.0
+        projection = [zero] * self.n
+        for q in self.orthogonal_basis():
+            coefficient = _dot(q, b) / _dot(q, q) if self.use_fractions else _dot(q, b)
+            projection = [p + coefficient * x for p, x in zip(projection, q)]
+        return projection
+
+    def residual(self, b):
+        """b menos su proyección: la componente de b ortogonal al espacio generado."""
+        projection = self.project(b)
+        return [x - p for x, p in zip(self._convert(b), projection)]
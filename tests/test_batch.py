@@ -0,0 +1,79 @@
+import pstats
+
+import pytest
+
+from app import app
+from models.batch import solve_batch
+from models.cache import MemoryBackend
+from models.limits import Deadline, SolveTimeout
+from models.session import SessionStore, SolverSession
+
+
+def _system(n):
+    return {"coefficients": [[n if i == j else 1 for j in range(n)] for i in range(n)], "rhs": list(range(n))}
+
+
+def test_batch_rejects_total_cost_over_budget():
+    client = app.test_client()
+    response = client.post("/api/solve/batch", json=[_system(40)] * 200)
+    assert response.status_code == 413
+    assert "lote" in response.get_json()["error"]
+    response = client.post("/api/solve/batch", json=[_system(4)] * 3)
+    assert response.status_code == 200
+    assert [out["status"] for out in response.get_json()["results"]] == ["unique"] * 3
+
+
+def test_batch_classify_only_matches_full_solve():
+    systems = [
+        {"coefficients": [[1, 2, 3], [2, 4, 6], [1, 0, 1]], "rhs": [6, 12, 2]},
+        {"coefficients": [[1, 2, 3], [2, 4, 6], [1, 0, 1]], "rhs": [6, 13, 2]},
+        {"coefficients": [[10 ** 30 + 1, 3], [7, 10 ** 30 - 1]], "rhs": [1, "1/3"]},
+        {"coefficients": [[1.5, 2.0], [3.0, 4.0000001]], "rhs": [1.0, 2.0], "mode": "float"},
+    ]
+    full = solve_batch(systems, max_workers=1)
+    classified = solve_batch([dict(spec, classify_only=True) for spec in systems], max_workers=1)
+    assert [out["status"] for out in full] == ["infinite", "inconsistent", "unique", "unique"]
+    for out, info in zip(full, classified):
+        assert info == {key: out[key] for key in ("status", "consistent", "rank", "m", "n")}
+
+
+def test_properties_batch_rejects_total_cost_over_budget():
+    instances = [{"u": [1] * 1000, "v": [2] * 1000, "scalar": "2/3"}] * 1000
+    response = app.test_client().post("/api/properties/batch", json={"instances": instances})
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_stops_at_deadline(max_workers):
+    with pytest.raises(SolveTimeout):
+        solve_batch([_system(40)] * 20, max_workers=max_workers, deadline=Deadline(0.01))
+
+
+def test_session_edit_past_deadline_keeps_stored_session():
+    store = SessionStore(MemoryBackend())
+    session_id = store.create(SolverSession([[2, 1], [1, 3]], [3, 5]))
+    deadline = Deadline(1)
+    deadline.cancel()
+
+    def edit(session):
+        session.deadline = deadline
+        session.set_row(1, [4, 2])  # singular: vuelve a eliminar desde cero y se detiene
+
+    with pytest.raises(SolveTimeout):
+        store.update(session_id, edit)
+    session = store.get(session_id)
+    assert session.A == [[2, 1], [1, 3]]
+    assert session.result()["values"] == ["4/5", "7/5"]
+
+
+def test_request_profile_includes_pooled_solver(tmp_path):
+    saved = {name: app.config[name] for name in ("PROFILE_REQUESTS", "PROFILE_DIR")}
+    app.config.update(PROFILE_REQUESTS=True, PROFILE_DIR=str(tmp_path))
+    try:
+        response = app.test_client().post("/solve?profile=1", data={"matrix": "2 1 | 3\n1 3 | 5"})
+        response.get_data()
+        response.close()
+    finally:
+        app.config.update(saved)
+    stats = pstats.Stats(str(tmp_path / response.headers["X-Profile-File"]))
+    assert any(filename.endswith("equations_solver.py") for filename, _, _ in stats.stats)
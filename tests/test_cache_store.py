@@ -0,0 +1,63 @@
+import html
+import json
+import re
+
+import pytest
+
+from app import app
+from models.cache import MemoryBackend, ResultCache, SQLiteBackend, SolutionStore
+
+
+@pytest.fixture
+def client(tmp_path):
+    # Caché de resultados en sqlite (serializa con pickle) junto con un almacén de soluciones
+    saved = {name: app.extensions.pop(name) for name in ("result_cache", "solution_store") if name in app.extensions}
+    app.extensions["result_cache"] = ResultCache(SQLiteBackend(str(tmp_path / "results.sqlite3")))
+    app.extensions["solution_store"] = SolutionStore(MemoryBackend())
+    try:
+        yield app.test_client()
+    finally:
+        app.extensions.update(saved)
+        for name in ("result_cache", "solution_store"):
+            if name not in saved:
+                app.extensions.pop(name, None)
+
+
+@pytest.mark.parametrize("path", ["/solve", "/solve_linear_combination", "/solve_vector_equation"])
+def test_gauss_routes_with_sqlite_cache_and_store(client, path):
+    for _ in range(2):  # fallo y acierto de la caché
+        response = client.post(path, data={"matrix": "2 1 | 3\n1 3 | 5"})
+        page = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert "No tiene solución" not in page
+        assert "¡Sistema Resuelto!" in page
+
+
+@pytest.mark.parametrize("kind, payload", [
+    ("gauss", {"A": [[2, 1], [1, 3]], "b": [3, 5]}),
+    ("matrix_equation", {"A": [[2, 1], [1, 3]], "B": [[1, 0], [0, 1]], "col": 1}),
+    ("matrix_operations", {"A": [[2, 1], [1, 3]]}),
+])
+def test_steps_with_sqlite_cache_and_store(client, kind, payload):
+    for _ in range(2):
+        response = client.post(f"/steps/{kind}", json=payload)
+        assert response.status_code == 200
+        assert 'class="step-item"' in response.get_data(as_text=True)
+
+
+def test_matrix_equation_with_sqlite_cache_and_store(client):
+    for _ in range(2):
+        response = client.post("/solve_matrix_equation", data={"A": "2 1\n1 3", "B": "1 0\n0 1"})
+        page = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert "pickle" not in page
+        assert "3/5" in page
+
+
+def test_steps_payload_keeps_exact_cells(client):
+    page = client.post("/solve", data={"matrix": "0.123456789 1 | 2\n3 4 | 5"}).get_data(as_text=True)
+    payload = json.loads(html.unescape(re.search(r"data-steps-payload='([^']*)'", page).group(1)))
+    assert payload["A"][0][0] == "123456789/1000000000"
+    steps = client.post("/steps/gauss", json=payload).get_data(as_text=True)
+    assert "x1 = -250000000/208847737" in page
+    assert '<div class="matrix-cell">-250000000/208847737</div>' in steps
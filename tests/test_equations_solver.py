@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from models import modular
+from models.equations_solver import Gauss
+
+FLOAT_ENGINES = ["numpy", "float", "sparse"]
+BIG = 10 ** 30
+# Sistemas exactos (A, B) que cada motor debe resolver igual que 'fraction'
+EXACT_CASES = {
+    "unique": ([[2, 1, -1], [-3, -1, 2], [-2, 1, 2]], [[8], [-11], [-3]]),
+    "large_entries": ([[BIG + 1, 3, 5], [7, BIG - 1, 2], [1, 4, BIG]], [[BIG], [-1], ["1/3"]]),
+    "fractions": ([["1/2", "2/3", 1], ["3/4", -1, "5/7"], [2, "1/9", "-4/5"]], [["1/3"], [2], ["7/11"]]),
+    "rank_deficient": ([[1, 2, 3], [2, 4, 6], [1, 0, 1]], [[6], [12], [2]]),
+    "inconsistent": ([[1, 2, 3], [2, 4, 6], [1, 0, 1]], [[6], [13], [2]]),
+    "overdetermined": ([[1, 1], [1, -1], [2, 0]], [[3], [1], [4]]),
+    "wide": ([[1, 2, 0, 1], [0, 1, 1, -1]], [[3], [1]]),
+    "mixed_rhs": ([[1, 2, 3], [2, 4, 6], [1, 0, BIG]], [[6, 1], [12, 0], [2, BIG]]),
+}
+
+
+def _assert_matches_fraction(A, B, engine):
+    solver = Gauss(A, B, multi_rhs=True, engine=engine)
+    reference = Gauss(A, B, multi_rhs=True, engine="fraction")
+    assert solver.get_pivot_report() == reference.get_pivot_report()
+    for col in range(reference.k):
+        assert solver.get_classification(col) == reference.get_classification(col)
+        assert solver.get_formatted_solution(col) == reference.get_formatted_solution(col)
+    return solver
+
+
+@pytest.mark.parametrize("engine", FLOAT_ENGINES)
+def test_float_pivots_survive_large_scale(engine):
+    solver = Gauss([[1e13, 0], [0, 1e13]], [1e13, 2e13], use_fractions=False, engine=engine)
+    solver.solve()
+    assert solver.status == "unique"
+    assert solver.solution == pytest.approx([1.0, 2.0])
+    assert solver.rank() == 2
+    assert solver.determinant() == pytest.approx(1e26)
+
+
+@pytest.mark.parametrize("engine", FLOAT_ENGINES)
+def test_float_consistency_is_checked_per_row(engine):
+    solver = Gauss([[1, 0], [0, 0]], [1e12, 0.5], use_fractions=False, engine=engine)
+    solver.solve()
+    assert solver.status == "inconsistent"
+    solver = Gauss([[1, 0], [0, 0]], [1e12, 0.0], use_fractions=False, engine=engine)
+    solver.solve()
+    assert solver.status == "infinite"
+
+
+def test_banded_exact_systems_use_sparse_engine():
+    n = 60
+    banded = [[i + j + 1 if abs(i - j) <= 2 else 0 for j in range(n)] for i in range(n)]
+    b = list(range(n))
+    gauss = Gauss(banded, b)
+    assert gauss.engine == "sparse"
+    assert gauss.get_formatted_solution() == Gauss(banded, b, engine="fraction").get_formatted_solution()
+    # Dispersa pero sin banda (la eliminación rellenaría): sigue la elección por tamaño
+    scattered = [row[:] for row in banded]
+    scattered[0][n - 1] = 1
+    assert Gauss(scattered, b).engine != "sparse"
+
+
+@pytest.mark.parametrize("case", sorted(EXACT_CASES))
+def test_sparse_engine_matches_fraction(case):
+    solver = _assert_matches_fraction(*EXACT_CASES[case], "sparse")
+    if solver.m == solver.n:
+        assert solver.determinant() == Gauss(EXACT_CASES[case][0], [0] * solver.m, engine="fraction").determinant()
+
+
+@pytest.mark.parametrize("case", sorted(EXACT_CASES))
+def test_hybrid_engine_matches_fraction(case):
+    solver = _assert_matches_fraction(*EXACT_CASES[case], "hybrid")
+    # Levantamiento de Dixon solo con solución única; si no, vía exacta completa
+    fallback = solver.metrics.counts.get("hybrid_fallback", 0)
+    assert fallback == (0 if set(solver.statuses) == {"unique"} else 1)
+
+
+def test_hybrid_engine_falls_back_when_reconstruction_fails(monkeypatch):
+    monkeypatch.setattr(modular, "rational_reconstruction", lambda *args: None)
+    solver = _assert_matches_fraction(*EXACT_CASES["large_entries"], "hybrid")
+    assert solver.metrics.counts["hybrid_fallback"] == 1
+
+
+@pytest.mark.parametrize("case", sorted(EXACT_CASES))
+def test_modular_engine_matches_fraction(case):
+    solver = _assert_matches_fraction(*EXACT_CASES[case], "modular")
+    assert "modular_fallback" not in solver.metrics.counts
+
+
+def test_modular_engine_reaches_hadamard_bound_on_large_entries():
+    # Entradas de ~100 bits: la cota de Hadamard pide varias tandas de primos de 31 bits
+    rnd = random.Random(11)
+    A = [[rnd.randint(-BIG, BIG) for _ in range(8)] for _ in range(8)]
+    A[6] = [x + 3 * y for x, y in zip(A[1], A[4])]  # rango 7
+    B = [[rnd.randint(-BIG, BIG) for _ in range(2)] for _ in range(8)]
+    B[6] = [x + 3 * y for x, y in zip(B[1], B[4])]  # compatible en la primera columna...
+    B[6][1] += 1  # ...e incompatible en la segunda
+    solver = _assert_matches_fraction(A, B, "modular")
+    assert solver.statuses == ["infinite", "inconsistent"]
+    assert "modular_fallback" not in solver.metrics.counts
+
+
+def test_modular_engine_falls_back_when_reconstruction_fails(monkeypatch):
+    monkeypatch.setattr(modular, "rational_reconstruction", lambda *args: None)
+    solver = _assert_matches_fraction(*EXACT_CASES["large_entries"], "modular")
+    assert solver.metrics.counts["modular_fallback"] == 1
+
+
+@pytest.mark.parametrize("case", sorted(EXACT_CASES))
+def test_classify_matches_fraction_solve(case):
+    A, B = EXACT_CASES[case]
+    reference = Gauss(A, B, multi_rhs=True, engine="fraction")
+    expected = [reference.get_classification(col) for col in range(reference.k)]
+    assert Gauss(A, B, multi_rhs=True).classify() == expected
+    # Segunda vez: el perfil de rango de A está memorizado y solo se repiten las operaciones sobre B
+    assert Gauss(A, B, multi_rhs=True).classify() == expected
+    assert Gauss(A, B, multi_rhs=True).rank() == reference.rank()
+
+
+@pytest.mark.parametrize("case", ["unique", "rank_deficient", "inconsistent", "overdetermined", "wide"])
+def test_float_classify_matches_solve(case):
+    A, B = EXACT_CASES[case]
+    A = [[float(x) for x in row] for row in A]
+    B = [[float(x) for x in row] for row in B]
+    solver = Gauss(A, B, multi_rhs=True, use_fractions=False)
+    solver.solve()
+    assert Gauss(A, B, multi_rhs=True, use_fractions=False).classify() == [solver.get_classification()]
@@ -0,0 +1,43 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from models import matrix_equation
+from models.matrix_equation import MatrixEquation
+from models.modular import multimodular_rref
+
+
+def _matrix(rnd, m, n):
+    return [[rnd.randint(-9, 9) for _ in range(n)] for _ in range(m)]
+
+
+def test_multimodular_rref_blocks_match_single_block():
+    rnd = random.Random(7)
+    A = _matrix(rnd, 12, 12)
+    A[5] = [2 * x for x in A[3]]  # rango incompleto: columnas sin pivote también en A
+    rows = [a + b for a, b in zip(A, _matrix(rnd, 12, 40))]
+    with ThreadPoolExecutor(2) as executor:
+        assert multimodular_rref(rows, executor=executor, block_size=4) == multimodular_rref(rows)
+
+
+def test_parallel_matrix_equation_matches_serial():
+    rnd = random.Random(3)
+    A = _matrix(rnd, 50, 50)
+    B = _matrix(rnd, 50, 32)
+    serial = MatrixEquation(A, B, record_steps=False, max_workers=1)
+    parallel = MatrixEquation(A, B, record_steps=False, max_workers=2)
+    assert parallel.get_formatted_solutions() == serial.get_formatted_solutions()
+    assert parallel.get_overall_classification() == serial.get_overall_classification()
+
+
+def test_matrix_equation_is_serial_unless_modular_and_requested(monkeypatch):
+    def no_pool(max_workers=None):
+        raise AssertionError("no se esperaba un pool de procesos")
+
+    monkeypatch.setattr(matrix_equation, "_get_pool", no_pool)
+    rnd = random.Random(5)
+    # Trabajo suficiente para repartir, pero min(m, n) < MODULAR_MIN_SIZE: motor sin bloques
+    A = _matrix(rnd, 40, 40)
+    assert MatrixEquation(A, _matrix(rnd, 40, 32), record_steps=False, max_workers=2).infos
+    # Motor multimodular, pero sin pedir procesos: en serie
+    A = _matrix(rnd, 50, 50)
+    assert MatrixEquation(A, _matrix(rnd, 50, 32), record_steps=False).infos
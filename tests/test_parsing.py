@@ -0,0 +1,20 @@
+from fractions import Fraction
+
+import pytest
+
+from models.parsing import MAX_CELL_DIGITS, parse_exact, to_fraction
+
+
+@pytest.mark.parametrize("text", ["1e10000000", "1E-99999", "2e1_000_000", "9" * (MAX_CELL_DIGITS + 1)])
+def test_parse_exact_rejects_huge_cells(text):
+    with pytest.raises(ValueError):
+        parse_exact(text)
+    with pytest.raises(ValueError):
+        to_fraction(text)
+
+
+def test_parse_exact_keeps_ordinary_cells():
+    assert parse_exact("7") == 7
+    assert parse_exact("2.5e-3") == Fraction(1, 400)
+    assert parse_exact(" -1/3 ") == Fraction(-1, 3)
+    assert parse_exact("3e10") == 30000000000
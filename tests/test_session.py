@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from models.cache import MemoryBackend, SQLiteBackend
+from models.session import SessionStore, SolverSession
+
+
+def test_sqlite_sessions_do_not_lose_concurrent_edits(tmp_path):
+    # Un SessionStore por "worker": cada uno con su candado, compartiendo el archivo sqlite
+    path = str(tmp_path / "sessions.sqlite3")
+    n = 8
+    session_id = SessionStore(SQLiteBackend(path)).create(SolverSession(
+        [[int(i == j) for j in range(n)] for i in range(n)], [0] * n))
+
+    def worker(i):
+        store = SessionStore(SQLiteBackend(path))
+        for value in range(1, 11):
+            store.update(session_id, lambda session: session.set_rhs(i, value))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session = SessionStore(SQLiteBackend(path)).get(session_id)
+    assert session.b == [10] * n
+    assert session.updates == 10 * n
+
+
+def test_session_edit_does_not_block_other_sessions():
+    store = SessionStore(MemoryBackend())
+    slow_id = store.create(SolverSession([[1, 0], [0, 1]], [0, 0]))
+    other_id = store.create(SolverSession([[1, 0], [0, 1]], [0, 0]))
+    started, release = threading.Event(), threading.Event()
+
+    def slow_edit(session):
+        started.set()
+        release.wait(5)
+        session.set_rhs(0, 1)
+
+    thread = threading.Thread(target=store.update, args=(slow_id, slow_edit))
+    thread.start()
+    started.wait(5)
+    try:
+        assert store.update(other_id, lambda session: session.set_rhs(1, 2)).b == [0, 2]
+    finally:
+        release.set()
+        thread.join()
+    assert store.get(slow_id).b == [1, 0]
+    assert not store._locks
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_update_retries_when_value_changes_during_edit(tmp_path, backend):
+    # Otro worker escribe entre la lectura y el compare-and-swap: la edición se repite
+    store = MemoryBackend() if backend == "memory" else SQLiteBackend(str(tmp_path / "s.sqlite3"))
+    store.set("k", [0])
+    calls = []
+
+    def edit(value):
+        calls.append(list(value))
+        if len(calls) == 1:
+            store.set("k", [10])
+        value[0] += 1
+
+    assert store.update("k", edit) == [11]
+    assert calls == [[0], [10]]
+    assert store.get("k") == [11]
+
+
+def test_float_row_update_detects_singularity_at_any_scale():
+    for scale in (1e-8, 1.0, 1e8):
+        session = SolverSession([[2 * scale, scale], [scale, 3 * scale]], [1, 2], use_fractions=False)
+        session.set_row(1, [4 * scale, 2 * scale])
+        assert session.method == "full"
+        assert session.get_classification()["rank"] == 1
+
+
+def test_float_row_update_matches_gauss_on_ill_conditioned_matrix():
+    # |denom| ≈ 1e-7 supera la tolerancia absoluta, pero la fila nueva deja A' singular para Gauss
+    session = SolverSession([[1.0, 1.0], [1.0, 1.0 + 1e-6]], [1, 2], use_fractions=False)
+    session.set_row(1, [1.0, 1.0 + 1e-13])
+    assert session.method == "full"
+    assert session.get_classification()["rank"] == 1
@@ -0,0 +1,50 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from models.equations_solver import Gauss
+from models.vector_space import VectorSet
+
+BIG = 10 ** 30
+
+
+def _combination(coefficients, vectors, n):
+    return [sum(Fraction(c) * v[i] for c, v in zip(coefficients, vectors)) for i in range(n)]
+
+
+def _vectors(case):
+    rnd = random.Random(case)
+    if case == "small":
+        return [[1, 2, 3], ["1/2", 1, "3/2"], [BIG, 0, 1], [0, 0, 0]]
+    # 60 vectores de R⁵⁰ de rango 40: la eliminación usa el motor por defecto de ese tamaño
+    base = [[rnd.randint(-9, 9) for _ in range(50)] for _ in range(40)]
+    extra = [_combination([rnd.randint(-3, 3) for _ in base], base, 50) for _ in range(20)]
+    vectors = base + extra
+    rnd.shuffle(vectors)
+    return vectors
+
+
+@pytest.mark.parametrize("case", ["small", "large"])
+def test_vector_set_matches_fraction_elimination(case):
+    vectors = _vectors(case)
+    vector_set = VectorSet(vectors)
+    columns = [[v[i] for v in vectors] for i in range(len(vectors[0]))]
+    reference = Gauss(columns, [0] * len(columns), engine="fraction")
+    reference.solve()
+    assert vector_set.rank == reference.rank()
+    assert vector_set.pivot_cols == sorted(reference.pivot_cols)
+
+    exact, n = vector_set.vectors, vector_set.n
+    for j, combination in vector_set.dependencies().items():
+        assert _combination(combination.values(), [exact[i] for i in combination], n) == exact[j]
+    for relation in vector_set.relations():
+        assert not any(_combination(relation, exact, n))
+
+    inside = _combination(range(1, vector_set.k + 1), exact, n)
+    coordinates = vector_set.coordinates(inside)
+    assert all(coordinates[j] == 0 for j in range(vector_set.k) if j not in vector_set.pivot_cols)
+    assert _combination(coordinates, exact, n) == inside
+    outside = [Fraction(x) for x in inside]
+    outside[-1] += Fraction(1, 3)
+    assert vector_set.contains(outside) == (vector_set.rank == vector_set.n)